@@ -0,0 +1,80 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Import time of the package, each measured in a fresh interpreter.
+Exits with status 1 if a budget is exceeded or a heavy dependency is imported too early,
+so it can guard against regressions:
+
+    python benchmarks/bench_import.py --runs 10 --max-ms 50
+'''
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# dependencies which must not be imported by light statements
+HEAVY_MODULES = ["googleapiclient", "oauth2client", "httplib2", "numpy", "pandas"]
+
+# (name, statements timed, heavy dependencies allowed)
+SCENARIOS = [
+    ("package", "import google_spreadsheet", False),
+    ("constants", "from google_spreadsheet import Dimension, ValueInputOption", False),
+    ("a1", "from google_spreadsheet import a1; a1.A1Range.parse('Sheet1!A1:B2')", False),
+    ("client", "from google_spreadsheet import Client, spreadsheet_service", True),
+]
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.time()
+{statements}
+elapsed = time.time() - started
+print(json.dumps([elapsed * 1000, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def measure(statements, runs):
+    """
+    :return: (sorted milliseconds of the runs, heavy modules imported)
+    """
+    timings = []
+    imported = []
+    for _ in range(runs):
+        code = PROBE.format(root=ROOT, statements=statements, heavy=HEAVY_MODULES)
+        output = subprocess.check_output([sys.executable, "-c", code])
+        elapsed, imported = json.loads(output.decode("utf8").strip().splitlines()[-1])
+        timings.append(elapsed)
+    return sorted(timings), imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="interpreters started per scenario")
+    parser.add_argument("--max-ms", type=float, default=None, help="median budget of light scenarios")
+    args = parser.parse_args()
+
+    failed = False
+    print("{:<10} {:>10} {:>10}  {}".format("scenario", "median ms", "min ms", "heavy modules imported"))
+    for name, statements, heavy_allowed in SCENARIOS:
+        timings, imported = measure(statements, args.runs)
+        median = timings[len(timings) // 2]
+        print("{:<10} {:>10.1f} {:>10.1f}  {}".format(name, median, timings[0], ", ".join(imported) or "-"))
+        if heavy_allowed:
+            continue
+        if imported:
+            print("  FAIL: {} imported heavy modules".format(name))
+            failed = True
+        if args.max_ms is not None and median > args.max_ms:
+            print("  FAIL: {} over budget of {} ms".format(name, args.max_ms))
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
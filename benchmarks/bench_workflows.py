@@ -0,0 +1,117 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Round trips, bytes and wall time of common workflows, against the in-process fake service.
+Run from the repository root:
+
+    python benchmarks/bench_workflows.py --rows 20000 --latency 0.05
+    python benchmarks/bench_workflows.py --json > baseline.json
+'''
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google_spreadsheet import Client, SpreadsheetFields  # noqa: E402
+from google_spreadsheet.testing import FakeSheetsService  # noqa: E402
+
+
+def bench_open(service, file_id, args):
+    client = Client(service)
+    client.open(file_id)
+
+
+def bench_open_properties(service, file_id, args):
+    client = Client(service)
+    client.open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES)
+
+
+def bench_bulk_write(service, file_id, args):
+    sheet = Client(service).open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES).find_sheet_by_index(0)
+    rows = ([i] + ["r{}c{}".format(i, col) for col in range(1, args.cols)] for i in range(args.rows))
+    sheet.write_rows(rows)
+
+
+def bench_bulk_read(service, file_id, args):
+    sheet = Client(service).open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES).find_sheet_by_index(0)
+    for _ in sheet.iter_rows():
+        pass
+
+
+def bench_format_each(service, file_id, args):
+    sheet = Client(service).open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES).find_sheet_by_index(0)
+    for col in range(args.cols):
+        sheet.format_number(0, args.rows, col, col + 1, pattern="#,##0.00")
+
+
+def bench_format_batched(service, file_id, args):
+    spreadsheet = Client(service).open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES)
+    sheet = spreadsheet.find_sheet_by_index(0)
+    with spreadsheet.batch():
+        for col in range(args.cols):
+            sheet.format_number(0, args.rows, col, col + 1, pattern="#,##0.00")
+
+
+# (name, function), run in order on the same spreadsheet: reads see the written rows
+WORKFLOWS = [
+    ("open", bench_open),
+    ("open_properties", bench_open_properties),
+    ("bulk_write", bench_bulk_write),
+    ("bulk_read", bench_bulk_read),
+    ("format_each", bench_format_each),
+    ("format_batched", bench_format_batched),
+]
+
+
+def run(args):
+    service = FakeSheetsService(latency=args.latency)
+    sheets = [("Sheet{}".format(i + 1), 1000, args.cols) for i in range(args.sheets)]
+    file_id = service.add_spreadsheet("Benchmark", sheets)
+
+    results = []
+    for name, workflow in WORKFLOWS:
+        if args.only and name not in args.only:
+            continue
+        service.reset_stats()
+        started = time.time()
+        workflow(service, file_id, args)
+        results.append({
+            "workflow": name,
+            "round_trips": service.stats["requests"],
+            "request_bytes": service.stats["request_bytes"],
+            "response_bytes": service.stats["response_bytes"],
+            "seconds": round(time.time() - started, 4),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="rows written and read")
+    parser.add_argument("--cols", type=int, default=10, help="columns written, read and formatted")
+    parser.add_argument("--sheets", type=int, default=20, help="sheets of the spreadsheet")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of latency per call")
+    parser.add_argument("--only", nargs="*", help="workflows to run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("{:<16} {:>11} {:>14} {:>15} {:>9}".format(
+        "workflow", "round trips", "request bytes", "response bytes", "seconds"))
+    for result in results:
+        print("{workflow:<16} {round_trips:>11} {request_bytes:>14} {response_bytes:>15} {seconds:>9}".format(
+            **result))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,74 @@
 Created on 2016-11-10
 
 @author: jingyang <jingyang@nexa-corp.com>
+
+Constants, exceptions and A1 helpers are imported right away. Client, spreadsheet_service
+and everything else depending on googleapiclient/oauth2client are imported when first used.
 '''
+import importlib
+import sys
+from types import ModuleType
 
 __version__ = "0.1"
 
 
-from .models import *
+from .constants import *
 from .exceptions import *
-from .utils import *
+from .a1 import A1Range, quote_sheet_name
+
+# lazy attributes: name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    "Client": "models",
+    "Spreadsheet": "models",
+    "Sheet": "models",
+    "BatchResult": "models",
+    "BatchSession": "models",
+    "ValueGrid": "grid",
+    "BASE_DIR": "utils",
+    "DISCOVERY_CACHE_DIR": "utils",
+    "ThreadLocalHttp": "utils",
+    "discovery_document": "utils",
+    "get_credentials": "utils",
+    "http_factory": "utils",
+    "spreadsheet_service": "utils",
+}
+
+_SUBMODULES = frozenset([
+    "a1", "aio", "cache", "changes", "coalesce", "constants", "exceptions", "formatting", "frames", "grid",
+    "instrumentation", "metadata", "models", "paste", "runner", "testing", "throttle", "tokens", "utils", "writers",
+])
+
+
+class _LazyModule(ModuleType):
+    """
+    The package module, importing submodules on first access of their attributes
+    """
+    def __getattr__(self, name):
+        if name in _LAZY_ATTRIBUTES:
+            module = importlib.import_module("." + _LAZY_ATTRIBUTES[name], self.__name__)
+            value = getattr(module, name)
+            setattr(self, name, value)
+            return value
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, self.__name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(self.__name__, name))
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
+
+
+__all__ = sorted(
+    [name for name in vars(constants) if not name.startswith("_")] +
+    [name for name in vars(exceptions) if not name.startswith("_")] +
+    ["A1Range", "quote_sheet_name"] + list(_LAZY_ATTRIBUTES)
+)
+
+try:
+    sys.modules[__name__].__class__ = _LazyModule
+except TypeError:
+    # python 2: module classes can not be assigned, replace the module
+    _module = _LazyModule(__name__, __doc__)
+    _module.__dict__.update(sys.modules[__name__].__dict__)
+    # keep the original alive, its globals are cleared once collected
+    _module._original = sys.modules[__name__]
+    sys.modules[__name__] = _module
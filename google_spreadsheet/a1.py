@@ -0,0 +1,407 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+A1 notation codec: column labels, cell labels, ranges and R1C1
+Doc: https://developers.google.com/sheets/guides/concepts#a1_notation
+'''
+import re
+import sys
+import threading
+
+from google_spreadsheet import exceptions
+
+
+# columns of a spreadsheet are at most "ZZZ"
+MAX_COLUMNS = 26 + 26 ** 2 + 26 ** 3
+
+_labels = []
+_indexes = {}
+_labels_lock = threading.Lock()
+
+_cell_re = re.compile(r'([A-Za-z]+)([1-9]\d*)')
+_a1_part_re = re.compile(r'^([A-Za-z]{0,3})(\d*)$')
+_r1c1_part_re = re.compile(r'^(?:R(\d+))?(?:C(\d+))?$', re.IGNORECASE)
+_plain_name_re = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# sheet names read as a cell label in R1C1 notation unless quoted, e.g. "R1C1", "RC2"
+_r1c1_name_re = re.compile(r'^R\d*C\d*$', re.IGNORECASE)
+
+
+def _extend_labels(count):
+    # labels are generated in order, each one from a shorter label already in the table
+    with _labels_lock:
+        while len(_labels) < count:
+            n = len(_labels)
+            if n < 26:
+                label = chr(65 + n)
+            else:
+                label = _labels[n // 26 - 1] + chr(65 + n % 26)
+            _indexes[label] = n
+            _labels.append(label)
+
+
+# one and two letters labels
+_extend_labels(26 + 26 ** 2)
+
+
+def column_label(col):
+    """
+    0-based column index to column label
+
+    :param col: column index
+    :return: column label
+    Example:
+    >>> column_label(27)
+    >>> "AB"
+    """
+    if col < 0 or col >= MAX_COLUMNS:
+        raise exceptions.IncorrectCellLabel(col)
+    if col >= len(_labels):
+        _extend_labels(min(max(col + 1, 2 * len(_labels)), MAX_COLUMNS))
+    return _labels[col]
+
+
+def column_index(label):
+    """
+    Column label to 0-based column index, letter case is ignored
+
+    :param label: column label
+    :return: column index
+    """
+    col = _indexes.get(label)
+    if col is not None:
+        return col
+    upper = label.upper()
+    col = _indexes.get(upper)
+    if col is not None:
+        return col
+    if not upper.isalpha() or not upper.isupper():
+        raise exceptions.IncorrectCellLabel(label)
+    col = 0
+    for c in upper:
+        col = col * 26 + ord(c) - 64
+    return col - 1
+
+
+def cell_label(row, col):
+    """
+    0-based row and column indexes to a cell label
+
+    :param row: row index
+    :param col: column index
+    :return: cell label, e.g. "A1"
+    """
+    row = int(row)
+    col = int(col)
+    if row < 0 or col < 0:
+        raise exceptions.IncorrectCellLabel('(%s, %s)' % (row, col))
+    return column_label(col) + str(row + 1)
+
+
+def cell_coords(label):
+    """
+    Cell label to 0-based (row, column) indexes, letter case is ignored
+
+    :param label: cell label, e.g. "B1"
+    :return: tuple of row and column indexes
+    """
+    m = _cell_re.match(label)
+    if not m:
+        raise exceptions.IncorrectCellLabel(label)
+    return int(m.group(2)) - 1, column_index(m.group(1))
+
+
+def cell_labels(rows, cols):
+    """
+    Bulk version of cell_label(), vectorized with numpy when available
+
+    :param rows: sequence or array of row indexes
+    :param cols: sequence or array of column indexes
+    :return: list of cell labels, or an object array if numpy arrays are given
+    """
+    # numpy arrays can only be given if numpy was imported already
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(rows, numpy.ndarray) and isinstance(cols, numpy.ndarray):
+        if rows.size == 0:
+            return numpy.array([], dtype=object)
+        if rows.min() < 0 or cols.min() < 0:
+            raise exceptions.IncorrectCellLabel("negative index")
+        column_label(int(cols.max()))
+        table = numpy.array(_labels, dtype=object)
+        return table[cols] + (rows + 1).astype(str).astype(object)
+    return [cell_label(row, col) for row, col in zip(rows, cols)]
+
+
+def cells_coords(labels):
+    """
+    Bulk version of cell_coords()
+
+    :param labels: sequence of cell labels
+    :return: tuple of (rows, cols) lists, numpy arrays if numpy is available
+    """
+    coords = [cell_coords(label) for label in labels]
+    rows = [coord[0] for coord in coords]
+    cols = [coord[1] for coord in coords]
+    try:
+        import numpy
+    except ImportError:
+        return rows, cols
+    return numpy.array(rows, dtype=numpy.int64), numpy.array(cols, dtype=numpy.int64)
+
+
+def quote_sheet_name(sheet_name):
+    """
+    Quote a sheet name for A1 notation
+
+    :param sheet_name: sheet name
+    :return: quoted sheet name
+    Example:
+    >>> quote_sheet_name("Bob's Sheet")
+    >>> "'Bob''s Sheet'"
+    """
+    # concatenated, str.format would encode a unicode name to ascii on python 2
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+def _format_sheet_name(sheet_name):
+    if _plain_name_re.match(sheet_name) and not _a1_part_re.match(sheet_name) and \
+            not _r1c1_name_re.match(sheet_name):
+        return sheet_name
+    return quote_sheet_name(sheet_name)
+
+
+def _split_sheet_name(notation):
+    if notation.startswith("'"):
+        end = 1
+        while True:
+            end = notation.find("'", end)
+            if end < 0:
+                raise exceptions.IncorrectCellLabel(notation)
+            if notation[end + 1:end + 2] == "'":
+                end += 2
+                continue
+            break
+        sheet_name = notation[1:end].replace("''", "'")
+        rest = notation[end + 1:]
+        if rest and not rest.startswith("!"):
+            raise exceptions.IncorrectCellLabel(notation)
+        return sheet_name, rest[1:] if rest else None
+
+    if "!" in notation:
+        sheet_name, _, rest = notation.rpartition("!")
+        return sheet_name, rest
+    return None, notation
+
+
+class A1Range(object):
+    """
+    A range of a sheet, 0-based indexes with exclusive ends, as a GridRange.
+    None as an index means unbounded, e.g. the whole column "A:A" has no row bounds.
+
+    :param sheet_name: sheet name, None for the first visible sheet
+    """
+    __slots__ = ("sheet_name", "start_row", "start_col", "end_row", "end_col")
+
+    def __init__(self, sheet_name=None, start_row=None, start_col=None, end_row=None, end_col=None):
+        self.sheet_name = sheet_name
+        self.start_row = start_row
+        self.start_col = start_col
+        self.end_row = end_row
+        self.end_col = end_col
+
+    def __repr__(self):
+        return "A1Range({!r})".format(self.to_a1())
+
+    def __str__(self):
+        return self.to_a1()
+
+    def __eq__(self, other):
+        return isinstance(other, A1Range) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return self.sheet_name, self.start_row, self.start_col, self.end_row, self.end_col
+
+    @classmethod
+    def cell(cls, row, col, sheet_name=None):
+        """
+        Range of a single cell
+        """
+        return cls(sheet_name, row, col, row + 1, col + 1)
+
+    @classmethod
+    def parse(cls, notation):
+        """
+        Parse A1 notation: "Sheet1!A1:B2", "'Bob''s'!A:C", "1:3", "A5:B", "B2", "Sheet1"...
+        R1C1 notation ("Sheet1!R1C1:R2C2") is parsed as well.
+
+        :param notation: A1 notation
+        :return: A1Range object
+        """
+        sheet_name, cells = _split_sheet_name(notation)
+        if not cells:
+            return cls(sheet_name)
+
+        try:
+            return cls._parse_cells(sheet_name, cells)
+        except exceptions.IncorrectCellLabel:
+            if sheet_name is None and "!" not in notation:
+                # a bare sheet name
+                return cls(notation)
+            raise
+
+    @classmethod
+    def _parse_cells(cls, sheet_name, cells):
+        start, _, end = cells.partition(":")
+        if _r1c1_part_re.match(start) and (not end or _r1c1_part_re.match(end)) and \
+                start[:1].upper() in "RC" and not _a1_part_re.match(start):
+            return cls._parse_r1c1(sheet_name, start, end)
+
+        start_row, start_col = cls._parse_a1_part(start)
+        if not end:
+            if start_row is None or start_col is None:
+                raise exceptions.IncorrectCellLabel(cells)
+            return cls(sheet_name, start_row, start_col, start_row + 1, start_col + 1)
+
+        end_row, end_col = cls._parse_a1_part(end)
+        return cls(sheet_name, start_row, start_col,
+                   end_row + 1 if end_row is not None else None,
+                   end_col + 1 if end_col is not None else None)
+
+    @staticmethod
+    def _parse_a1_part(part):
+        m = _a1_part_re.match(part)
+        if not m or not part:
+            raise exceptions.IncorrectCellLabel(part)
+        col = column_index(m.group(1)) if m.group(1) else None
+        row = int(m.group(2)) - 1 if m.group(2) else None
+        if row is not None and row < 0:
+            raise exceptions.IncorrectCellLabel(part)
+        return row, col
+
+    @classmethod
+    def _parse_r1c1(cls, sheet_name, start, end):
+        def part(text):
+            m = _r1c1_part_re.match(text)
+            row = int(m.group(1)) - 1 if m.group(1) else None
+            col = int(m.group(2)) - 1 if m.group(2) else None
+            return row, col
+
+        start_row, start_col = part(start)
+        end_row, end_col = part(end) if end else (start_row, start_col)
+        return cls(sheet_name, start_row, start_col,
+                   end_row + 1 if end_row is not None else None,
+                   end_col + 1 if end_col is not None else None)
+
+    @property
+    def bounded(self):
+        """
+        All four indexes are known
+        """
+        return None not in (self.start_row, self.start_col, self.end_row, self.end_col)
+
+    @property
+    def shape(self):
+        """
+        (rows, columns) counts of a bounded range
+        """
+        return self.end_row - self.start_row, self.end_col - self.start_col
+
+    def to_a1(self):
+        """
+        Format to A1 notation
+
+        :return: A1 notation, e.g. "'Sheet 1'!A1:B2"
+        """
+        start_row = self.start_row
+        start_col = self.start_col
+        if start_row is None and start_col is None and self.end_row is None and self.end_col is None:
+            cells = ""
+        elif self.bounded and self.end_row - start_row == 1 and self.end_col - start_col == 1:
+            cells = cell_label(start_row, start_col)
+        else:
+            if start_col is None and self.end_col is None:
+                # whole rows
+                start = str((start_row or 0) + 1)
+                end = str(self.end_row) if self.end_row is not None else ""
+            else:
+                start = column_label(start_col or 0) + (str(start_row + 1) if start_row is not None else "")
+                end = (column_label(self.end_col - 1) if self.end_col is not None else "") + \
+                      (str(self.end_row) if self.end_row is not None else "")
+            cells = "{}:{}".format(start, end)
+
+        if self.sheet_name is None:
+            return cells
+        if not cells:
+            return _format_sheet_name(self.sheet_name)
+        return _format_sheet_name(self.sheet_name) + "!" + cells
+
+    def to_r1c1(self):
+        """
+        Format to R1C1 notation
+
+        :return: R1C1 notation, e.g. "Sheet1!R1C1:R2C2"
+        """
+        def part(row, col):
+            return "{}{}".format("R{}".format(row + 1) if row is not None else "",
+                                 "C{}".format(col + 1) if col is not None else "")
+
+        cells = part(self.start_row, self.start_col)
+        end = part(self.end_row - 1 if self.end_row is not None else None,
+                   self.end_col - 1 if self.end_col is not None else None)
+        if end and end != cells:
+            cells = "{}:{}".format(cells, end)
+        if self.sheet_name is None:
+            return cells
+        if not cells:
+            return _format_sheet_name(self.sheet_name)
+        return _format_sheet_name(self.sheet_name) + "!" + cells
+
+    def to_grid_range(self, sheet_id):
+        """
+        Convert to a GridRange object, for update requests
+
+        :param sheet_id: sheet id
+        :return: GridRange dict
+        """
+        grid_range = {"sheetId": sheet_id}
+        for key, value in (("startRowIndex", self.start_row), ("endRowIndex", self.end_row),
+                           ("startColumnIndex", self.start_col), ("endColumnIndex", self.end_col)):
+            if value is not None:
+                grid_range[key] = value
+        return grid_range
+
+    def overlaps(self, other):
+        """
+        Whether two ranges may overlap, True if a sheet name is unknown
+
+        :param other: A1Range object
+        :return: overlap or not
+        """
+        if self.sheet_name is not None and other.sheet_name is not None and self.sheet_name != other.sheet_name:
+            return False
+
+        def spans_overlap(start1, end1, start2, end2):
+            low1 = start1 or 0
+            low2 = start2 or 0
+            return (end2 is None or low1 < end2) and (end1 is None or low2 < end1)
+
+        return (spans_overlap(self.start_row, self.end_row, other.start_row, other.end_row) and
+                spans_overlap(self.start_col, self.end_col, other.start_col, other.end_col))
+
+
+def range_name(sheet_name, range_start, range_end=None):
+    """
+    Build a range name from a sheet name and A1 cells
+
+    :param sheet_name: sheet name
+    :param range_start: A1 notation, e.g. "A1"
+    :param range_end: A1 notation, e.g. "B2"
+    :return: range name, e.g. "'Sheet 1'!A1:B2"
+    """
+    return _format_sheet_name(sheet_name) + "!" + range_start + (":" + range_end if range_end else "")
@@ -0,0 +1,346 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Asyncio counterparts of Client, Spreadsheet and Sheet, requires Python 3.5+.
+
+API calls run on a thread pool, each worker thread with its own HTTP transport
+built by `http_factory`, and are bounded by a global and a per-spreadsheet semaphore.
+To test against a local fake transport, pass e.g.
+`http_factory=lambda: googleapiclient.http.HttpMockSequence([...])`.
+'''
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from google_spreadsheet.models import (
+    Client, Dimension, ValueInputOption, ValueRenderOption, DateTimeRenderOption, NumberFormatType,
+    SpreadsheetFields
+)
+
+
+# python 3.7+, get_event_loop() is deprecated within coroutines
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+def _loaded(sheet):
+    """
+    Fetch the lazily loaded properties of a sheet, on an executor thread
+
+    :param sheet: Sheet object
+    :return: the sheet
+    """
+    sheet.name, sheet.row_count
+    return sheet
+
+
+class AsyncClient(object):
+    """
+    Asyncio version of Client, with bounded concurrency
+
+    Example:
+    >>> client = AsyncClient(service, http_factory, retry=RetryPolicy(), rate_limiter=limiter)
+    >>> client = AsyncClient(client=Client(service, http_factory, cache=ValueCache()))
+
+    :param service: client service: utils.spreadsheet_service(...), not needed if `client` is given
+    :param http_factory: callable returning a new HTTP transport, utils.http_factory(...),
+                         required to run requests concurrently
+    :param max_concurrency: max requests in flight, overall
+    :param max_concurrency_per_file: max requests in flight, per spreadsheet
+    :param executor: concurrent.futures executor running the requests,
+                     default to a thread pool of `max_concurrency` workers
+    :param client: preconfigured Client object, used instead of `service` and `http_factory`
+    :param client_kwargs: other arguments of Client: retry, rate_limiter, cache, instruments
+    """
+    def __init__(self, service=None, http_factory=None, max_concurrency=10, max_concurrency_per_file=4,
+                 executor=None, client=None, **client_kwargs):
+        if client is None:
+            client = Client(service, http_factory, **client_kwargs)
+        elif client_kwargs:
+            raise ValueError("Client arguments are not used with a preconfigured client")
+        if client.http_factory is None:
+            # the transport of `service` can not be shared across threads
+            max_concurrency = max_concurrency_per_file = 1
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_file = max_concurrency_per_file
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_concurrency)
+        # event loop -> (global semaphore, dict of file id -> semaphore), a client can serve several loops
+        self._loop_semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphores(self, file_id):
+        # created lazily, within the running event loop, as semaphores are bound to their loop
+        loop = _get_running_loop()
+        if loop not in self._loop_semaphores:
+            self._loop_semaphores[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        semaphore, file_semaphores = self._loop_semaphores[loop]
+        if file_id not in file_semaphores:
+            file_semaphores[file_id] = asyncio.Semaphore(self.max_concurrency_per_file)
+        return semaphore, file_semaphores[file_id]
+
+    async def _call(self, file_id, method, *args, **kwargs):
+        semaphore, file_semaphore = self._semaphores(file_id)
+        async with semaphore, file_semaphore:
+            loop = _get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(method, *args, **kwargs))
+
+    async def open(self, file_id, fields=SpreadsheetFields.ALL, ranges=None, include_grid_data=None):
+        """
+        Opens a spreadsheet specified by `file id`, see Client.open
+
+        :return: AsyncSpreadsheet object
+        """
+        spreadsheet = await self._call(file_id, self.client.open, file_id, fields, ranges, include_grid_data)
+        return AsyncSpreadsheet(self, spreadsheet)
+
+    async def update(self, file_id, requests):
+        return await self._call(file_id, self.client.update, file_id, requests)
+
+    async def values_update(self, file_id, range_name, values, value_input_option=ValueInputOption.USER_ENTERED,
+                            major_dimension=Dimension.ROWS):
+        return await self._call(file_id, self.client.values_update, file_id, range_name, values,
+                                value_input_option, major_dimension)
+
+    async def values_batch_update(self, file_id, data, value_input_option=ValueInputOption.USER_ENTERED):
+        return await self._call(file_id, self.client.values_batch_update, file_id, data, value_input_option)
+
+    async def values_get(self, file_id, range_name, *args, **kwargs):
+        return await self._call(file_id, self.client.values_get, file_id, range_name, *args, **kwargs)
+
+    async def values_batch_get(self, file_id, ranges, *args, **kwargs):
+        return await self._call(file_id, self.client.values_batch_get, file_id, ranges, *args, **kwargs)
+
+    def close(self):
+        """
+        Shut down the executor
+
+        :return: None
+        """
+        self.executor.shutdown(wait=True)
+
+
+class AsyncSpreadsheet(object):
+    """
+    Asyncio version of Spreadsheet, wraps a Spreadsheet object for local metadata.
+    Lookups are coroutines: they may lazily load sheets of a partially loaded spreadsheet,
+    which runs on the executor like any request.
+    """
+    def __init__(self, client, spreadsheet):
+        self.client = client
+        self.spreadsheet = spreadsheet
+
+    @property
+    def details(self):
+        return self.spreadsheet.details
+
+    @property
+    def file_id(self):
+        return self.spreadsheet.file_id
+
+    @property
+    def title(self):
+        return self.spreadsheet.title
+
+    async def refresh(self):
+        """
+        Refresh/Re-open this spreadsheet file
+
+        :return: None
+        """
+        spreadsheet = self.spreadsheet
+        opened = await self.client.open(self.file_id, spreadsheet.fields, spreadsheet.ranges,
+                                        spreadsheet.include_grid_data)
+        spreadsheet.details = opened.details
+        spreadsheet.stale = False
+        spreadsheet._fetched = set()
+
+    async def ensure_fresh(self):
+        """
+        Refresh only if local details have been marked stale
+
+        :return: None
+        """
+        if self.spreadsheet.stale:
+            await self.refresh()
+
+    async def all_sheets(self, include_hidden=False):
+        return await self.client._call(self.file_id, self.spreadsheet.all_sheets, include_hidden)
+
+    async def find_sheet_by(self, by, value, include_hidden=False):
+        def find():
+            return _loaded(self.spreadsheet.find_sheet_by(by, value, include_hidden))
+        return AsyncSheet(self, await self.client._call(self.file_id, find))
+
+    async def find_sheet_by_id(self, sheet_id, include_hidden=False):
+        return await self.find_sheet_by("id", sheet_id, include_hidden)
+
+    async def find_sheet_by_name(self, sheet_name, include_hidden=False):
+        return await self.find_sheet_by("name", sheet_name, include_hidden)
+
+    async def find_sheet_by_index(self, index, include_hidden=False):
+        return await self.find_sheet_by("index", index, include_hidden)
+
+    async def find_sheets(self, names=None, ids=None, include_hidden=False):
+        def find():
+            return [_loaded(sheet) for sheet in self.spreadsheet.find_sheets(names, ids, include_hidden)]
+        return [AsyncSheet(self, sheet) for sheet in await self.client._call(self.file_id, find)]
+
+    async def batch_update(self, requests):
+        """
+        Batch update requests
+
+        :param requests: update requests
+        :return: update response
+        """
+        response = await self.client.update(self.file_id, requests)
+        self.spreadsheet.apply_replies(requests, response.get("replies", []))
+        return response
+
+    async def _update(self, requests, resolver=None, sheet=None):
+        response = await self.batch_update(requests)
+        if sheet is not None:
+            await self.ensure_fresh()
+            await sheet._reload()
+        if resolver is not None:
+            return resolver(response.get("replies", []))
+
+    async def add_sheet(self, sheet_name, row_count=1000, col_count=1000):
+        """
+        Add a sheet to this spreadsheet
+
+        :return: AsyncSheet object
+        """
+        requests = [self.spreadsheet.add_sheet_request(sheet_name, row_count, col_count)]
+        sheet = await self._update(requests, resolver=lambda replies: replies[0]["addSheet"])
+        await self.ensure_fresh()
+        return await self.find_sheet_by_id(sheet["properties"]["sheetId"], include_hidden=True)
+
+    async def delete_sheet(self, sheet_id):
+        await self._update([self.spreadsheet.delete_sheet_request(sheet_id)])
+
+    async def change_title(self, new_title):
+        await self._update([self.spreadsheet.change_title_request(new_title)])
+
+
+class AsyncSheet(object):
+    """
+    Asyncio version of Sheet, wraps a Sheet object for metadata and request builders.
+    Properties are read from local details only, loaded when the sheet was looked up.
+    """
+    # side-effect free helpers of Sheet, available as is
+    _HELPERS = frozenset([
+        "get_int_addr", "get_addr_int", "get_range_name", "update_properties_request", "change_name_request",
+        "resize_request", "append_request", "insert_request", "number_format", "text_format",
+        "format_range_request", "update_values_data",
+    ])
+
+    def __init__(self, spreadsheet, sheet):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.sheet = sheet
+
+    def __getattr__(self, name):
+        if name in self._HELPERS:
+            return getattr(self.sheet, name)
+        raise AttributeError(name)
+
+    @property
+    def details(self):
+        return self.sheet.details
+
+    @property
+    def sheet_id(self):
+        return self.sheet.sheet_id
+
+    @property
+    def name(self):
+        return self.sheet.details["properties"]["title"]
+
+    @property
+    def row_count(self):
+        return self.sheet.details["properties"]["gridProperties"]["rowCount"]
+
+    @property
+    def col_count(self):
+        return self.sheet.details["properties"]["gridProperties"]["columnCount"]
+
+    async def _reload(self):
+        # the lookup may lazily load sheets of a partially loaded spreadsheet
+        def reload():
+            self.sheet._reload()
+            _loaded(self.sheet)
+        await self.client._call(self.spreadsheet.file_id, reload)
+
+    async def refresh(self):
+        await self.spreadsheet.refresh()
+        await self._reload()
+
+    async def delete(self):
+        await self.spreadsheet.delete_sheet(self.sheet_id)
+
+    async def change_name(self, new_name):
+        await self.spreadsheet._update([self.sheet.change_name_request(new_name)], sheet=self)
+
+    async def resize(self, row=None, col=None):
+        await self.spreadsheet._update([self.sheet.resize_request(row, col)], sheet=self)
+
+    async def append(self, row=None, col=None):
+        requests = []
+        if row is not None:
+            requests.append(self.sheet.append_request(Dimension.ROWS, row))
+        if col is not None:
+            requests.append(self.sheet.append_request(Dimension.COLUMNS, col))
+        await self.spreadsheet._update(requests, sheet=self)
+
+    async def insert(self, row=None, row_start_index=0, col=None, col_start_index=0, inherit_before=True):
+        requests = []
+        if row is not None:
+            requests.append(self.sheet.insert_request(Dimension.ROWS, row_start_index, row, inherit_before))
+        if col is not None:
+            requests.append(self.sheet.insert_request(Dimension.COLUMNS, col_start_index, col, inherit_before))
+        await self.spreadsheet._update(requests, sheet=self)
+
+    async def format_number(self, start_row_index=None, end_row_index=None, start_col_index=None,
+                            end_col_index=None, format_type=NumberFormatType.NUMBER, pattern=None):
+        number_format = self.sheet.number_format(format_type, pattern)
+        requests = [self.sheet.format_range_request(number_format, start_row_index, end_row_index,
+                                                    start_col_index, end_col_index)]
+        await self.spreadsheet._update(requests, sheet=self)
+
+    async def update_values(self, range_start, range_end=None, values=None,
+                            value_input_option=ValueInputOption.USER_ENTERED, major_dimension=Dimension.ROWS):
+        data = self.sheet.update_values_data(range_start, range_end, values, major_dimension)
+        if data:
+            response = await self.client.values_update(
+                self.spreadsheet.file_id, data["range"], data["values"], value_input_option, major_dimension)
+            self.sheet._grow_to(response.get("updatedRange"))
+            return response
+
+    async def batch_update_values(self, values_data_list, value_input_option=ValueInputOption.USER_ENTERED):
+        response = await self.client.values_batch_update(self.spreadsheet.file_id, values_data_list,
+                                                         value_input_option)
+        for updated in response.get("responses", []):
+            self.sheet._grow_to(updated.get("updatedRange"))
+        return response
+
+    async def get_values(self, range_start, range_end=None, major_dimension=Dimension.ROWS,
+                         value_render_option=ValueRenderOption.FORMATTED_VALUE,
+                         date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        range_name = self.sheet.get_range_name(range_start, range_end)
+        parameters = {
+            "majorDimension": major_dimension,
+            "valueRenderOption": value_render_option,
+            "dateTimeRenderOption": date_time_render_option
+        }
+        return await self.client.values_get(self.spreadsheet.file_id, range_name, **parameters)
+
+    async def batch_get_values(self, ranges, major_dimension=Dimension.ROWS,
+                               value_render_option=ValueRenderOption.FORMATTED_VALUE,
+                               date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        parameters = {
+            "majorDimension": major_dimension,
+            "valueRenderOption": value_render_option,
+            "dateTimeRenderOption": date_time_render_option
+        }
+        return await self.client.values_batch_get(self.spreadsheet.file_id, ranges, **parameters)
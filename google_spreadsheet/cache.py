@@ -0,0 +1,115 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Read-through cache of values responses, for Client(service, cache=ValueCache(...))
+'''
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.a1 import A1Range
+
+
+def ranges_overlap(range1, range2):
+    """
+    Whether two A1 ranges may overlap, True when unsure
+
+    :param range1: A1 notation, e.g. "Sheet1!A1:B2"
+    :param range2: A1 notation
+    :return: overlap or not
+    """
+    try:
+        parsed1, parsed2 = A1Range.parse(range1), A1Range.parse(range2)
+    except exceptions.IncorrectCellLabel:
+        return True
+    return parsed1.overlaps(parsed2)
+
+
+class ValueCache(object):
+    """
+    TTL and LRU bounded cache of values responses, keyed by
+    (file_id, range, majorDimension, valueRenderOption, dateTimeRenderOption).
+    Responses are kept JSON-encoded: the memory budget is exact and hits return fresh copies.
+
+    :param ttl: seconds an entry stays valid
+    :param max_bytes: memory budget of encoded responses
+    """
+    def __init__(self, ttl=60, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        _, encoded = self._entries.pop(key)
+        self.size -= len(encoded)
+
+    def get(self, key):
+        """
+        :param key: cache key
+        :return: response, None on miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            # most recently used goes last
+            self._entries[key] = self._entries.pop(key)
+            self.stats["hits"] += 1
+        return json.loads(entry[1])
+
+    def put(self, key, response):
+        """
+        :param key: cache key
+        :param response: values response
+        :return: None
+        """
+        encoded = json.dumps(response, separators=(",", ":"))
+        if len(encoded) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time() + self.ttl, encoded)
+            self.size += len(encoded)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def invalidate(self, file_id, ranges=None):
+        """
+        Drop entries of a spreadsheet overlapping with given ranges
+
+        :param file_id: spreadsheet id
+        :param ranges: A1 ranges written, None for the whole spreadsheet
+        :return: None
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] != file_id:
+                    continue
+                if ranges is None or any(ranges_overlap(key[1], range_name) for range_name in ranges):
+                    self._drop(key)
+                    self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
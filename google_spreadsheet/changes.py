@@ -0,0 +1,377 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Change detection of spreadsheets by polling.
+The Sheets API has no checksum of values: a poll first asks a version probe, the Drive
+version of the file by default, and stops there if it did not change. Otherwise a narrow metadata probe
+reports sheet changes, the watched ranges are read in one values.batchGet, and only blocks of rows
+whose fingerprint changed are compared cell by cell.
+Polls back off while nothing changes.
+
+IMPORTANT: without a version probe, e.g. when the credentials have no Drive scope, every poll
+reads all the watched ranges, which costs quota and bandwidth even while nothing changes.
+The default scopes only allow the Sheets API: build the service with
+utils.spreadsheet_service(..., drive_metadata=True) to allow the Drive version probe.
+
+Example:
+>>> watcher = spreadsheet.watch(["Orders!A1:F", "Stock"], interval=10)
+>>> for events in watcher:
+>>>     for event in events:
+>>>         print(event.label, event.old, event.new)
+'''
+import hashlib
+import json
+import threading
+import warnings
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.a1 import A1Range
+from google_spreadsheet.constants import ValueRenderOption
+
+# version probe built from the client: Drive versions if the credentials allow it, else none
+AUTO = "auto"
+
+# fields of the metadata probe
+SHEETS_FIELDS = "sheets.properties(sheetId,title,index,hidden,gridProperties(rowCount,columnCount))"
+# fields of the values reads, leaves out everything but the values, and bypasses the client cache
+VALUES_FIELDS = "valueRanges(range,values)"
+
+
+def fingerprint(rows):
+    """
+    Fingerprint of values rows
+
+    :param rows: list of lists
+    :return: bytes
+    """
+    encoded = json.dumps(rows, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha1(encoded.encode("utf8")).digest()
+
+
+def drive_version_probe(drive_service, file_id):
+    """
+    Version probe of a file with the Drive v3 API: the version increases on every change of the file.
+    Requires a scope reading Drive metadata, e.g. https://www.googleapis.com/auth/drive.metadata.readonly
+
+    :param drive_service: Drive v3 service, e.g. googleapiclient.discovery.build("drive", "v3", http=http)
+    :param file_id: spreadsheet id
+    :return: callable returning the version
+    """
+    def probe():
+        return drive_service.files().get(fileId=file_id, fields="version").execute()["version"]
+    return probe
+
+
+def client_version_probe(client, file_id):
+    """
+    Drive version probe over the HTTP transport of a client, see drive_version_probe
+
+    :param client: Client object
+    :param file_id: spreadsheet id
+    :return: callable returning the version, None if the client has no HTTP transport
+    """
+    if client.http_factory is not None:
+        http = client.http_factory()
+    else:
+        http = getattr(client.service, "_http", None)
+    if http is None:
+        # e.g. a fake service
+        return None
+    try:
+        from googleapiclient.discovery import build_from_document
+        from google_spreadsheet.utils import discovery_document
+
+        drive_service = build_from_document(discovery_document("drive", "v3"), http=http)
+    except (ImportError, ValueError, EnvironmentError, httplib2.HttpLib2Error):
+        return None
+    return drive_version_probe(drive_service, file_id)
+
+
+class CellChange(object):
+    """
+    A cell whose value changed, "" for an empty cell
+
+    :param sheet_name: sheet name
+    :param row: 0-based row index
+    :param col: 0-based column index
+    :param old: previous value
+    :param new: current value
+    """
+    __slots__ = ("sheet_name", "row", "col", "old", "new")
+
+    def __init__(self, sheet_name, row, col, old, new):
+        self.sheet_name = sheet_name
+        self.row = row
+        self.col = col
+        self.old = old
+        self.new = new
+
+    @property
+    def label(self):
+        """
+        A1 notation of the cell, e.g. "Sheet1!B2"
+        """
+        return A1Range.cell(self.row, self.col, self.sheet_name).to_a1()
+
+    def __repr__(self):
+        return "CellChange({}, {!r} -> {!r})".format(self.label, self.old, self.new)
+
+
+class SheetChange(object):
+    """
+    A sheet added, removed, or whose properties (title, grid size...) changed
+
+    :param sheet_id: sheet id
+    :param old: previous properties, None if the sheet was added
+    :param new: current properties, None if the sheet was removed
+    """
+    __slots__ = ("sheet_id", "old", "new")
+
+    def __init__(self, sheet_id, old, new):
+        self.sheet_id = sheet_id
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return "SheetChange({}, {!r} -> {!r})".format(self.sheet_id, self.old, self.new)
+
+
+class _RangeState(object):
+    """
+    Last values of a watched range, as blocks of `block_rows` rows with their fingerprints
+    """
+    def __init__(self, value_range, block_rows):
+        parsed = A1Range.parse(value_range.get("range", ""))
+        self.sheet_name = parsed.sheet_name
+        self.row = parsed.start_row or 0
+        self.col = parsed.start_col or 0
+        values = value_range.get("values", [])
+        self.blocks = [values[start:start + block_rows] for start in range(0, len(values), block_rows)]
+        self.fingerprints = [fingerprint(block) for block in self.blocks]
+        self.fingerprint = hashlib.sha1(b"".join(self.fingerprints)).digest()
+
+    def diff(self, old, block_rows):
+        """
+        Cell changes from an older state of the range
+
+        :param old: _RangeState object
+        :param block_rows: rows count of a block
+        :return: list of CellChange
+        """
+        events = []
+        for index in range(max(len(self.blocks), len(old.blocks))):
+            new_block = self.blocks[index] if index < len(self.blocks) else []
+            old_block = old.blocks[index] if index < len(old.blocks) else []
+            if index < len(self.blocks) and index < len(old.blocks) and \
+                    self.fingerprints[index] == old.fingerprints[index]:
+                continue
+            for offset in range(max(len(new_block), len(old_block))):
+                new_row = new_block[offset] if offset < len(new_block) else []
+                old_row = old_block[offset] if offset < len(old_block) else []
+                if new_row == old_row:
+                    continue
+                for col in range(max(len(new_row), len(old_row))):
+                    new_value = new_row[col] if col < len(new_row) else ""
+                    old_value = old_row[col] if col < len(old_row) else ""
+                    if new_value != old_value:
+                        events.append(CellChange(self.sheet_name, self.row + index * block_rows + offset,
+                                                 self.col + col, old_value, new_value))
+        return events
+
+
+class Watcher(object):
+    """
+    Poll ranges of a spreadsheet for changes, see Spreadsheet.watch
+
+    :param spreadsheet: Spreadsheet object
+    :param ranges: watched A1 ranges, e.g. ["Sheet1!A1:D", "Sheet2"]
+    :param interval: seconds between polls after a change
+    :param max_interval: max seconds between polls while nothing changes, default to 16 times `interval`
+    :param backoff: factor of the delay after each poll without change
+    :param block_rows: rows count of a fingerprinted block
+    :param version_probe: callable returning a version of the spreadsheet, e.g. drive_version_probe(...);
+                          polls stop at the probe while the version is the same.
+                          AUTO for the Drive version over the client's transport, dropped with a RuntimeWarning
+                          if the credentials do not allow it (see `version_probe` after the first poll):
+                          the default scopes of utils.spreadsheet_service do not, pass it drive_metadata=True.
+                          None to read all the ranges every poll, which is NOT cheap
+    :param probe_metadata: report SheetChange events or not
+    :param value_render_option: value render option
+
+    A watched sheet which is renamed keeps being watched under its new name,
+    the ranges of a removed sheet are no longer read and are listed in `removed_ranges`.
+    """
+    def __init__(self, spreadsheet, ranges, interval=60.0, max_interval=None, backoff=2.0, block_rows=100,
+                 version_probe=AUTO, probe_metadata=True, value_render_option=ValueRenderOption.FORMATTED_VALUE):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.ranges = list(ranges)
+        self.removed_ranges = []
+        self.interval = float(interval)
+        self.max_interval = float(max_interval) if max_interval is not None else self.interval * 16
+        self.backoff = backoff
+        self.block_rows = block_rows
+        self.version_probe = version_probe
+        self._auto_probe = version_probe == AUTO
+        self.probe_metadata = probe_metadata
+        self.value_render_option = value_render_option
+        self.delay = self.interval
+        self.stats = {"polls": 0, "probes_unchanged": 0, "reads": 0, "changes": 0}
+        self._version = None
+        self._sheets = None
+        self._states = None
+        # sheet id of each watched range, None while unknown or for ranges of the first sheet
+        self._sheet_ids = [None] * len(self.ranges)
+        self._stopped = threading.Event()
+
+    def _probe_version(self):
+        if self.version_probe == AUTO:
+            self.version_probe = client_version_probe(self.client, self.spreadsheet.file_id)
+        if self.version_probe is None:
+            return None
+        try:
+            return self.version_probe()
+        except (HttpError, httplib2.HttpLib2Error, EnvironmentError) as error:
+            if not self._auto_probe:
+                raise
+            # e.g. credentials without a Drive scope
+            self.version_probe = None
+            warnings.warn("Drive version probe of {} dropped, every poll reads all the watched ranges: {}. "
+                          "Allow it with utils.spreadsheet_service(..., drive_metadata=True)"
+                          .format(self.spreadsheet.file_id, error), RuntimeWarning)
+            return None
+
+    def _read(self):
+        if not self.ranges:
+            return {}
+        response = self.client.values_batch_get(self.spreadsheet.file_id, self.ranges,
+                                                valueRenderOption=self.value_render_option, fields=VALUES_FIELDS)
+        self.stats["reads"] += 1
+        return response
+
+    def poll(self):
+        """
+        Poll once, the first poll only takes the initial state
+
+        :return: list of CellChange and SheetChange events
+        """
+        self.stats["polls"] += 1
+        version = self._probe_version()
+        if version is not None and self._states is not None and version == self._version:
+            self.stats["probes_unchanged"] += 1
+            self._schedule(False)
+            return []
+
+        events = []
+        if self.probe_metadata or self._sheets is None:
+            # the first probe resolves the sheet ids of the ranges, even without reporting sheet changes
+            sheet_events = self._probe_sheets()
+            if self.probe_metadata:
+                events.extend(sheet_events)
+
+        try:
+            response = self._read()
+        except exceptions.RateLimitExceeded:
+            raise
+        except (exceptions.BadRequest, exceptions.NotFound):
+            # a watched sheet was renamed or removed since the last metadata probe
+            sheet_events = self._probe_sheets()
+            if self.probe_metadata:
+                events.extend(sheet_events)
+            response = self._read()
+
+        states = []
+        for index, value_range in enumerate(response.get("valueRanges", [])):
+            state = _RangeState(value_range, self.block_rows)
+            old = self._states[index] if self._states is not None else None
+            if old is not None and old.fingerprint == state.fingerprint:
+                # values are the same, keep the old state
+                states.append(old)
+                continue
+            if old is not None:
+                events.extend(state.diff(old, self.block_rows))
+            states.append(state)
+
+        self._states = states
+        self._version = version
+        self.stats["changes"] += len(events)
+        self._schedule(bool(events))
+        return events
+
+    def _probe_sheets(self):
+        """
+        Compare sheet properties with the last probe, and follow renamed or removed watched sheets
+
+        :return: list of SheetChange
+        """
+        details = self.client.open(self.spreadsheet.file_id, fields=SHEETS_FIELDS).details
+        sheets = dict((sheet["properties"]["sheetId"], sheet["properties"]) for sheet in details.get("sheets", []))
+        events = []
+        if self._sheets is not None:
+            for sheet_id in sorted(set(sheets) | set(self._sheets)):
+                old, new = self._sheets.get(sheet_id), sheets.get(sheet_id)
+                if old != new:
+                    events.append(SheetChange(sheet_id, old, new))
+            if events:
+                self.spreadsheet.mark_stale()
+        self._sheets = sheets
+        self._resolve_ranges(sheets)
+        return events
+
+    def _resolve_ranges(self, sheets):
+        """
+        Rewrite the ranges of renamed sheets, stop watching the ranges of removed sheets
+
+        :param sheets: dict of sheet id -> sheet properties
+        :return: None
+        """
+        sheet_ids = dict((properties["title"], sheet_id) for sheet_id, properties in sheets.items())
+        kept = []
+        for index, range_name in enumerate(self.ranges):
+            state = self._states[index] if self._states is not None and index < len(self._states) else None
+            sheet_id = self._sheet_ids[index]
+            parsed = A1Range.parse(range_name)
+            if sheet_id is None and parsed.sheet_name is not None:
+                sheet_id = sheet_ids.get(parsed.sheet_name)
+            if sheet_id is not None and sheet_id not in sheets:
+                self.removed_ranges.append(range_name)
+                continue
+            if sheet_id is not None and sheets[sheet_id]["title"] != parsed.sheet_name:
+                range_name = A1Range(sheets[sheet_id]["title"], parsed.start_row, parsed.start_col,
+                                     parsed.end_row, parsed.end_col).to_a1()
+            kept.append((range_name, sheet_id, state))
+
+        self.ranges = [range_name for range_name, _, _ in kept]
+        self._sheet_ids = [sheet_id for _, sheet_id, _ in kept]
+        if self._states is not None:
+            self._states = [state for _, _, state in kept]
+
+    def _schedule(self, changed):
+        if changed:
+            self.delay = self.interval
+        elif self.stats["polls"] > 1:
+            self.delay = min(self.delay * self.backoff, self.max_interval)
+
+    def stop(self):
+        """
+        Stop the iteration, from another thread or from the loop body
+
+        :return: None
+        """
+        self._stopped.set()
+
+    def __iter__(self):
+        """
+        Poll until stopped, waiting `delay` seconds between polls
+
+        :return: generator of lists of events, one list per poll with changes
+        """
+        while not self._stopped.is_set():
+            events = self.poll()
+            if events:
+                yield events
+            self._stopped.wait(self.delay)
@@ -0,0 +1,256 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Range coalescing for values.batchGet: small, overlapping or adjacent ranges are merged
+into bounding rectangles, fetched once, and sliced back into per-range responses.
+
+Example:
+>>> plan = ReadPlan(["Sheet1!A1:A100", "Sheet1!B1:B100", "Sheet1!A1:C1"], max_waste=0.25)
+>>> plan.fetch_ranges
+['Sheet1!A1:C1', 'Sheet1!A1:B100']
+>>> response = plan.split(client.values_batch_get(file_id, plan.fetch_ranges))
+'''
+import collections
+import heapq
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.a1 import A1Range
+
+
+def _box(parsed):
+    return parsed.start_row, parsed.start_col, parsed.end_row, parsed.end_col
+
+
+def _area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _intersection(first, second):
+    box = (max(first[0], second[0]), max(first[1], second[1]), min(first[2], second[2]), min(first[3], second[3]))
+    if box[0] < box[2] and box[1] < box[3]:
+        return box
+    return None
+
+
+def covered_cells(boxes):
+    """
+    Cells count of the union of rectangles
+
+    :param boxes: list of (start row, start col, end row, end col), ends exclusive
+    :return: cells count
+    """
+    rows = sorted(set([box[0] for box in boxes] + [box[2] for box in boxes]))
+    cols = sorted(set([box[1] for box in boxes] + [box[3] for box in boxes]))
+    cells = 0
+    for row_start, row_end in zip(rows, rows[1:]):
+        for col_start, col_end in zip(cols, cols[1:]):
+            for box in boxes:
+                if box[0] <= row_start and row_end <= box[2] and box[1] <= col_start and col_end <= box[3]:
+                    cells += (row_end - row_start) * (col_end - col_start)
+                    break
+    return cells
+
+
+class _Group(object):
+    """
+    Requested ranges fetched as one bounding rectangle
+    """
+    def __init__(self, sheet_name, box, members, requested=None, boxes=None):
+        self.sheet_name = sheet_name
+        self.box = box
+        # list of (index of the requested range, A1Range)
+        self.members = members
+        self.boxes = boxes if boxes is not None else [_box(parsed) for _, parsed in members]
+        # cells count of the union of the members
+        self.requested = requested if requested is not None else covered_cells(self.boxes)
+
+    @property
+    def area(self):
+        return _area(self.box)
+
+    def overlap(self, other):
+        """
+        Cells count requested by both groups
+        """
+        clip = _intersection(self.box, other.box)
+        if clip is None:
+            return 0
+        # only members within the intersection of the bounding boxes can overlap
+        firsts = [box for box in self.boxes
+                  if box[0] < clip[2] and clip[0] < box[2] and box[1] < clip[3] and clip[1] < box[3]]
+        seconds = [box for box in other.boxes
+                   if firsts and box[0] < clip[2] and clip[0] < box[2] and box[1] < clip[3] and clip[1] < box[3]]
+        boxes = []
+        for first in firsts:
+            for second in seconds:
+                box = _intersection(first, second)
+                if box is not None:
+                    boxes.append(box)
+        return covered_cells(boxes) if boxes else 0
+
+    def union_box(self, other):
+        return (min(self.box[0], other.box[0]), min(self.box[1], other.box[1]),
+                max(self.box[2], other.box[2]), max(self.box[3], other.box[3]))
+
+
+class ReadPlan(object):
+    """
+    Plan of a values.batchGet: which ranges to fetch for the requested ones
+
+    :param ranges: requested A1 ranges
+    :param max_waste: max fraction of fetched cells which were not requested,
+                      in a merged rectangle; merges fetching fewer cells are always done
+    :param grid_size: callable(sheet name) returning (row count, column count) or None,
+                      to bound open ranges like "Sheet1!A:B"; open ranges are fetched as given otherwise
+    """
+    def __init__(self, ranges, max_waste=0.25, grid_size=None):
+        self.ranges = list(ranges)
+        self.max_waste = max_waste
+        groups = []
+        # ranges fetched as given: index -> range
+        self._passthrough = {}
+        for index, range_name in enumerate(self.ranges):
+            parsed = self._bounded(range_name, grid_size)
+            if parsed is None:
+                self._passthrough[index] = range_name
+                continue
+            groups.append(_Group(parsed.sheet_name, _box(parsed), [(index, parsed)]))
+
+        self.groups = self._merge(groups)
+        self.fetch_ranges = [
+            A1Range(group.sheet_name, *group.box).to_a1() for group in self.groups
+        ] + [self._passthrough[index] for index in sorted(self._passthrough)]
+
+    @staticmethod
+    def _bounded(range_name, grid_size):
+        try:
+            parsed = A1Range.parse(range_name)
+        except exceptions.IncorrectCellLabel:
+            return None
+        if parsed.bounded:
+            return parsed
+        size = grid_size(parsed.sheet_name) if grid_size is not None and parsed.sheet_name is not None else None
+        if size is None:
+            return None
+        return A1Range(parsed.sheet_name, parsed.start_row or 0, parsed.start_col or 0,
+                       parsed.end_row if parsed.end_row is not None else size[0],
+                       parsed.end_col if parsed.end_col is not None else size[1])
+
+    def _merge_cost(self, first, second):
+        """
+        Cells added by merging two groups, None if the merge wastes too much
+
+        :return: (added cells, bounding box, requested cells) or None
+        """
+        box = first.union_box(second)
+        area = _area(box)
+        added = area - first.area - second.area
+        requested = first.requested + second.requested - first.overlap(second)
+        if added > 0 and area - requested > self.max_waste * area:
+            return None
+        return added, box, requested
+
+    def _merge(self, groups):
+        """
+        Merge groups of each sheet, cheapest merge first. Groups are sorted by position and
+        only neighbours are merged, with the costs of neighbour pairs kept in a heap.
+        """
+        sheets = collections.OrderedDict()
+        for group in groups:
+            sheets.setdefault(group.sheet_name, []).append(group)
+
+        merged = []
+        for chain in sheets.values():
+            chain.sort(key=lambda group: group.box)
+            count = len(chain)
+            following = list(range(1, count)) + [None]
+            previous = [None] + list(range(count - 1))
+            versions = [0] * count
+            alive = [True] * count
+            heap = []
+
+            def push(i, j):
+                cost = self._merge_cost(chain[i], chain[j])
+                if cost is not None:
+                    added, box, requested = cost
+                    heapq.heappush(heap, (added, i, j, versions[i], versions[j], box, requested))
+
+            for i in range(count - 1):
+                push(i, i + 1)
+            while heap:
+                _, i, j, version_i, version_j, box, requested = heapq.heappop(heap)
+                if not (alive[i] and alive[j]) or (versions[i], versions[j]) != (version_i, version_j):
+                    # outdated pair
+                    continue
+                first, second = chain[i], chain[j]
+                chain[i] = _Group(first.sheet_name, box, first.members + second.members, requested,
+                                  first.boxes + second.boxes)
+                versions[i] += 1
+                alive[j] = False
+                following[i] = following[j]
+                if following[i] is not None:
+                    previous[following[i]] = i
+                    push(i, following[i])
+                if previous[i] is not None:
+                    push(previous[i], i)
+            merged.extend(group for group, kept in zip(chain, alive) if kept)
+        return merged
+
+    @property
+    def cells_requested(self):
+        """
+        Cells count of the requested bounded ranges, duplicates included
+        """
+        return sum(parsed.shape[0] * parsed.shape[1] for group in self.groups for _, parsed in group.members)
+
+    @property
+    def cells_fetched(self):
+        """
+        Cells count of the merged rectangles
+        """
+        return sum(group.area for group in self.groups)
+
+    def split(self, response, major_dimension="ROWS"):
+        """
+        Slice a values.batchGet response of `fetch_ranges` into the responses of the requested ranges
+
+        :param response: values.batchGet response
+        :param major_dimension: major dimension of the response
+        :return: values.batchGet response, one value range per requested range
+        """
+        fetched = response.get("valueRanges", [])
+        value_ranges = [None] * len(self.ranges)
+        for group, value_range in zip(self.groups, fetched):
+            values = value_range.get("values", [])
+            for index, parsed in group.members:
+                value_ranges[index] = self._slice(values, group.box, parsed, major_dimension)
+        for index, value_range in zip(sorted(self._passthrough), fetched[len(self.groups):]):
+            value_ranges[index] = value_range
+
+        result = dict(response)
+        result["valueRanges"] = value_ranges
+        return result
+
+    @staticmethod
+    def _slice(values, box, parsed, major_dimension):
+        row_start, row_end = parsed.start_row - box[0], parsed.end_row - box[0]
+        col_start, col_end = parsed.start_col - box[1], parsed.end_col - box[1]
+        if major_dimension == "COLUMNS":
+            row_start, row_end, col_start, col_end = col_start, col_end, row_start, row_end
+
+        rows = []
+        for row in values[row_start:row_end]:
+            row = row[col_start:col_end]
+            # trailing empty cells and rows are omitted, as the API does
+            while row and row[-1] == "":
+                row.pop()
+            rows.append(row)
+        while rows and not rows[-1]:
+            rows.pop()
+
+        value_range = {"range": parsed.to_a1(), "majorDimension": major_dimension}
+        if rows:
+            value_range["values"] = rows
+        return value_range
+
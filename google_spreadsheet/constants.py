@@ -0,0 +1,78 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Constants of the Sheets API, re-exported by models.
+Kept apart so they can be imported without the API client dependencies.
+'''
+
+
+class Dimension(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets.values#dimension
+    """
+    ROWS = "ROWS"
+    COLUMNS = "COLUMNS"
+
+
+class ValueInputOption(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/ValueInputOption
+    """
+    RAW = "RAW"
+    USER_ENTERED = "USER_ENTERED"
+
+
+class NumberFormatType(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets#NumberFormatType
+    """
+    TEXT = "TEXT"
+    NUMBER = "NUMBER"
+    PERCENT = "PERCENT"
+    CURRENCY = "CURRENCY"
+    DATE = "DATE"
+    TIME = "TIME"
+    DATE_TIME = "DATE_TIME"
+    SCIENTIFIC = "SCIENTIFIC"
+
+
+class PasteType(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets#PasteType
+    """
+    PASTE_NORMAL = "PASTE_NORMAL"
+    PASTE_VALUES = "PASTE_VALUES"
+    PASTE_FORMAT = "PASTE_FORMAT"
+    PASTE_NO_BORDERS = "PASTE_NO_BORDERS"
+    PASTE_FORMULA = "PASTE_FORMULA"
+    PASTE_DATA_VALIDATION = "PASTE_DATA_VALIDATION"
+    PASTE_CONDITIONAL_FORMATTING = "PASTE_CONDITIONAL_FORMATTING"
+
+
+class ValueRenderOption(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/ValueRenderOption
+    """
+    FORMATTED_VALUE = "FORMATTED_VALUE"
+    UNFORMATTED_VALUE = "UNFORMATTED_VALUE"
+    FORMULA = "FORMULA"
+
+
+class DateTimeRenderOption(object):
+    """
+    Doc: https://developers.google.com/sheets/reference/rest/v4/DateTimeRenderOption
+    """
+    SERIAL_NUMBER = "SERIAL_NUMBER"
+    FORMATTED_STRING = "FORMATTED_STRING"
+
+
+class SpreadsheetFields(object):
+    """
+    Field masks for Client.open
+    Doc: https://developers.google.com/sheets/guides/field-masks
+    """
+    ALL = None
+    # only what this library needs
+    SHEET_PROPERTIES = "spreadsheetId,properties.title," \
+                       "sheets.properties(sheetId,title,index,hidden,gridProperties)"
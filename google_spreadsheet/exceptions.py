@@ -41,7 +41,20 @@ class BadRequest(APIException):
     """
 
 
+class RateLimitExceeded(BadRequest):
+    """
+    Quota exceeded (HTTP 429), after retries if any.
+    """
+    status_code = 429
+
+
 class IncorrectCellLabel(APIException):
     """
     Trying to convert an incorrect cell label
     """
+
+
+class BatchError(APIException):
+    """
+    Misuse of a batch session, e.g. reading a result before it is flushed
+    """
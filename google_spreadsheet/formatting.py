@@ -0,0 +1,157 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Formatting planner: a per-cell format map is compressed into the fewest requests,
+repeatCell for blocks of identical formats and updateCells for blocks of mixed formats,
+so the batchUpdate body grows with the number of regions, not of cells.
+
+Example:
+>>> red = {"textFormat": {"foregroundColor": {"red": 1}}}
+>>> formats = dict(((row, 2), red) for row, value in enumerate(column) if value < 0)
+>>> requests = plan_formats(sheet.sheet_id, formats)
+'''
+import json
+
+from google_spreadsheet import a1
+
+# fields of userEnteredFormat whose own fields are masked one by one, others are set as a whole
+_SPLIT_FIELDS = frozenset(["textFormat"])
+
+# estimated JSON bytes of a request around its format(s)
+_REQUEST_BYTES = 160
+_CELL_BYTES = 25
+_ROW_BYTES = 15
+
+
+def fields_mask(format_body):
+    """
+    Fields mask of a userEnteredFormat object, e.g. "userEnteredFormat.numberFormat,userEnteredFormat.textFormat.bold"
+
+    :param format_body: userEnteredFormat object
+    :return: fields mask
+    """
+    paths = []
+    for key in sorted(format_body):
+        if key in _SPLIT_FIELDS and isinstance(format_body[key], dict) and format_body[key]:
+            paths.extend("userEnteredFormat.{}.{}".format(key, sub_key) for sub_key in sorted(format_body[key]))
+        else:
+            paths.append("userEnteredFormat.{}".format(key))
+    return ",".join(paths)
+
+
+def rectangles(cells):
+    """
+    Tile cells into rectangles of equal values: runs of a row are merged with identical runs of the row above
+
+    :param cells: dict of (row, col) -> hashable value
+    :return: list of (start row, start col, end row, end col, value), ends exclusive
+    """
+    by_row = {}
+    for (row, col), value in cells.items():
+        by_row.setdefault(row, []).append((col, value))
+
+    result = []
+    # (start col, end col, value) -> [start row, last row]
+    opened = {}
+    for row in sorted(by_row):
+        runs = []
+        for col, value in sorted(by_row[row], key=lambda cell: cell[0]):
+            if runs and runs[-1][1] == col and runs[-1][2] == value:
+                runs[-1][1] = col + 1
+            else:
+                runs.append([col, col + 1, value])
+
+        extended = {}
+        for col_start, col_end, value in runs:
+            key = (col_start, col_end, value)
+            span = opened.pop(key, None)
+            if span is not None and span[1] == row - 1:
+                span[1] = row
+            else:
+                if span is not None:
+                    result.append((span[0], col_start, span[1] + 1, col_end, value))
+                span = [row, row]
+            extended[key] = span
+        for (col_start, col_end, value), span in opened.items():
+            result.append((span[0], col_start, span[1] + 1, col_end, value))
+        opened = extended
+
+    for (col_start, col_end, value), span in opened.items():
+        result.append((span[0], col_start, span[1] + 1, col_end, value))
+    return sorted(result)
+
+
+def _grid_range(sheet_id, row_start, col_start, row_end, col_end):
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": row_start,
+        "endRowIndex": row_end,
+        "startColumnIndex": col_start,
+        "endColumnIndex": col_end,
+    }
+
+
+def plan_formats(sheet_id, formats):
+    """
+    Compress a per-cell format map into repeatCell/updateCells requests.
+    Cells are tiled by fields mask first; a tile of identical formats becomes one repeatCell,
+    a tile of mixed formats becomes one updateCells if that is smaller than its repeatCell requests.
+
+    :param sheet_id: sheet id
+    :param formats: dict of cell -> userEnteredFormat object, cells as (row, col) 0-based indexes or A1 labels
+    :return: list of requests, for batch_update
+    """
+    # canonical formats and masks, computed once and shared by all their cells
+    format_ids = {}
+    bodies = []
+    encoded_sizes = []
+    masks = []
+    cell_formats = {}
+    cell_masks = {}
+    for cell, format_body in formats.items():
+        if not isinstance(cell, tuple):
+            cell = a1.cell_coords(cell)
+        encoded = json.dumps(format_body, sort_keys=True)
+        format_id = format_ids.get(encoded)
+        if format_id is None:
+            format_id = format_ids[encoded] = len(bodies)
+            bodies.append(format_body)
+            encoded_sizes.append(len(encoded))
+            masks.append(fields_mask(format_body))
+        cell_formats[cell] = format_id
+        cell_masks[cell] = masks[format_id]
+
+    requests = []
+    for row_start, col_start, row_end, col_end, mask in rectangles(cell_masks):
+        block = dict(
+            ((row, col), cell_formats[row, col])
+            for row in range(row_start, row_end) for col in range(col_start, col_end)
+        )
+        uniform = rectangles(block)
+        repeat_bytes = sum(_REQUEST_BYTES + len(mask) + encoded_sizes[format_id] for _, _, _, _, format_id in uniform)
+        update_bytes = _REQUEST_BYTES + len(mask) + (row_end - row_start) * _ROW_BYTES + \
+            sum(_CELL_BYTES + encoded_sizes[format_id] for format_id in block.values())
+
+        if len(uniform) == 1 or repeat_bytes <= update_bytes:
+            for rect_row_start, rect_col_start, rect_row_end, rect_col_end, format_id in uniform:
+                requests.append({
+                    "repeatCell": {
+                        "range": _grid_range(sheet_id, rect_row_start, rect_col_start, rect_row_end, rect_col_end),
+                        "cell": {"userEnteredFormat": bodies[format_id]},
+                        "fields": mask,
+                    }
+                })
+        else:
+            rows = [
+                {"values": [{"userEnteredFormat": bodies[block[row, col]]} for col in range(col_start, col_end)]}
+                for row in range(row_start, row_end)
+            ]
+            requests.append({
+                "updateCells": {
+                    "range": _grid_range(sheet_id, row_start, col_start, row_end, col_end),
+                    "rows": rows,
+                    "fields": mask,
+                }
+            })
+    return requests
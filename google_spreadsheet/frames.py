@@ -0,0 +1,179 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Decode values responses into NumPy arrays / pandas DataFrames, and back.
+numpy and pandas are optional dependencies, only needed (and imported) by these functions.
+'''
+numpy = None
+pandas = None
+
+
+# day 0 of SERIAL_NUMBER dates
+SERIAL_EPOCH = "1899-12-30"
+
+
+def _require_numpy():
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required, pip install numpy")
+
+
+def _require_pandas():
+    global pandas
+    _require_numpy()
+    if pandas is None:
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("pandas is required, pip install pandas")
+
+
+def pad_values(values, width=None):
+    """
+    Pad ragged rows into a 2-D object array, missing cells are ""
+
+    :param values: list of lists, as in a values response
+    :param width: columns count, default to the longest row
+    :return: numpy object array
+    """
+    _require_numpy()
+    if width is None:
+        width = max([len(row) for row in values] or [0])
+    array = numpy.full((len(values), width), "", dtype=object)
+    for i, row in enumerate(values):
+        if row:
+            array[i, :len(row)] = row[:width]
+    return array
+
+
+def serial_to_datetime(serials):
+    """
+    Convert SERIAL_NUMBER dates to datetime64, in bulk
+
+    :param serials: float array of days since 1899-12-30, NaN for missing
+    :return: datetime64[ms] array, NaT for missing
+    """
+    _require_numpy()
+    serials = numpy.asarray(serials, dtype=numpy.float64)
+    milliseconds = numpy.round(serials * 86400000.0)
+    missing = numpy.isnan(milliseconds)
+    deltas = numpy.where(missing, 0, milliseconds).astype("int64").astype("timedelta64[ms]")
+    dates = numpy.datetime64(SERIAL_EPOCH, "ms") + deltas
+    dates[missing] = numpy.datetime64("NaT")
+    return dates
+
+
+def infer_column(column):
+    """
+    Infer the dtype of an object column in a vectorized pass:
+    bool, int64 or float64 (NaN for empty cells) if all non-empty cells are such, else kept as object
+
+    :param column: 1-D object array, empty cells are ""
+    :return: typed array
+    """
+    _require_numpy()
+    empty = (column == "") | numpy.equal(column, None)
+    filled = column[~empty]
+    if filled.size == 0:
+        return column
+
+    kinds = set(map(type, filled.tolist()))
+    if kinds == {bool}:
+        if empty.any():
+            return column
+        return column.astype(bool)
+    if not kinds <= {int, float}:
+        return column
+
+    result = numpy.full(column.shape, numpy.nan)
+    result[~empty] = filled.astype(numpy.float64)
+    if kinds == {int} and not empty.any():
+        return result.astype(numpy.int64)
+    return result
+
+
+def values_to_array(values, width=None, infer=False):
+    """
+    Decode values of a response into a padded 2-D array
+
+    :param values: list of lists
+    :param width: columns count, default to the longest row
+    :param infer: return a list of typed column arrays instead of one object array
+    :return: numpy object array, or list of column arrays
+    """
+    array = pad_values(values, width)
+    if not infer:
+        return array
+    return [infer_column(array[:, i]) for i in range(array.shape[1])]
+
+
+def values_to_frame(values, header=True, date_columns=None):
+    """
+    Decode values of a response into a DataFrame, with per-column dtypes
+
+    :param values: list of lists, UNFORMATTED_VALUE values for numbers to be typed
+    :param header: first row holds column names or not
+    :param date_columns: names or indexes of SERIAL_NUMBER date columns, converted to datetime64
+    :return: pandas DataFrame
+    """
+    _require_pandas()
+    names = None
+    if header and values:
+        names, values = values[0], values[1:]
+
+    width = max([len(row) for row in values] + [len(names or [])] or [0])
+    columns = values_to_array(values, width, infer=True)
+    if names is None:
+        names = list(range(width))
+    else:
+        names = list(names) + list(range(len(names), width))
+
+    date_columns = set(date_columns or [])
+    data = {}
+    for i, (name, column) in enumerate(zip(names, columns)):
+        if (name in date_columns or i in date_columns) and column.dtype.kind in "fi":
+            column = serial_to_datetime(column)
+        data[i] = column
+    frame = pandas.DataFrame(data, columns=list(range(width)))
+    frame.columns = names
+    return frame
+
+
+def frame_to_values(frame, header=True, index=False, date_format="%Y-%m-%d %H:%M:%S"):
+    """
+    Encode a DataFrame into values rows, with native Python types
+
+    :param frame: pandas DataFrame
+    :param header: add column names as the first row or not
+    :param index: add the index as the first column or not
+    :param date_format: format of datetime cells, parsed back as dates with USER_ENTERED input
+    :return: generator of rows
+    """
+    _require_pandas()
+    if index:
+        frame = frame.reset_index()
+
+    columns = []
+    for name in frame.columns:
+        series = frame[name]
+        missing = series.isna().to_numpy()
+        numpy_dtype = getattr(series.dtype, "numpy_dtype", None)
+        if series.dtype.kind == "M":
+            cells = series.dt.strftime(date_format).to_numpy(dtype=object)
+        elif numpy_dtype is not None:
+            # nullable Int64, boolean... columns: to_numpy() would upcast to floats with NaN for NA
+            cells = numpy.array(series.to_numpy(dtype=numpy_dtype, na_value=0).tolist(), dtype=object)
+        else:
+            # typed arrays convert to native Python numbers in C
+            cells = numpy.array(series.to_numpy().tolist(), dtype=object)
+        cells[missing] = ""
+        columns.append(cells.tolist())
+
+    if header:
+        yield [str(name) for name in frame.columns]
+    for row in zip(*columns):
+        yield list(row)
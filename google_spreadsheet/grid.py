@@ -0,0 +1,189 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Compact, array-backed representation of fetched values
+'''
+from array import array
+from numbers import Integral, Real
+
+try:
+    from sys import intern
+except ImportError:
+    # python 2, builtin
+    pass
+
+try:
+    array("q")
+    _INT_CODE = "q"
+except ValueError:
+    _INT_CODE = "l"
+
+
+def _compact(value):
+    try:
+        return intern(value)
+    except TypeError:
+        return value
+
+
+def _typed_column(cells):
+    """
+    Store a column in a typed array if all its present cells are numbers
+
+    :param cells: column cells, None where the row is too short
+    :return: array.array or list
+    """
+    kind = None
+    for value in cells:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, Real):
+            kind = None
+            break
+        if isinstance(value, Integral) and kind != "d":
+            kind = _INT_CODE
+        else:
+            kind = "d"
+
+    if kind is not None:
+        try:
+            return array(kind, [0 if value is None else value for value in cells])
+        except OverflowError:
+            pass
+    return [_compact(value) if value is not None else "" for value in cells]
+
+
+class _Storage(object):
+    __slots__ = ("columns", "row_lengths")
+
+    def __init__(self, columns, row_lengths):
+        self.columns = columns
+        self.row_lengths = row_lengths
+
+
+class ValueGrid(object):
+    """
+    Values of a range held by column: typed arrays for numeric columns, interned strings otherwise.
+    Ragged rows are padded implicitly, missing cells read as "".
+    Slicing returns views sharing the same storage.
+
+    Example:
+    >>> grid = sheet.get_values("A1", "T200000", as_grid=True)
+    >>> grid[10, 2]
+    >>> body = grid[100:200, 0:5]
+    >>> sheet.update_values("A1", values=body.to_list())
+    """
+    def __init__(self, values=None, range_name=None, major_dimension=None, _storage=None, _window=None):
+        self.range = range_name
+        self.major_dimension = major_dimension
+        if _storage is None:
+            values = values or []
+            width = max([len(row) for row in values] or [0])
+            row_lengths = array("l", [len(row) for row in values])
+            columns = []
+            for col in range(width):
+                columns.append(_typed_column([row[col] if col < len(row) else None for row in values]))
+            _storage = _Storage(columns, row_lengths)
+            _window = (0, len(values), 0, width)
+        self._storage = _storage
+        self._row_start, self._row_stop, self._col_start, self._col_stop = _window
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        :param response: values.get response
+        :return: ValueGrid object
+        """
+        return cls(response.get("values", []), response.get("range"), response.get("majorDimension"))
+
+    @property
+    def shape(self):
+        return self._row_stop - self._row_start, self._col_stop - self._col_start
+
+    def __len__(self):
+        return self._row_stop - self._row_start
+
+    @staticmethod
+    def _window_of(key, start, stop):
+        if isinstance(key, slice):
+            first, last, step = key.indices(stop - start)
+            if step != 1:
+                raise ValueError("Slicing steps are not supported")
+            return start + first, start + max(first, last)
+        if key < 0:
+            key += stop - start
+        if not 0 <= key < stop - start:
+            raise IndexError(key)
+        return start + key, None
+
+    def __getitem__(self, key):
+        """
+        grid[row, col] for a cell, grid[rows] or grid[rows, cols] with slices for views
+        """
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        row_start, row_stop = self._window_of(rows, self._row_start, self._row_stop)
+        col_start, col_stop = self._window_of(cols, self._col_start, self._col_stop)
+
+        if row_stop is None and col_stop is None:
+            return self._cell(row_start, col_start)
+        if row_stop is None:
+            row_stop = row_start + 1
+        if col_stop is None:
+            col_stop = col_start + 1
+        return ValueGrid(range_name=self.range, major_dimension=self.major_dimension, _storage=self._storage,
+                         _window=(row_start, row_stop, col_start, col_stop))
+
+    def _cell(self, row, col):
+        if col >= self._storage.row_lengths[row]:
+            return ""
+        return self._storage.columns[col][row]
+
+    def column(self, col):
+        """
+        Cells of a column, missing cells of short rows read as "" like in grid[row, col].
+        A memoryview on typed columns (no copy) when no cell is missing and it is supported.
+
+        :param col: 0-based column index in this view
+        :return: sequence of cells
+        """
+        col, _ = self._window_of(col, self._col_start, self._col_stop)
+        cells = self._storage.columns[col]
+        row_lengths = self._storage.row_lengths
+        rows = range(self._row_start, self._row_stop)
+        if any(row_lengths[row] <= col for row in rows):
+            return [cells[row] if row_lengths[row] > col else "" for row in rows]
+        if isinstance(cells, array):
+            try:
+                return memoryview(cells)[self._row_start:self._row_stop]
+            except TypeError:
+                pass
+        return cells[self._row_start:self._row_stop]
+
+    def iter_rows(self):
+        """
+        Rows of this view, trailing empty cells omitted as in values responses
+
+        :return: generator of lists
+        """
+        columns = self._storage.columns
+        row_lengths = self._storage.row_lengths
+        for row in range(self._row_start, self._row_stop):
+            stop = min(row_lengths[row], self._col_stop)
+            yield [columns[col][row] for col in range(self._col_start, stop)]
+
+    __iter__ = iter_rows
+
+    def to_list(self, pad=False):
+        """
+        Convert to a list of lists, e.g. for update_values
+
+        :param pad: pad rows to the full width or not
+        :return: list of lists
+        """
+        rows = list(self.iter_rows())
+        if pad:
+            width = self._col_stop - self._col_start
+            for row in rows:
+                row.extend([""] * (width - len(row)))
+        return rows
@@ -0,0 +1,267 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Instrumentation of API calls: Client(service, instruments=[...]) notifies every instrument
+with a CallRecord after each call, MetricsAggregator keeps per-method metrics in memory.
+
+Example:
+>>> with measure(client) as metrics:
+>>>     run_job(client)
+>>> print(metrics.report())
+'''
+import threading
+import time
+from contextlib import contextmanager
+
+# methods counted against the read requests quota, others against the write requests quota
+READ_METHODS = frozenset(["spreadsheets.get", "values.get", "values.batchGet"])
+
+# upper bounds of latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def request_size(request):
+    """
+    Bytes of an API request: URI and JSON body
+
+    :param request: googleapiclient.http.HttpRequest object
+    :return: bytes count
+    """
+    return len(getattr(request, "uri", None) or "") + len(getattr(request, "body", None) or "")
+
+
+def measure_response(request, record):
+    """
+    Count in `record` the bytes of the response body of a request, as received from the transport,
+    instead of serializing the decoded response again
+
+    :param request: googleapiclient.http.HttpRequest object, its `postproc` is wrapped
+    :param record: CallRecord object
+    :return: None
+    """
+    postproc = getattr(request, "postproc", None)
+    if postproc is None:
+        return
+
+    def measured(response, content):
+        record.response_bytes = len(content or b"")
+        return postproc(response, content)
+    request.postproc = measured
+
+
+class CallRecord(object):
+    """
+    One API call, retries included
+
+    :param method: API method, e.g. "values.batchGet"
+    :param file_id: spreadsheet id
+    :param ranges: ranges count of the call
+    :param request_bytes: request size
+    """
+    __slots__ = ("method", "file_id", "ranges", "request_bytes", "response_bytes", "latency", "waited",
+                 "retries", "outcome", "status")
+
+    OK = "ok"
+    ERROR = "error"
+
+    def __init__(self, method, file_id=None, ranges=0, request_bytes=0):
+        self.method = method
+        self.file_id = file_id
+        self.ranges = ranges
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        # seconds from the first attempt to the end, waits included
+        self.latency = 0.0
+        # seconds spent waiting for the rate limiter or between retries
+        self.waited = 0.0
+        self.retries = 0
+        self.outcome = self.ERROR
+        # HTTP status, None if no response was received
+        self.status = None
+
+    def __repr__(self):
+        return "CallRecord({}, {}, {}, {:.3f}s)".format(self.method, self.file_id, self.outcome, self.latency)
+
+
+class Instrument(object):
+    """
+    Base class of instruments, override `on_call`
+    """
+    def on_call(self, record):
+        """
+        Called after every API call
+
+        :param record: CallRecord object
+        :return: None
+        """
+        pass
+
+
+class MethodMetrics(object):
+    """
+    Metrics of an API method
+    """
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.ranges = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.waited = 0.0
+        # latency histogram, the last bucket counts calls over LATENCY_BUCKETS[-1]
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, record):
+        self.calls += 1
+        if record.outcome != CallRecord.OK:
+            self.errors += 1
+        self.retries += record.retries
+        self.ranges += record.ranges
+        self.request_bytes += record.request_bytes
+        self.response_bytes += record.response_bytes
+        self.latency += record.latency
+        self.max_latency = max(self.max_latency, record.latency)
+        self.waited += record.waited
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if record.latency <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def percentile(self, q):
+        """
+        Latency percentile, estimated as the upper bound of its histogram bucket
+
+        :param q: percentile, 0 to 100
+        :return: seconds, None without calls
+        """
+        if not self.calls:
+            return None
+        rank = q / 100.0 * self.calls
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max_latency
+        return self.max_latency
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "ranges": self.ranges,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency,
+            "max_latency": self.max_latency,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "waited": self.waited,
+            "histogram": list(self.histogram),
+        }
+
+
+class MetricsAggregator(Instrument):
+    """
+    Thread-safe in-memory aggregation of API calls, per method
+    """
+    def __init__(self):
+        self.methods = {}
+        self.started = time.time()
+        self.elapsed = None
+        self._lock = threading.Lock()
+
+    def on_call(self, record):
+        with self._lock:
+            metrics = self.methods.get(record.method)
+            if metrics is None:
+                metrics = self.methods[record.method] = MethodMetrics()
+            metrics.add(record)
+
+    def reset(self):
+        with self._lock:
+            self.methods = {}
+            self.started = time.time()
+            self.elapsed = None
+
+    def quota_units(self):
+        """
+        Estimate of quota units used: every attempt, retries included, is a request
+        against the read or the write requests per minute quota
+
+        :return: dict of "read" and "write" requests
+        """
+        units = {"read": 0, "write": 0}
+        with self._lock:
+            for method, metrics in self.methods.items():
+                units["read" if method in READ_METHODS else "write"] += metrics.calls + metrics.retries
+        return units
+
+    def quota_rate(self):
+        """
+        Quota units used per minute over the measured period
+
+        :return: dict of "read" and "write" requests per minute
+        """
+        elapsed = self.elapsed if self.elapsed is not None else time.time() - self.started
+        units = self.quota_units()
+        return dict((key, value * 60.0 / max(elapsed, 1e-9)) for key, value in units.items())
+
+    def summary(self):
+        """
+        :return: dict of per-method metrics and totals, JSON serializable
+        """
+        with self._lock:
+            methods = dict((method, metrics.to_dict()) for method, metrics in self.methods.items())
+        totals = {}
+        for key in ("calls", "errors", "retries", "request_bytes", "response_bytes", "latency", "waited"):
+            totals[key] = sum(metrics[key] for metrics in methods.values())
+        return {
+            "methods": methods,
+            "totals": totals,
+            "quota_units": self.quota_units(),
+            "elapsed": self.elapsed if self.elapsed is not None else time.time() - self.started,
+        }
+
+    def report(self):
+        """
+        :return: human readable table of the summary
+        """
+        summary = self.summary()
+        lines = ["{:<26} {:>6} {:>6} {:>7} {:>12} {:>12} {:>9} {:>9}".format(
+            "method", "calls", "errors", "retries", "sent bytes", "recv bytes", "p50 (s)", "p95 (s)")]
+        for method in sorted(summary["methods"]):
+            metrics = summary["methods"][method]
+            lines.append("{:<26} {calls:>6} {errors:>6} {retries:>7} {request_bytes:>12} {response_bytes:>12} "
+                         "{p50:>9} {p95:>9}".format(method, **metrics))
+        lines.append("quota units: {read} read, {write} write in {elapsed:.1f}s".format(
+            elapsed=summary["elapsed"], **summary["quota_units"]))
+        return "\n".join(lines)
+
+
+@contextmanager
+def measure(client, aggregator=None):
+    """
+    Aggregate the API calls of a client within a block
+
+    :param client: Client object
+    :param aggregator: MetricsAggregator object, a new one if None
+    :return: context manager giving the aggregator
+    """
+    if aggregator is None:
+        aggregator = MetricsAggregator()
+    aggregator.started = time.time()
+    aggregator.elapsed = None
+    # replaced, not mutated, so concurrent calls see a consistent list
+    client.instruments = client.instruments + [aggregator]
+    try:
+        yield aggregator
+    finally:
+        aggregator.elapsed = time.time() - aggregator.started
+        client.instruments = [instrument for instrument in client.instruments if instrument is not aggregator]
@@ -0,0 +1,232 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Patch spreadsheet details in memory from batchUpdate requests and replies,
+so that a write does not need a full re-fetch of the spreadsheet.
+
+Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets/request
+'''
+
+# requests which do not touch anything kept in spreadsheet/sheet properties
+NEUTRAL_REQUESTS = frozenset([
+    "repeatCell",
+    "updateCells",
+    "pasteData",
+    "updateBorders",
+    "findReplace",
+    "sortRange",
+    "copyPaste",
+    "cutPaste",
+    "autoFill",
+])
+
+_GRID_KEYS = {
+    "ROWS": "rowCount",
+    "COLUMNS": "columnCount",
+}
+
+
+def _find_sheet(details, sheet_id):
+    for sheet in details.get("sheets", []):
+        if sheet["properties"]["sheetId"] == sheet_id:
+            return sheet
+    return None
+
+
+def _renumber(sheets):
+    for index, sheet in enumerate(sheets):
+        sheet["properties"]["index"] = index
+
+
+def _apply_fields(target, source, fields):
+    """
+    Copy `fields` (a FieldMask string) from `source` to `target`
+
+    :return: False if the mask can not be applied locally
+    """
+    if "(" in fields:
+        return False
+
+    for path in filter(None, [f.strip() for f in fields.split(",")]):
+        if path == "*":
+            target.clear()
+            target.update(source)
+            continue
+
+        keys = path.split(".")
+        src, dst = source, target
+        for key in keys[:-1]:
+            src = src.get(key, {}) if isinstance(src, dict) else {}
+            dst = dst.setdefault(key, {})
+
+        if isinstance(src, dict) and keys[-1] in src:
+            dst[keys[-1]] = src[keys[-1]]
+        else:
+            # a field in the mask but not in the body is cleared
+            dst.pop(keys[-1], None)
+    return True
+
+
+def _add_sheet(details, request, reply):
+    if not reply or "properties" not in reply:
+        return False
+
+    sheets = details.setdefault("sheets", [])
+    index = reply["properties"].get("index", len(sheets))
+    # keep the reply itself, Sheet objects built from it stay in sync
+    sheets.insert(index, reply)
+    _renumber(sheets)
+    return True
+
+
+def _delete_sheet(details, request, reply):
+    sheet = _find_sheet(details, request["sheetId"])
+    if sheet is not None:
+        details["sheets"].remove(sheet)
+        _renumber(details["sheets"])
+    return True
+
+
+def _update_sheet_properties(details, request, reply):
+    properties = request["properties"]
+    sheet = _find_sheet(details, properties["sheetId"])
+    if sheet is None:
+        return False
+
+    fields = request["fields"]
+    old_index = sheet["properties"].get("index")
+    if not _apply_fields(sheet["properties"], properties, fields):
+        return False
+
+    new_index = sheet["properties"].get("index")
+    if new_index != old_index and new_index is not None:
+        # indexes of a move are "before the move" indexes
+        sheets = details["sheets"]
+        sheets.remove(sheet)
+        if old_index is not None and new_index > old_index:
+            new_index -= 1
+        sheets.insert(new_index, sheet)
+        _renumber(sheets)
+    return True
+
+
+def _update_spreadsheet_properties(details, request, reply):
+    return _apply_fields(details.setdefault("properties", {}), request["properties"], request["fields"])
+
+
+def _change_dimension(details, sheet_id, dimension, delta):
+    sheet = _find_sheet(details, sheet_id)
+    if sheet is None:
+        return False
+
+    grid = sheet["properties"].get("gridProperties")
+    key = _GRID_KEYS.get(dimension)
+    if grid is None or key not in grid:
+        return False
+    grid[key] += delta
+    return True
+
+
+def _append_dimension(details, request, reply):
+    return _change_dimension(details, request["sheetId"], request["dimension"], request["length"])
+
+
+def _insert_dimension(details, request, reply):
+    dimension_range = request["range"]
+    length = dimension_range["endIndex"] - dimension_range["startIndex"]
+    return _change_dimension(details, dimension_range["sheetId"], dimension_range["dimension"], length)
+
+
+def _delete_dimension(details, request, reply):
+    dimension_range = request["range"]
+    length = dimension_range["endIndex"] - dimension_range["startIndex"]
+    return _change_dimension(details, dimension_range["sheetId"], dimension_range["dimension"], -length)
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def merge_details(details, partial):
+    """
+    Merge partially loaded details, e.g. from a field-masked spreadsheets.get,
+    into already loaded ones. Sheets are matched by sheetId.
+
+    :param details: spreadsheet details, updated in place
+    :param partial: more details of the same spreadsheet
+    :return: None
+    """
+    for key, value in partial.items():
+        if key != "sheets":
+            if isinstance(value, dict) and isinstance(details.get(key), dict):
+                _merge(details[key], value)
+            else:
+                details[key] = value
+            continue
+
+        sheets = details.setdefault("sheets", [])
+        for sheet in value:
+            existing = _find_sheet(details, sheet["properties"]["sheetId"])
+            if existing is None:
+                sheets.append(sheet)
+            else:
+                _merge(existing, sheet)
+        sheets.sort(key=lambda x: x["properties"].get("index", 0))
+
+
+_HANDLERS = {
+    "addSheet": _add_sheet,
+    "duplicateSheet": _add_sheet,
+    "deleteSheet": _delete_sheet,
+    "updateSheetProperties": _update_sheet_properties,
+    "updateSpreadsheetProperties": _update_spreadsheet_properties,
+    "appendDimension": _append_dimension,
+    "insertDimension": _insert_dimension,
+    "deleteDimension": _delete_dimension,
+}
+
+
+def apply_request(details, request, reply=None):
+    """
+    Patch spreadsheet details with a single update request and its reply
+
+    :param details: spreadsheet details, as returned by spreadsheets.get
+    :param request: update request, e.g. {"addSheet": {...}}
+    :param reply: matching item of the batchUpdate `replies`
+    :return: False if the change could not be applied locally
+    """
+    applied = True
+    for kind, body in request.items():
+        if kind in NEUTRAL_REQUESTS:
+            continue
+        handler = _HANDLERS.get(kind)
+        if handler is None:
+            applied = False
+            continue
+        try:
+            result = handler(details, body, (reply or {}).get(kind))
+        except (KeyError, TypeError, ValueError):
+            result = False
+        applied = applied and result
+    return applied
+
+
+def apply_replies(details, requests, replies):
+    """
+    Patch spreadsheet details with a whole batchUpdate
+
+    :param details: spreadsheet details
+    :param requests: update requests sent
+    :param replies: `replies` of the batchUpdate response
+    :return: False if any of the changes could not be applied locally
+    """
+    applied = True
+    for i, request in enumerate(requests):
+        reply = replies[i] if i < len(replies) else None
+        applied = apply_request(details, request, reply) and applied
+    return applied
@@ -4,58 +4,20 @@ Created on 2016-11-10
 
 @author: jingyang <jingyang@nexa-corp.com>
 '''
-import re
+import json
+import os
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 
 from googleapiclient.errors import HttpError
 
-from google_spreadsheet import exceptions
-
-
-class Dimension(object):
-    """
-    Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets.values#dimension
-    """
-    ROWS = "ROWS"
-    COLUMNS = "COLUMNS"
-
-
-class ValueInputOption(object):
-    """
-    Doc: https://developers.google.com/sheets/reference/rest/v4/ValueInputOption
-    """
-    RAW = "RAW"
-    USER_ENTERED = "USER_ENTERED"
-
-
-class NumberFormatType(object):
-    """
-    Doc: https://developers.google.com/sheets/reference/rest/v4/spreadsheets#NumberFormatType
-    """
-    TEXT = "TEXT"
-    NUMBER = "NUMBER"
-    PERCENT = "PERCENT"
-    CURRENCY = "CURRENCY"
-    DATE = "DATE"
-    TIME = "TIME"
-    DATE_TIME = "DATE_TIME"
-    SCIENTIFIC = "SCIENTIFIC"
-
-
-class ValueRenderOption(object):
-    """
-    Doc: https://developers.google.com/sheets/reference/rest/v4/ValueRenderOption
-    """
-    FORMATTED_VALUE = "FORMATTED_VALUE"
-    UNFORMATTED_VALUE = "UNFORMATTED_VALUE"
-    FORMULA = "FORMULA"
-
-
-class DateTimeRenderOption(object):
-    """
-    Doc: https://developers.google.com/sheets/reference/rest/v4/DateTimeRenderOption
-    """
-    SERIAL_NUMBER = "SERIAL_NUMBER"
-    FORMATTED_STRING = "FORMATTED_STRING"
+from google_spreadsheet import (a1, changes, coalesce, exceptions, formatting, frames, instrumentation, metadata,
+                                paste, throttle, writers)
+from google_spreadsheet.grid import ValueGrid
+from google_spreadsheet.a1 import quote_sheet_name
+from google_spreadsheet.constants import (Dimension, ValueInputOption, NumberFormatType, PasteType,
+                                          ValueRenderOption, DateTimeRenderOption, SpreadsheetFields)
 
 
 class Client(object):
@@ -63,19 +25,122 @@ class Client(object):
     An instance of this class communicates with Google Spreadsheets APIs.
 
     :param service: client service: utils.spreadsheet_service(...)
+    :param http_factory: callable returning a new HTTP transport, utils.http_factory(...),
+                         one is built per thread so the client can be shared across threads.
+                         None to use the transport of `service`
+    :param retry: throttle.RetryPolicy object, retries 429 responses, and 5xx responses of idempotent methods,
+                  None for no retry
+    :param rate_limiter: throttle.RateLimiter object, None for no client-side rate limiting
+    :param cache: cache.ValueCache object caching values reads, None for no cache
+    :param instruments: list of instrumentation.Instrument objects, notified after every API call
     """
-    def __init__(self, service):
+    def __init__(self, service, http_factory=None, retry=None, rate_limiter=None, cache=None, instruments=None):
         self.service = service
+        self.http_factory = http_factory
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.instruments = list(instruments or [])
+        self.stats = {
+            "calls": 0,
+            "throttled": 0,
+            "retried": 0,
+            "rate_limited": 0,
+        }
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _http(self):
+        """
+        HTTP transport of current thread, None for the transport of `service`
+        """
+        if self.http_factory is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self.http_factory()
+        return http
+
+    def _execute(self, request, method=None, file_id=None, ranges=0):
+        """
+        Execute an API request, waiting for the rate limiter and retrying per the retry policy
 
-    def open(self, file_id):
+        :param request: googleapiclient.http.HttpRequest object
+        :param method: API method, e.g. "values.get", for instruments
+        :param file_id: spreadsheet id, for instruments
+        :param ranges: ranges count of the request, for instruments
+        :return: response
+        """
+        record = None
+        instruments = self.instruments
+        if instruments:
+            record = instrumentation.CallRecord(method, file_id, ranges, instrumentation.request_size(request))
+            instrumentation.measure_response(request, record)
+        started = time.time()
+        attempt = 0
+        try:
+            while True:
+                if self.rate_limiter is not None:
+                    waited = self.rate_limiter.acquire()
+                    if waited > 0:
+                        self._count("throttled")
+                        if record is not None:
+                            record.waited += waited
+                self._count("calls")
+                try:
+                    response = request.execute(http=self._http())
+                except HttpError as error:
+                    status = error.resp.status
+                    if record is not None:
+                        record.status = status
+                    if status == 429:
+                        self._count("rate_limited")
+                    if self.retry is None or not self.retry.should_retry(status, attempt, method):
+                        if status == 429:
+                            raise exceptions.RateLimitExceeded(error)
+                        raise
+                    delay = self.retry.delay(attempt, throttle.retry_after(error.resp))
+                    time.sleep(delay)
+                    self._count("retried")
+                    attempt += 1
+                    if record is not None:
+                        record.waited += delay
+                        record.retries = attempt
+                else:
+                    if record is not None:
+                        record.outcome = instrumentation.CallRecord.OK
+                        record.status = 200
+                    return response
+        finally:
+            if record is not None:
+                record.latency = time.time() - started
+                for instrument in instruments:
+                    instrument.on_call(record)
+
+    def open(self, file_id, fields=SpreadsheetFields.ALL, ranges=None, include_grid_data=None):
         """
         Opens a spreadsheet specified by `file id`
 
         :param file_id: An id of a spreadsheet as it appears in a URL in a browser
+        :param fields: field mask, e.g. SpreadsheetFields.SHEET_PROPERTIES, None for everything
+        :param ranges: only load sheets of these ranges, e.g. ["Sheet1", "'Sheet 2'!A1:B2"]
+        :param include_grid_data: include cells data of the loaded sheets or not
         :return: Spreadsheet object
         """
+        parameters = {}
+        if fields is not None:
+            parameters["fields"] = fields
+        if ranges is not None:
+            parameters["ranges"] = ranges
+        if include_grid_data is not None:
+            parameters["includeGridData"] = include_grid_data
         try:
-            response = self.service.spreadsheets().get(spreadsheetId=file_id).execute()
+            response = self._execute(self.service.spreadsheets().get(spreadsheetId=file_id, **parameters),
+                                     "spreadsheets.get", file_id, len(ranges or []))
         except HttpError as error:
             if error.resp.status == 404:
                 raise exceptions.NotFound(error)
@@ -84,79 +149,212 @@ class Client(object):
             else:
                 raise exceptions.APIException(error)
         else:
-            return Spreadsheet(self, response)
+            response.setdefault("spreadsheetId", file_id)
+            return Spreadsheet(self, response, fields, ranges, include_grid_data)
+
+    _CACHE_PARAMETERS = frozenset(["majorDimension", "valueRenderOption", "dateTimeRenderOption"])
+
+    def _cache_key(self, file_id, range_name, args, kwargs):
+        """
+        Cache key of a values read, None if it is not cacheable
+        """
+        if self.cache is None or args or set(kwargs) - self._CACHE_PARAMETERS:
+            return None
+        try:
+            # "Sheet1!A1:B2" and "'Sheet1'!A1:B2" share an entry
+            range_name = a1.A1Range.parse(range_name).to_a1()
+        except exceptions.IncorrectCellLabel:
+            pass
+        return (
+            file_id, range_name,
+            kwargs.get("majorDimension", Dimension.ROWS),
+            kwargs.get("valueRenderOption", ValueRenderOption.FORMATTED_VALUE),
+            kwargs.get("dateTimeRenderOption", DateTimeRenderOption.SERIAL_NUMBER)
+        )
+
+    def _invalidate(self, file_id, ranges=None):
+        if self.cache is not None:
+            self.cache.invalidate(file_id, ranges)
 
     def update(self, file_id, requests):
         try:
-            response = self.service.spreadsheets().batchUpdate(
+            response = self._execute(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=file_id,
                 body={
                     "requests": requests
                 }
-            ).execute()
+            ), "spreadsheets.batchUpdate", file_id)
         except HttpError as error:
             if error.resp.status == 400:
                 raise exceptions.BadRequest(error)
+            else:
+                raise exceptions.APIException(error)
         else:
             return response
+        finally:
+            self._invalidate(file_id)
 
     def values_update(self, file_id, range_name, values, value_input_option=ValueInputOption.USER_ENTERED,
                       major_dimension=Dimension.ROWS):
         try:
-            response = self.service.spreadsheets().values().update(
+            response = self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=file_id, range=range_name, valueInputOption=value_input_option,
                 body={
                     "values": values,
                     "majorDimension": major_dimension
                 }
-            ).execute()
+            ), "values.update", file_id, 1)
         except HttpError as error:
             raise exceptions.BadRequest(error)
         else:
             return response
+        finally:
+            self._invalidate(file_id, [range_name])
 
     def values_batch_update(self, file_id, data, value_input_option=ValueInputOption.USER_ENTERED):
         try:
-            response = self.service.spreadsheets().values().batchUpdate(
+            response = self._execute(self.service.spreadsheets().values().batchUpdate(
                 spreadsheetId=file_id,
                 body={
                     "valueInputOption": value_input_option,
                     "data": data
                 }
-            ).execute()
+            ), "values.batchUpdate", file_id, len(data))
         except HttpError as error:
             raise exceptions.BadRequest(error)
         else:
             return response
+        finally:
+            self._invalidate(file_id, [item["range"] for item in data])
 
     def values_get(self, file_id, range_name, *args, **kwargs):
+        key = self._cache_key(file_id, range_name, args, kwargs)
+        if key is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
         try:
-            response = self.service.spreadsheets().values().get(
+            response = self._execute(self.service.spreadsheets().values().get(
                 spreadsheetId=file_id, range=range_name, *args, **kwargs
-            ).execute()
+            ), "values.get", file_id, 1)
         except HttpError as error:
             raise exceptions.BadRequest(error)
         else:
+            if key is not None:
+                self.cache.put(key, response)
             return response
 
     def values_batch_get(self, file_id, ranges, *args, **kwargs):
+        keys = [self._cache_key(file_id, range_name, args, kwargs) for range_name in ranges]
+        cached = [None] * len(ranges)
+        if self.cache is not None and None not in keys:
+            cached = [self.cache.get(key) for key in keys]
+            if None not in cached:
+                return {"spreadsheetId": file_id, "valueRanges": cached}
+
+        missing = [range_name for range_name, value_range in zip(ranges, cached) if value_range is None]
         try:
-            response = self.service.spreadsheets().values().batchGet(
-                spreadsheetId=file_id, ranges=ranges, *args, **kwargs
-            ).execute()
+            response = self._execute(self.service.spreadsheets().values().batchGet(
+                spreadsheetId=file_id, ranges=missing, *args, **kwargs
+            ), "values.batchGet", file_id, len(missing))
         except HttpError as error:
             raise exceptions.BadRequest(error)
         else:
+            if len(missing) == len(ranges):
+                if self.cache is not None and None not in keys:
+                    for key, value_range in zip(keys, response.get("valueRanges", [])):
+                        self.cache.put(key, value_range)
+                return response
+
+            fetched = iter(response.get("valueRanges", []))
+            for i, key in enumerate(keys):
+                if cached[i] is None:
+                    cached[i] = next(fetched)
+                    self.cache.put(key, cached[i])
+            response["valueRanges"] = cached
             return response
 
+    def _map(self, func, items, workers):
+        """
+        Call `func` on every item on a thread pool, errors are collected as APIException
+
+        :return: list of results, in the order of items
+        """
+        def run(item):
+            try:
+                return func(item)
+            except exceptions.APIException as error:
+                return error
+            except Exception as error:
+                return exceptions.APIException(error)
+
+        if self.http_factory is None:
+            # the transport of `service` can not be shared across threads
+            workers = 1
+        workers = min(workers, len(items))
+        if workers <= 1:
+            return [run(item) for item in items]
+
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(run, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def open_many(self, file_ids, workers=8, fields=SpreadsheetFields.ALL, ranges=None, include_grid_data=None):
+        """
+        Opens several spreadsheets concurrently, see open().
+        Runs serially unless the client has an `http_factory`.
+
+        :param file_ids: ids of spreadsheets
+        :param workers: threads count
+        :return: list of Spreadsheet objects, or APIException objects for failed ones,
+                 in the order of `file_ids`
+        """
+        return self._map(lambda file_id: self.open(file_id, fields, ranges, include_grid_data),
+                         list(file_ids), workers)
+
+    def values_get_many(self, items, workers=8, **kwargs):
+        """
+        Get values of several ranges, possibly of different spreadsheets, concurrently.
+        Runs serially unless the client has an `http_factory`.
+
+        :param items: list of (file_id, range_name)
+        :param workers: threads count
+        :param kwargs: parameters of values_get(), e.g. valueRenderOption
+        :return: list of responses, or APIException objects for failed ones, in the order of `items`
+        """
+        return self._map(lambda item: self.values_get(item[0], item[1], **kwargs), list(items), workers)
+
 
 class Spreadsheet(object):
     """
     A class for a spreadsheet object
+
+    :param fields: field mask the details were loaded with, None for everything
+    :param ranges: ranges the details were restricted to, None for all sheets
+    :param include_grid_data: details were loaded with cells data or not
     """
-    def __init__(self, client, details):
+    def __init__(self, client, details, fields=None, ranges=None, include_grid_data=None):
         self.client = client
         self.details = details
+        self.fields = fields
+        self.ranges = ranges
+        self.include_grid_data = include_grid_data
+        self.stale = False
+        self._batch = None
+        self._fetched = set()
+
+    @property
+    def details(self):
+        return self._details
+
+    @details.setter
+    def details(self, details):
+        self._details = details
+        self._build_index()
 
     @property
     def file_id(self):
@@ -164,15 +362,104 @@ class Spreadsheet(object):
 
     @property
     def title(self):
+        if "title" not in self.details.get("properties", {}):
+            self.load("properties")
         return self.details["properties"]["title"]
 
+    @property
+    def partial(self):
+        """
+        Details were loaded with a field mask or a sheet subset
+        """
+        return self.fields is not None or self.ranges is not None
+
     def refresh(self):
         """
-        Refresh/Re-open this spreadsheet file
+        Refresh/Re-open this spreadsheet file, with the same field mask and ranges
+
+        :return: None
+        """
+        self.details = self.client.open(self.file_id, self.fields, self.ranges, self.include_grid_data).details
+        self.stale = False
+        self._fetched = set()
+
+    def load(self, fields, ranges=None):
+        """
+        Fetch more details and merge them into the loaded ones
+
+        :param fields: field mask, sheets must include `sheets.properties.sheetId` to be merged
+        :param ranges: restrict sheets to these ranges
+        :return: None
+        """
+        partial = self.client.open(self.file_id, fields, ranges).details
+        metadata.merge_details(self.details, partial)
+        self._build_index()
+
+    def get_detail(self, key):
+        """
+        Get a top-level field of details, e.g. "namedRanges",
+        fetching it first if it was not loaded
+
+        :param key: field name
+        :return: field value, None if the spreadsheet does not have it
+        """
+        if key not in self.details and self.partial and key not in self._fetched:
+            self.load(key)
+            self._fetched.add(key)
+        return self.details.get(key)
+
+    def _load_sheets(self, ranges=None):
+        """
+        Fetch properties of sheets missed by a partial load
+
+        :param ranges: sheet ranges, None for all sheets
+        :return: None
+        """
+        self.load("sheets.properties", ranges)
+
+    def _load_all_sheets(self):
+        """
+        Fetch properties of all sheets once, if only a subset was loaded, so that
+        sheet lists and positions are the ones of the spreadsheet
+
+        :return: None
+        """
+        if "all sheets" in self._fetched:
+            return
+        if self.ranges is not None or (self.fields is not None and "sheets" not in self.details):
+            self._load_sheets()
+        self._fetched.add("all sheets")
+
+    def mark_stale(self):
+        """
+        Mark local details as out of date, they will be re-fetched on next access
+
+        :return: None
+        """
+        self.stale = True
 
+    def ensure_fresh(self):
+        """
+        Refresh only if local details have been marked stale
+
+        :return: None
+        """
+        if self.stale:
+            self.refresh()
+
+    def apply_replies(self, requests, replies):
+        """
+        Patch local details with sent update requests and their replies,
+        instead of re-fetching the whole spreadsheet.
+        Details are marked stale if some change can not be applied locally.
+
+        :param requests: update requests
+        :param replies: `replies` of the update response
         :return: None
         """
-        self.details = self.client.open(self.file_id).details
+        if not metadata.apply_replies(self.details, requests, replies):
+            self.mark_stale()
+        self._reindex(requests)
 
     def all_sheets(self, include_hidden=False):
         """
@@ -181,10 +468,75 @@ class Spreadsheet(object):
         :param include_hidden: hidden sheets included or not
         :return: list of Sheet objects
         """
-        sheets = self.details["sheets"]
-        if not include_hidden:
-            sheets = filter(lambda x: "hidden" not in x["properties"], sheets)
-        return sheets
+        self.ensure_fresh()
+        self._load_all_sheets()
+        if include_hidden:
+            return list(self.details["sheets"])
+        return list(self._visible)
+
+    def _build_index(self):
+        """
+        Build sheet lookup indexes from details
+
+        :return: None
+        """
+        sheets = self._details.get("sheets", [])
+        self._by_id = dict((sheet["properties"]["sheetId"], sheet) for sheet in sheets)
+        self._by_title = dict((sheet["properties"].get("title"), sheet) for sheet in sheets)
+        self._visible = [sheet for sheet in sheets if not sheet["properties"].get("hidden")]
+
+    def _reindex(self, requests):
+        """
+        Keep lookup indexes up to date after local details were patched with `requests`
+
+        :param requests: applied update requests
+        :return: None
+        """
+        for request in requests:
+            if "addSheet" in request or "duplicateSheet" in request or "deleteSheet" in request:
+                self._build_index()
+                return
+
+            update = request.get("updateSheetProperties")
+            if update is None:
+                continue
+            fields = update.get("fields", "")
+            if "*" in fields or "index" in fields or "hidden" in fields:
+                self._build_index()
+                return
+            if "title" in fields:
+                sheet = self._by_id.get(update["properties"].get("sheetId"))
+                if sheet is not None:
+                    # the old title entry is detected and dropped on lookup
+                    self._by_title[sheet["properties"].get("title")] = sheet
+
+    def _lookup(self, by, value, include_hidden=False):
+        """
+        Get details of a sheet from lookup indexes
+
+        :return: sheet details, None if not found
+        """
+        if by == "index":
+            sheets = self.details.get("sheets", []) if include_hidden else self._visible
+            try:
+                return sheets[value]
+            except IndexError:
+                return None
+
+        if by == "id":
+            sheet = self._by_id.get(value)
+        elif by == "name":
+            sheet = self._by_title.get(value)
+            if sheet is not None and sheet["properties"].get("title") != value:
+                # renamed since it was indexed
+                self._build_index()
+                sheet = self._by_title.get(value)
+        else:
+            raise ValueError("Find sheet by id, name or index, not {}".format(by))
+
+        if sheet is not None and not include_hidden and sheet["properties"].get("hidden"):
+            return None
+        return sheet
 
     def find_sheet_by(self, by, value, include_hidden=False):
         """
@@ -195,25 +547,51 @@ class Spreadsheet(object):
         :param include_hidden: hidden sheets included or not
         :return: Sheet object
         """
-        if by == "id":
-            key = "sheetId"
-        elif by == "name":
-            key = "title"
-        elif by == "index":
-            key = "index"
-        else:
-            raise
-
-        sheets = self.all_sheets(include_hidden)
-        try:
-            if by == "index":
-                sheet = sheets[value]
-            else:
-                sheet = (ws for ws in sheets if ws["properties"][key] == value).next()
-        except (StopIteration, IndexError):
+        self.ensure_fresh()
+        if by == "index":
+            # positions in a loaded subset are not the ones of the spreadsheet
+            self._load_all_sheets()
+        sheet = self._lookup(by, value, include_hidden)
+        if sheet is None and self.ranges is not None and ("all sheets", by, value) not in self._fetched:
+            # not in the loaded sheet subset, fetch it and look again
+            self._fetched.add(("all sheets", by, value))
+            try:
+                self._load_sheets([quote_sheet_name(value)] if by == "name" else None)
+            except exceptions.APIException:
+                # an unknown sheet name is an invalid range
+                raise exceptions.NotFound("Sheet not found")
+            sheet = self._lookup(by, value, include_hidden)
+
+        if sheet is None:
             raise exceptions.NotFound("Sheet not found")
-        else:
-            return Sheet(self, sheet)
+        return Sheet(self, sheet)
+
+    def find_sheets(self, names=None, ids=None, include_hidden=False):
+        """
+        Get several sheets at once by names or ids
+
+        :param names: sheet names
+        :param ids: sheet ids, used if `names` not given
+        :param include_hidden: hidden sheets included or not
+        :return: list of Sheet objects, in the order of given names/ids
+        """
+        by, values = ("name", names) if names is not None else ("id", ids or [])
+        self.ensure_fresh()
+        sheets = [self._lookup(by, value, include_hidden) for value in values]
+        missing = [value for value, sheet in zip(values, sheets) if sheet is None]
+
+        if missing and self.ranges is not None:
+            try:
+                self._load_sheets([quote_sheet_name(value) for value in missing] if by == "name" else None)
+            except exceptions.APIException:
+                # some names are invalid ranges, load all sheets instead
+                self._load_sheets()
+            sheets = [self._lookup(by, value, include_hidden) for value in values]
+            missing = [value for value, sheet in zip(values, sheets) if sheet is None]
+
+        if missing:
+            raise exceptions.NotFound("Sheets not found: {}".format(missing))
+        return [Sheet(self, sheet) for sheet in sheets]
 
     def find_sheet_by_id(self, sheet_id, include_hidden=False):
         """
@@ -252,7 +630,47 @@ class Spreadsheet(object):
         :param requests: update requests
         :return: update response
         """
-        return self.client.update(self.file_id, requests)
+        if self._batch is not None:
+            return self._batch.add(requests, resolver=lambda replies: {"replies": replies})
+        response = self.client.update(self.file_id, requests)
+        self.apply_replies(requests, response.get("replies", []))
+        return response
+
+    def batch(self):
+        """
+        Open a deferred mutation session, all mutators called inside it are
+        queued and sent in one batchUpdate on exit
+
+        Example:
+        >>> with spreadsheet.batch():
+        >>>     result = spreadsheet.add_sheet("New Sheet")
+        >>>     sheet.resize(100, 10)
+        >>> result.result()
+        >>> <Sheet object>
+
+        :return: BatchSession object
+        """
+        return BatchSession(self)
+
+    def _update(self, requests, resolver=None, sheet=None):
+        """
+        Send update requests and patch local details, or queue them if a batch session is active
+
+        :param requests: update requests
+        :param resolver: callable turning the replies of `requests` into a result
+        :param sheet: Sheet object to reload after the update
+        :return: resolved result, or a BatchResult within a batch session
+        """
+        if self._batch is not None:
+            return self._batch.add(requests, resolver, sheet)
+
+        response = self.client.update(self.file_id, requests)
+        replies = response.get("replies", [])
+        self.apply_replies(requests, replies)
+        if sheet is not None:
+            sheet._reload()
+        if resolver is not None:
+            return resolver(replies)
 
     def add_sheet_request(self, sheet_name, row_count=1000, col_count=1000):
         """
@@ -283,12 +701,10 @@ class Spreadsheet(object):
         :param sheet_name: new sheet name
         :param row_count: new sheet row count
         :param col_count: new sheet column count
-        :return: Sheet object
+        :return: Sheet object, or a BatchResult within a batch session
         """
         requests = [self.add_sheet_request(sheet_name, row_count, col_count)]
-        response = self.client.update(self.file_id, requests)
-        self.refresh()
-        return Sheet(self, response["replies"][0]["addSheet"])
+        return self._update(requests, resolver=lambda replies: Sheet(self, replies[0]["addSheet"]))
 
     def delete_sheet_request(self, sheet_id):
         """
@@ -309,11 +725,10 @@ class Spreadsheet(object):
         Delete the sheet with given id
 
         :param sheet_id: id of a sheet to be deleted
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = [self.delete_sheet_request(sheet_id)]
-        self.client.update(self.file_id, requests)
-        self.refresh()
+        return self._update(requests)
 
     def change_title_request(self, new_title):
         """
@@ -337,11 +752,193 @@ class Spreadsheet(object):
         Change spreadsheet title
 
         :param new_title: new title
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = [self.change_title_request(new_title)]
-        self.client.update(self.file_id, requests)
-        self.refresh()
+        return self._update(requests)
+
+    def export_plan(self, directory, format=writers.CSV, include_hidden=False):
+        """
+        Files of an export of every sheet to `directory`, see export_all
+
+        :param directory: directory
+        :param format: "csv", "parquet" or "arrow"
+        :param include_hidden: hidden sheets exported or not
+        :return: list of (Sheet object, file path), in sheets order
+        """
+        plan = []
+        used = set()
+        for details in self.all_sheets(include_hidden):
+            sheet = Sheet(self, details)
+            name = writers.file_name(sheet.name, format)
+            # sheet names differing only by unsafe characters get distinct files
+            stem, extension = os.path.splitext(name)
+            suffix = 1
+            while name.lower() in used:
+                suffix += 1
+                name = "{}_{}{}".format(stem, suffix, extension)
+            used.add(name.lower())
+            plan.append((sheet, os.path.join(directory, name)))
+        return plan
+
+    def export_all(self, directory, format=writers.CSV, include_hidden=False, **kwargs):
+        """
+        Export every sheet to a file of `directory`, one sheet after the other
+        so that memory stays limited to one chunk
+
+        :param directory: existing directory
+        :param format: "csv", "parquet" or "arrow"
+        :param include_hidden: hidden sheets exported or not
+        :param kwargs: other arguments of Sheet.export
+        :return: dict of sheet name -> file path
+        """
+        paths = {}
+        for sheet, path in self.export_plan(directory, format, include_hidden):
+            sheet.export(path, format, **kwargs)
+            paths[sheet.name] = path
+        return paths
+
+    def watch(self, ranges, interval=60.0, max_interval=None, backoff=2.0, block_rows=100,
+              version_probe=changes.AUTO, probe_metadata=True, value_render_option=ValueRenderOption.FORMATTED_VALUE):
+        """
+        Watch ranges for changes by polling. A poll stops at `version_probe` while the version is the same,
+        otherwise reads the ranges in one values.batchGet and compares only blocks of rows whose fingerprint
+        changed. The delay between polls grows by `backoff` while nothing changes, up to `max_interval`.
+
+        Example:
+        >>> for events in spreadsheet.watch(["Orders!A1:F"], interval=10):
+        >>>     print(events)
+        >>> [CellChange(Orders!C7, 'pending' -> 'shipped')]
+
+        :param ranges: watched A1 ranges, e.g. ["Sheet1!A1:D", "Sheet2"]
+        :param interval: seconds between polls after a change
+        :param max_interval: max seconds between polls while nothing changes, default to 16 times `interval`
+        :param backoff: factor of the delay after each poll without change
+        :param block_rows: rows count of a fingerprinted block
+        :param version_probe: callable returning a version of the spreadsheet, e.g. changes.drive_version_probe(),
+                              changes.AUTO for the Drive version if the credentials allow it,
+                              see utils.spreadsheet_service(..., drive_metadata=True),
+                              None to read all the ranges every poll, which is NOT cheap
+        :param probe_metadata: report SheetChange events (sheets added, removed, renamed, resized) or not
+        :param value_render_option: value render option
+        :return: changes.Watcher object, iterate it for lists of events or call poll()
+        """
+        return changes.Watcher(self, ranges, interval, max_interval, backoff, block_rows, version_probe,
+                               probe_metadata, value_render_option)
+
+
+class BatchResult(object):
+    """
+    Handle of a mutator result queued in a batch session, resolved after the flush
+    """
+    def __init__(self, resolver=None):
+        self._resolver = resolver
+        self._done = False
+        self._value = None
+
+    @property
+    def done(self):
+        return self._done
+
+    def result(self):
+        """
+        Get the resolved result
+
+        :return: mutator result, e.g. Sheet object for `add_sheet`
+        """
+        if not self._done:
+            raise exceptions.BatchError("Batch session has not been flushed yet")
+        return self._value
+
+    def _resolve(self, replies):
+        if self._resolver is not None:
+            self._value = self._resolver(replies)
+        self._done = True
+
+
+class BatchSession(object):
+    """
+    Deferred mutation session of a spreadsheet, see Spreadsheet.batch()
+    """
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self.requests = []
+        self._pending = []
+        self._sheets = []
+        self._owner = False
+
+    def __enter__(self):
+        active = self.spreadsheet._batch
+        if active is not None:
+            # nested session, everything goes to the outermost one
+            return active
+        self.spreadsheet._batch = self
+        self._owner = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._owner:
+            return False
+        self.spreadsheet._batch = None
+        self._owner = False
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False
+
+    def add(self, requests, resolver=None, sheet=None):
+        """
+        Queue update requests
+
+        :param requests: update requests
+        :param resolver: callable turning the replies of `requests` into a result
+        :param sheet: Sheet object to reload after the flush
+        :return: BatchResult object
+        """
+        result = BatchResult(resolver)
+        self._pending.append((len(self.requests), len(requests), result))
+        self.requests.extend(requests)
+        if sheet is not None and sheet not in self._sheets:
+            self._sheets.append(sheet)
+        return result
+
+    def discard(self):
+        """
+        Drop all queued requests
+
+        :return: None
+        """
+        self.requests = []
+        self._pending = []
+        self._sheets = []
+
+    def flush(self):
+        """
+        Send all queued requests in one batchUpdate, then patch local details
+
+        :return: update response, None if nothing queued
+        """
+        if not self.requests:
+            self.discard()
+            return None
+
+        requests, pending, sheets = self.requests, self._pending, self._sheets
+        self.discard()
+
+        response = self.spreadsheet.client.update(self.spreadsheet.file_id, requests)
+        replies = response.get("replies", [])
+        self.spreadsheet.apply_replies(requests, replies)
+        for sheet in sheets:
+            try:
+                sheet._reload()
+            except exceptions.NotFound:
+                # deleted in this batch
+                pass
+
+        for start, count, result in pending:
+            result._resolve(replies[start:start + count])
+        return response
 
 
 class Sheet(object):
@@ -352,6 +949,7 @@ class Sheet(object):
         self.spreadsheet = spreadsheet
         self.client = spreadsheet.client
         self.details = details
+        self._snapshot = None
 
     @property
     def sheet_id(self):
@@ -359,18 +957,27 @@ class Sheet(object):
 
     @property
     def name(self):
-        return self.details["properties"]["title"]
+        return self._property("title")
 
     @property
     def row_count(self):
-        return self.details["properties"]["gridProperties"]["rowCount"]
+        return self._property("gridProperties")["rowCount"]
 
     @property
     def col_count(self):
-        return self.details["properties"]["gridProperties"]["columnCount"]
+        return self._property("gridProperties")["columnCount"]
 
-    _MAGIC_NUMBER = 64
-    _cell_addr_re = re.compile(r'([A-Za-z]+)([1-9]\d*)')
+    def _property(self, key):
+        """
+        Get a sheet property, fetching the sheet properties first if it was not loaded
+
+        :param key: property name
+        :return: property value
+        """
+        properties = self.details["properties"]
+        if key not in properties and self.spreadsheet.partial:
+            self.spreadsheet._load_sheets()
+        return properties[key]
 
     def get_int_addr(self, label):
         """
@@ -383,18 +990,7 @@ class Sheet(object):
         >>> sheet.get_int_addr('A1')
         >>> (0, 0)
         """
-        m = self._cell_addr_re.match(label)
-        if m:
-            column_label = m.group(1).upper()
-            row = int(m.group(2)) - 1
-
-            col = -1
-            for i, c in enumerate(reversed(column_label)):
-                col += (ord(c) - self._MAGIC_NUMBER) * (26 ** i)
-        else:
-            raise exceptions.IncorrectCellLabel(label)
-
-        return row, col
+        return a1.cell_coords(label)
 
     def get_addr_int(self, row, col):
         """
@@ -409,53 +1005,60 @@ class Sheet(object):
         >>> sheet.get_addr_int(0, 0)
         >>> A1
         """
-        row = int(row)
-        col = int(col)
-
-        if row < 0 or col < 0:
-            raise exceptions.IncorrectCellLabel('(%s, %s)' % (row, col))
-
-        div = col + 1
-        column_label = ''
-
-        while div:
-            (div, mod) = divmod(div, 26)
-            if mod == 0:
-                mod = 26
-                div -= 1
-            column_label = chr(mod + self._MAGIC_NUMBER) + column_label
-
-        label = '%s%s' % (column_label, row + 1)
-        return label
+        return a1.cell_label(row, col)
 
     def get_range_name(self, range_start, range_end=None):
         """
-        Get cell range
+        Get cell range, the sheet name is quoted if needed
 
         :param range_start: A1 notation
         :param range_end: A1 notation
         :return: range name
         Example:
         >>> sheet.get_range("A1", "B2")
-        >>> "Sheet Name!A1:B2"
+        >>> "'Sheet Name'!A1:B2"
         """
-        range_name = "{sheet_name}!{range_start}{range_end}".format(
-            sheet_name=self.name, range_start=range_start,
-            range_end=":{range_end}".format(range_end=range_end) if range_end else ""
-        )
-        return range_name
+        return a1.range_name(self.name, range_start, range_end)
 
     def refresh(self):
         self.spreadsheet.refresh()
-        sheet = self.spreadsheet.find_sheet_by_id(self.sheet_id)
+        self._reload()
+
+    def _reload(self):
+        """
+        Pick up this sheet's details from the spreadsheet, without re-fetching
+        unless the spreadsheet is stale
+
+        :return: None
+        """
+        sheet = self.spreadsheet.find_sheet_by_id(self.sheet_id, include_hidden=True)
         self.details = sheet.details
-        self.spreadsheet = sheet.spreadsheet
+
+    def _grow_to(self, range_name):
+        """
+        Values writes may expand the grid, make local grid properties cover `range_name`
+
+        :param range_name: updated range, e.g. "Sheet Name!A1:C5"
+        :return: None
+        """
+        if not range_name:
+            return
+        end = range_name.rsplit("!", 1)[-1].split(":")[-1]
+        try:
+            row, col = self.get_int_addr(end)
+        except exceptions.IncorrectCellLabel:
+            self.spreadsheet.mark_stale()
+            return
+
+        grid = self.details["properties"].get("gridProperties", {})
+        grid["rowCount"] = max(grid.get("rowCount", 0), row + 1)
+        grid["columnCount"] = max(grid.get("columnCount", 0), col + 1)
 
     def delete(self):
         """
         Delete sheet itself
 
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         return self.spreadsheet.delete_sheet(self.sheet_id)
 
@@ -496,11 +1099,10 @@ class Sheet(object):
         Change sheet name
 
         :param new_name: name to change
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = [self.change_name_request(new_name)]
-        self.client.update(self.spreadsheet.file_id, requests)
-        self.refresh()
+        return self.spreadsheet._update(requests, sheet=self)
 
     def resize_request(self, row=None, col=None):
         """
@@ -531,11 +1133,10 @@ class Sheet(object):
 
         :param row: new row count
         :param col: new column count
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = [self.resize_request(row, col)]
-        self.client.update(self.spreadsheet.file_id, requests)
-        self.refresh()
+        return self.spreadsheet._update(requests, sheet=self)
 
     def append_request(self, dimension, length=1):
         """
@@ -560,7 +1161,7 @@ class Sheet(object):
 
         :param row: rows count to append
         :param col: columns count to append
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = []
         if row is not None:
@@ -568,8 +1169,7 @@ class Sheet(object):
         if col is not None:
             requests.append(self.append_request(Dimension.COLUMNS, col))
 
-        self.client.update(self.spreadsheet.file_id, requests)
-        self.refresh()
+        return self.spreadsheet._update(requests, sheet=self)
 
     def insert_request(self, dimension, start_index=0, length=1, inherit_before=True):
         """
@@ -605,7 +1205,7 @@ class Sheet(object):
         :param col: columns count to insert
         :param col_start_index: insert start at column index
         :param inherit_before: True - give the new columns or rows the same properties as the prior row or column
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         requests = []
         if row is not None:
@@ -613,8 +1213,7 @@ class Sheet(object):
         if col is not None:
             requests.append(self.insert_request(Dimension.COLUMNS, col_start_index, col, inherit_before))
 
-        self.client.update(self.spreadsheet.file_id, requests)
-        self.refresh()
+        return self.spreadsheet._update(requests, sheet=self)
 
     def number_format(self, format_type=NumberFormatType.NUMBER, pattern=None):
         """
@@ -719,13 +1318,38 @@ class Sheet(object):
         :param end_col_index: 0-based column index, exclude
         :param format_type: number format type
         :param pattern: pattern
-        :return: None
+        :return: None, or a BatchResult within a batch session
         """
         number_format = self.number_format(format_type, pattern)
         requests = [self.format_range_request(number_format, start_row_index, end_row_index,
                                               start_col_index, end_col_index)]
-        self.client.update(self.spreadsheet.file_id, requests)
-        self.refresh()
+        return self.spreadsheet._update(requests, sheet=self)
+
+    def format_cells_requests(self, formats):
+        """
+        Only get the requests of `format_cells`, for batch_update
+
+        :param formats: dict of cell -> userEnteredFormat object, cells as (row, col) 0-based indexes or A1 labels
+        :return: list of repeatCell/updateCells requests
+        """
+        return formatting.plan_formats(self.sheet_id, formats)
+
+    def format_cells(self, formats):
+        """
+        Format cells one by one, neighbor cells of identical formats are sent as one rectangle
+
+        Example:
+        >>> red = sheet.text_format(color={"red": 1})
+        >>> sheet.format_cells(dict(((row, 2), red) for row, value in enumerate(values) if value < 0))
+
+        :param formats: dict of cell -> userEnteredFormat object, e.g. self.number_format(),
+                        cells as (row, col) 0-based indexes or A1 labels
+        :return: None, or a BatchResult within a batch session
+        """
+        requests = self.format_cells_requests(formats)
+        if not requests:
+            return None
+        return self.spreadsheet._update(requests, sheet=self)
 
     def update_values_data(self, range_start, range_end=None, values=None, major_dimension=Dimension.ROWS):
         """
@@ -764,7 +1388,7 @@ class Sheet(object):
         if data:
             response = self.client.values_update(
                 self.spreadsheet.file_id, data["range"], data["values"], value_input_option, major_dimension)
-            self.refresh()
+            self._grow_to(response.get("updatedRange"))
             return response
 
     def batch_update_values(self, values_data_list, value_input_option=ValueInputOption.USER_ENTERED):
@@ -776,26 +1400,471 @@ class Sheet(object):
         :return: updated response
         """
         response = self.client.values_batch_update(self.spreadsheet.file_id, values_data_list, value_input_option)
-        self.refresh()
+        for updated in response.get("responses", []):
+            self._grow_to(updated.get("updatedRange"))
         return response
 
+    def paste_data_request(self, data, row_index=0, col_index=0, delimiter=",", paste_type=PasteType.PASTE_NORMAL):
+        """
+        Only get `paste_data` request, for batch_update
+
+        :param data: delimited text, rows separated by line breaks
+        :param row_index: 0-based row index of the top left cell
+        :param col_index: 0-based column index of the top left cell
+        :param delimiter: fields delimiter, e.g. "," or "\t"
+        :param paste_type: PasteType
+        :return: update request
+        """
+        request = {
+            "pasteData": {
+                "coordinate": {
+                    "sheetId": self.sheet_id,
+                    "rowIndex": row_index,
+                    "columnIndex": col_index
+                },
+                "data": data,
+                "type": paste_type,
+                "delimiter": delimiter
+            }
+        }
+        return request
+
+    def import_csv(self, path, range_start="A1", delimiter=",", encoding="utf-8", chunk_bytes=paste.CHUNK_BYTES,
+                   paste_type=PasteType.PASTE_NORMAL):
+        """
+        Import a CSV/TSV file with pasteData requests, one batchUpdate per chunk of `chunk_bytes`.
+        The file is memory-mapped and sent as text, the grid is appended rows/columns as needed
+        within the same batchUpdate. Requests are sent right away, even within a batch session.
+
+        Example:
+        >>> sheet.import_csv("report.tsv", "A2", delimiter="\t")
+        >>> "Sheet1!A2:F200001"
+
+        :param path: file path
+        :param range_start: top left cell, e.g. A1
+        :param delimiter: fields delimiter, e.g. "," or "\t"
+        :param encoding: an ASCII compatible encoding of the file
+        :param chunk_bytes: bytes of file data per request
+        :param paste_type: PasteType
+        :return: imported range name, None if the file has no records
+        """
+        row_start, col_start = self.get_int_addr(range_start)
+        row_index = row_start
+        col_count = 0
+        for data, rows, cols in paste.iter_chunks(path, delimiter, chunk_bytes, encoding):
+            requests = []
+            if row_index + rows > self.row_count:
+                requests.append(self.append_request(Dimension.ROWS, row_index + rows - self.row_count))
+            if col_start + cols > self.col_count:
+                requests.append(self.append_request(Dimension.COLUMNS, col_start + cols - self.col_count))
+            requests.append(self.paste_data_request(data, row_index, col_start, delimiter, paste_type))
+
+            response = self.client.update(self.spreadsheet.file_id, requests)
+            self.spreadsheet.apply_replies(requests, response.get("replies", []))
+            self._reload()
+            row_index += rows
+            col_count = max(col_count, cols)
+
+        if row_index == row_start:
+            return None
+        return self.get_range_name(range_start, self.get_addr_int(row_index - 1, col_start + max(col_count, 1) - 1))
+
     def get_values(self, range_start, range_end=None, major_dimension=Dimension.ROWS,
                    value_render_option=ValueRenderOption.FORMATTED_VALUE,
-                   date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+                   date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER, as_grid=False):
+        """
+        :param as_grid: return a compact ValueGrid instead of the raw response, for large ranges
+        :return: values response, or ValueGrid object
+        """
         range_name = self.get_range_name(range_start, range_end)
         parameters = {
             "majorDimension": major_dimension,
             "valueRenderOption": value_render_option,
             "dateTimeRenderOption": date_time_render_option
         }
-        return self.client.values_get(self.spreadsheet.file_id, range_name, **parameters)
+        response = self.client.values_get(self.spreadsheet.file_id, range_name, **parameters)
+        if as_grid:
+            return ValueGrid.from_response(response)
+        return response
 
     def batch_get_values(self, ranges, major_dimension=Dimension.ROWS,
                          value_render_option=ValueRenderOption.FORMATTED_VALUE,
-                         date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+                         date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER, max_waste=None):
+        """
+        :param ranges: A1 ranges
+        :param max_waste: coalesce ranges into bounding rectangles having at most this fraction
+                          of unrequested cells, e.g. 0.25, and slice the results back;
+                          None to fetch ranges as given
+        :return: values.batchGet response, one value range per given range
+        """
         parameters = {
             "majorDimension": major_dimension,
             "valueRenderOption": value_render_option,
             "dateTimeRenderOption": date_time_render_option
         }
-        return self.client.values_batch_get(self.spreadsheet.file_id, ranges, **parameters)
+        if max_waste is None:
+            return self.client.values_batch_get(self.spreadsheet.file_id, ranges, **parameters)
+
+        plan = coalesce.ReadPlan(ranges, max_waste, self._grid_size)
+        response = self.client.values_batch_get(self.spreadsheet.file_id, plan.fetch_ranges, **parameters)
+        return plan.split(response, major_dimension)
+
+    def _grid_size(self, sheet_name):
+        """
+        (row count, column count) of a sheet of the spreadsheet, None if unknown
+        """
+        try:
+            sheet = self if sheet_name == self.name else self.spreadsheet.find_sheet_by_name(sheet_name, True)
+        except exceptions.NotFound:
+            return None
+        return sheet.row_count, sheet.col_count
+
+    def _iter_windows(self, chunk_rows=1000, windows_per_request=5, start_row_index=0, end_row_index=None,
+                      start_col_index=0, end_col_index=None,
+                      value_render_option=ValueRenderOption.FORMATTED_VALUE,
+                      date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        """
+        Page through the sheet in row windows, several windows per values.batchGet
+
+        :return: generator of (start row index, end row index, rows list), rows are ragged
+                 and trailing empty rows of a window are omitted, as the API returns them
+        """
+        if end_row_index is None:
+            end_row_index = self.row_count
+        if end_col_index is None:
+            end_col_index = self.col_count
+        if start_row_index >= end_row_index or start_col_index >= end_col_index:
+            return
+
+        windows = []
+        for row in range(start_row_index, end_row_index, chunk_rows):
+            windows.append((row, min(row + chunk_rows, end_row_index)))
+
+        for i in range(0, len(windows), windows_per_request):
+            group = windows[i:i + windows_per_request]
+            ranges = [
+                self.get_range_name(self.get_addr_int(start, start_col_index),
+                                    self.get_addr_int(end - 1, end_col_index - 1))
+                for start, end in group
+            ]
+            response = self.batch_get_values(ranges, Dimension.ROWS, value_render_option, date_time_render_option)
+            value_ranges = response.get("valueRanges", [])
+            for (start, end), value_range in zip(group, value_ranges):
+                yield start, end, value_range.get("values", [])
+            # release the response before fetching the next one
+            del response, value_ranges
+
+    def iter_rows(self, chunk_rows=1000, windows_per_request=5, start_row_index=0, end_row_index=None,
+                  start_col_index=0, end_col_index=None,
+                  value_render_option=ValueRenderOption.FORMATTED_VALUE,
+                  date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        """
+        Stream rows of the sheet, fetching `chunk_rows` rows per window
+        and `windows_per_request` windows per request, so memory stays bounded
+
+        :param chunk_rows: rows count of a window
+        :param windows_per_request: windows count of a values.batchGet
+        :param start_row_index: 0-based row index
+        :param end_row_index: 0-based row index, exclude, default to sheet row count
+        :param start_col_index: 0-based column index
+        :param end_col_index: 0-based column index, exclude, default to sheet column count
+        :param value_render_option: value render option
+        :param date_time_render_option: date time render option
+        :return: generator of rows, trailing empty cells are omitted,
+                 trailing empty rows of the sheet are not yielded
+        """
+        empty_rows = 0
+        for start, end, rows in self._iter_windows(chunk_rows, windows_per_request, start_row_index, end_row_index,
+                                                   start_col_index, end_col_index,
+                                                   value_render_option, date_time_render_option):
+            for row in rows:
+                if not row:
+                    empty_rows += 1
+                    continue
+                # empty rows are only yielded once followed by a non-empty one
+                for _ in range(empty_rows):
+                    yield []
+                empty_rows = 0
+                yield row
+            empty_rows += end - start - len(rows)
+
+    def export(self, path, format=writers.CSV, header=True, chunk_rows=1000, schema=None, delimiter=",",
+               value_render_option=ValueRenderOption.UNFORMATTED_VALUE,
+               date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER,
+               start_row_index=0, end_row_index=None, start_col_index=0, end_col_index=None):
+        """
+        Export the sheet to a file, writing each window of `chunk_rows` rows as it is fetched:
+        CSV rows, Parquet row groups or Arrow IPC record batches. Trailing empty rows are not written.
+        The file is written as `path` + ".part" and renamed to `path` once complete.
+
+        Example:
+        >>> sheet.export("orders.parquet", "parquet")
+        >>> {"rows": 120000, "requests": 120, "dropped_cells": 0}
+
+        :param path: file path
+        :param format: "csv", "parquet" or "arrow"
+        :param header: first row holds column names or not, Parquet and Arrow only
+        :param chunk_rows: rows count of a window
+        :param schema: pyarrow.Schema, Parquet and Arrow only, inferred from the first window if None:
+                       bool or float64 columns if all their cells are such, string otherwise;
+                       later cells which do not fit it are written as nulls and counted in "dropped_cells"
+        :param delimiter: fields delimiter, CSV only
+        :param value_render_option: value render option
+        :param date_time_render_option: date time render option
+        :param start_row_index: 0-based row index
+        :param end_row_index: 0-based row index, exclude, default to sheet row count
+        :param start_col_index: 0-based column index
+        :param end_col_index: 0-based column index, exclude, default to sheet column count
+        :return: dict of written "rows" (header included), "requests" and "dropped_cells" counts
+        """
+        stats = {"rows": 0, "requests": 0}
+        # empty rows are only written once followed by a non-empty one
+        empty_rows = 0
+        with writers.writer(path, format, header, schema, delimiter) as output:
+            for start, end, rows in self._iter_windows(chunk_rows, 1, start_row_index, end_row_index,
+                                                       start_col_index, end_col_index,
+                                                       value_render_option, date_time_render_option):
+                stats["requests"] += 1
+                filled = len(rows)
+                while filled and not rows[filled - 1]:
+                    filled -= 1
+                if not filled:
+                    empty_rows += end - start
+                    continue
+                output.write([[]] * empty_rows + rows[:filled])
+                stats["rows"] += empty_rows + filled
+                empty_rows = end - start - filled
+        stats["dropped_cells"] = output.dropped_cells
+        return stats
+
+    def _grow(self, row=None, col=None):
+        """
+        Make sure the grid has at least `row` rows and `col` columns,
+        sent right away even within a batch session
+
+        :param row: required row count
+        :param col: required column count
+        :return: None
+        """
+        requests = []
+        if row is not None and row > self.row_count:
+            requests.append(self.append_request(Dimension.ROWS, row - self.row_count))
+        if col is not None and col > self.col_count:
+            requests.append(self.append_request(Dimension.COLUMNS, col - self.col_count))
+        if requests:
+            response = self.client.update(self.spreadsheet.file_id, requests)
+            self.spreadsheet.apply_replies(requests, response.get("replies", []))
+
+    def write_rows(self, rows, range_start="A1", max_cells=50000, max_bytes=2 * 1024 * 1024,
+                   value_input_option=ValueInputOption.USER_ENTERED, progress=None):
+        """
+        Stream rows into the sheet, cut into chunks by cells count and estimated
+        JSON size, growing the grid as needed. Only one chunk is held in memory.
+
+        :param rows: iterable of rows, e.g. a generator
+        :param range_start: top left cell, A1 notation
+        :param max_cells: max cells count of a chunk
+        :param max_bytes: max estimated JSON bytes of a chunk
+        :param value_input_option: value input option
+        :param progress: callable, called with (rows written, cells written) after each chunk
+        :return: dict of written "rows", "cells" and "requests" counts
+        """
+        start_row, start_col = self.get_int_addr(range_start)
+        stats = {"rows": 0, "cells": 0, "requests": 0}
+        chunk, chunk_cells, chunk_bytes = [], 0, 0
+
+        def flush():
+            width = max(max(len(row) for row in chunk), 1)
+            first_row = start_row + stats["rows"]
+            self._grow(first_row + len(chunk), start_col + width)
+
+            data = self.update_values_data(
+                self.get_addr_int(first_row, start_col),
+                self.get_addr_int(first_row + len(chunk) - 1, start_col + width - 1),
+                chunk
+            )
+            self.client.values_batch_update(self.spreadsheet.file_id, [data], value_input_option)
+            stats["rows"] += len(chunk)
+            stats["cells"] += chunk_cells
+            stats["requests"] += 1
+            if progress is not None:
+                progress(stats["rows"], stats["cells"])
+
+        for row in rows:
+            row = list(row)
+            cells = max(len(row), 1)
+            size = len(json.dumps(row)) + 1
+            if chunk and (chunk_cells + cells > max_cells or chunk_bytes + size > max_bytes):
+                flush()
+                chunk, chunk_cells, chunk_bytes = [], 0, 0
+            chunk.append(row)
+            chunk_cells += cells
+            chunk_bytes += size
+
+        if chunk:
+            flush()
+        return stats
+
+    def _changed_ranges(self, old, new, clear_removed=False):
+        """
+        Group cells differing between two grids into rectangles
+
+        :param old: current values, list of lists
+        :param new: desired values, list of lists
+        :param clear_removed: cells in `old` but not in `new` are to be cleared or not
+        :return: list of (start row, start col, end row, end col), 0-based and exclusive
+        """
+        def cell(row, col, values):
+            if row < len(values) and col < len(values[row]):
+                value = values[row][col]
+                return "" if value is None else value
+            return ""
+
+        height = max(len(new), len(old)) if clear_removed else len(new)
+        rects = []
+        # column runs of the previous row -> index of the rectangle they extend
+        open_rects = {}
+        for row in range(height):
+            new_width = len(new[row]) if row < len(new) else 0
+            old_width = len(old[row]) if row < len(old) else 0
+            width = max(new_width, old_width) if clear_removed else new_width
+
+            runs, start = [], None
+            for col in range(width + 1):
+                changed = col < width and cell(row, col, new) != cell(row, col, old)
+                if changed and start is None:
+                    start = col
+                elif not changed and start is not None:
+                    runs.append((start, col))
+                    start = None
+
+            next_open = {}
+            for run in runs:
+                if run in open_rects:
+                    i = open_rects[run]
+                    rects[i] = rects[i][:2] + (row + 1,) + rects[i][3:]
+                else:
+                    rects.append((row, run[0], row + 1, run[1]))
+                    i = len(rects) - 1
+                next_open[run] = i
+            open_rects = next_open
+        return rects
+
+    def sync(self, values, range_start="A1", clear_removed=False, refetch=False,
+             value_input_option=ValueInputOption.USER_ENTERED):
+        """
+        Write only the cells differing from the current values, in one values.batchUpdate.
+        Current values are the ones last written by sync(), or fetched if unknown.
+
+        :param values: desired values list, e.g. [["A1", "B1"], ["A2", "B2"]]
+        :param range_start: top left cell of `values`, A1 notation
+        :param clear_removed: clear cells which are not in `values` anymore or not
+        :param refetch: ignore the last written values and fetch current ones
+        :param value_input_option: value input option
+        :return: updated response, None if nothing changed
+        """
+        start_row, start_col = self.get_int_addr(range_start)
+        if self._snapshot is not None and self._snapshot[0] == (start_row, start_col) and not refetch:
+            old = self._snapshot[1]
+        else:
+            if clear_removed:
+                end = self.get_addr_int(self.row_count - 1, self.col_count - 1)
+            else:
+                end = self.get_addr_int(start_row + max(len(values), 1) - 1,
+                                        start_col + max([len(row) for row in values] or [1]) - 1)
+            old = self.get_values(range_start, end, value_render_option=ValueRenderOption.FORMULA).get("values", [])
+
+        rects = self._changed_ranges(old, values, clear_removed)
+        data = []
+        for top, left, bottom, right in rects:
+            block = []
+            for row in range(top, bottom):
+                line = values[row] if row < len(values) else []
+                block.append([line[col] if col < len(line) and line[col] is not None else ""
+                              for col in range(left, right)])
+            data.append(self.update_values_data(
+                self.get_addr_int(start_row + top, start_col + left),
+                self.get_addr_int(start_row + bottom - 1, start_col + right - 1),
+                block
+            ))
+
+        response = None
+        if data:
+            response = self.batch_update_values(data, value_input_option)
+
+        # the sheet now holds `values` over the old ones
+        current = [list(row) for row in old]
+        for row, line in enumerate(values):
+            if row >= len(current):
+                current.append([])
+            if clear_removed:
+                current[row] = list(line)
+            else:
+                current[row] = list(line) + current[row][len(line):]
+        if clear_removed:
+            del current[len(values):]
+        self._snapshot = ((start_row, start_col), current)
+        return response
+
+    def _range_width(self, range_start, range_end=None):
+        """
+        Columns count of a bounded range, None if unbounded
+        """
+        try:
+            grid_range = a1.A1Range.parse("{}:{}".format(range_start, range_end) if range_end else range_start)
+        except exceptions.IncorrectCellLabel:
+            return None
+        if grid_range.start_col is None or grid_range.end_col is None:
+            return None
+        return grid_range.end_col - grid_range.start_col
+
+    def get_array(self, range_start, range_end=None, infer=False,
+                  value_render_option=ValueRenderOption.UNFORMATTED_VALUE,
+                  date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        """
+        Get values as a padded NumPy array, requires numpy
+
+        :param range_start: cell range start
+        :param range_end: cell range end
+        :param infer: return a list of typed column arrays instead of one object array
+        :param value_render_option: value render option
+        :param date_time_render_option: date time render option
+        :return: numpy object array, or list of column arrays
+        """
+        response = self.get_values(range_start, range_end, Dimension.ROWS, value_render_option,
+                                   date_time_render_option)
+        return frames.values_to_array(response.get("values", []), self._range_width(range_start, range_end), infer)
+
+    def get_frame(self, range_start, range_end=None, header=True, date_columns=None,
+                  value_render_option=ValueRenderOption.UNFORMATTED_VALUE,
+                  date_time_render_option=DateTimeRenderOption.SERIAL_NUMBER):
+        """
+        Get values as a pandas DataFrame with per-column dtypes, requires pandas
+
+        :param range_start: cell range start
+        :param range_end: cell range end
+        :param header: first row holds column names or not
+        :param date_columns: names or indexes of date columns, converted to datetime64
+        :param value_render_option: value render option
+        :param date_time_render_option: date time render option
+        :return: pandas DataFrame
+        """
+        response = self.get_values(range_start, range_end, Dimension.ROWS, value_render_option,
+                                   date_time_render_option)
+        return frames.values_to_frame(response.get("values", []), header, date_columns)
+
+    def write_frame(self, frame, range_start="A1", header=True, index=False,
+                    value_input_option=ValueInputOption.USER_ENTERED, **kwargs):
+        """
+        Write a pandas DataFrame, in chunks, see write_rows()
+
+        :param frame: pandas DataFrame
+        :param range_start: top left cell, A1 notation
+        :param header: write column names as the first row or not
+        :param index: write the index as the first column or not
+        :param value_input_option: value input option
+        :param kwargs: other parameters of write_rows()
+        :return: dict of written "rows", "cells" and "requests" counts
+        """
+        rows = frames.frame_to_values(frame, header, index)
+        return self.write_rows(rows, range_start, value_input_option=value_input_option, **kwargs)
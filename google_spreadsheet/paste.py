@@ -0,0 +1,127 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Chunked reading of CSV/TSV files for pasteData: the file is memory-mapped and cut
+at record boundaries, found by quote parity, so fields are never parsed into Python lists.
+
+Example:
+>>> for data, rows, cols in iter_chunks("report.csv", chunk_bytes=1 << 20):
+>>>     requests.append(sheet.paste_data_request(data, row_index, 0))
+'''
+import codecs
+import csv
+import io
+import mmap
+import os
+
+# bytes of file data per pasteData request
+CHUNK_BYTES = 1 << 20
+
+_QUOTE = b'"'
+_NEWLINE = b"\n"
+
+
+def record_end(data):
+    """
+    Position of the last line break of `data` ending a record, i.e. outside quoted fields.
+    Quotes escaped by doubling them keep the parity, so counting quotes is enough.
+
+    :param data: bytes
+    :return: position of the line break, -1 if there is none
+    """
+    end = data.rfind(_NEWLINE)
+    if end < 0 or _QUOTE not in data:
+        return end
+    odd = data.count(_QUOTE, 0, end) % 2
+    while end >= 0 and odd:
+        previous = data.rfind(_NEWLINE, 0, end)
+        odd ^= data.count(_QUOTE, previous + 1, end) % 2
+        end = previous
+    return end
+
+
+def shape(data, delimiter=b",", encoding="utf-8"):
+    """
+    Records and fields count of CSV data, without keeping the fields
+
+    :param data: bytes, complete records separated by "\n"
+    :param delimiter: delimiter, bytes
+    :param encoding: encoding of data
+    :return: (rows count, max columns count)
+    """
+    if not data:
+        return 0, 0
+    if _QUOTE not in data:
+        lines = data.split(_NEWLINE)
+        return len(lines), max(line.count(delimiter) for line in lines) + 1
+
+    if str is bytes:
+        # python 2: csv reads byte strings only
+        lines = io.BytesIO(data)
+        delimiter = str(delimiter)
+    else:
+        lines = io.StringIO(data.decode(encoding), newline="")
+        delimiter = delimiter.decode(encoding)
+    rows = cols = 0
+    for row in csv.reader(lines, delimiter=delimiter):
+        rows += 1
+        cols = max(cols, len(row))
+    return rows, cols
+
+
+def _chunk_end(mapped, pos, chunk_bytes):
+    """
+    End of the chunk starting at `pos`: the last record boundary within `chunk_bytes`,
+    the window is doubled until it holds one if a single record is longer
+
+    :return: (end position, position of the next chunk)
+    """
+    size = len(mapped)
+    limit = pos + chunk_bytes
+    while limit < size:
+        end = record_end(mapped[pos:limit])
+        # a leading blank line is kept with the next record
+        if end > 0:
+            return pos + end, pos + end + 1
+        limit = pos + (limit - pos) * 2
+    return size, size
+
+
+def iter_chunks(path, delimiter=",", chunk_bytes=CHUNK_BYTES, encoding="utf-8"):
+    """
+    Read a CSV/TSV file as chunks of complete records.
+    Line breaks "\r\n" are turned to "\n", a UTF-8 byte order mark is skipped.
+
+    :param path: file path
+    :param delimiter: fields delimiter, e.g. "," or "\t"
+    :param chunk_bytes: bytes of file data per chunk, longer records make longer chunks
+    :param encoding: an ASCII compatible encoding of the file
+    :return: iterator of (data, rows count, max columns count), data as text
+    """
+    if not isinstance(delimiter, bytes):
+        delimiter = delimiter.encode(encoding)
+    with open(path, "rb") as csv_file:
+        if os.fstat(csv_file.fileno()).st_size == 0:
+            return
+        mapped = mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            pos = 0
+            bom = codecs.BOM_UTF8
+            if mapped[:len(bom)] == bom and codecs.lookup(encoding).name.startswith("utf-8"):
+                pos = len(bom)
+            while pos < len(mapped):
+                start = pos
+                end, pos = _chunk_end(mapped, start, chunk_bytes)
+                data = mapped[start:end]
+                if end == len(mapped) and data.endswith(_NEWLINE):
+                    data = data[:-1]
+                if b"\r" in data:
+                    data = data.replace(b"\r\n", _NEWLINE)
+                    if data.endswith(b"\r"):
+                        data = data[:-1]
+                rows, cols = shape(data, delimiter, encoding)
+                if rows:
+                    yield data.decode(encoding), rows, cols
+        finally:
+            mapped.close()
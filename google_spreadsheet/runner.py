@@ -0,0 +1,433 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Export of many spreadsheets with a process pool, so that decoding and converting responses
+use all cores: tasks of a manifest are sharded by spreadsheet, each worker process builds
+its own service and client, all workers draw from one quota budget, and every exported sheet
+is journaled as soon as it is written, so that a crashed run resumes where it stopped.
+
+Example:
+>>> manifest = [Task("1AbC...", "Orders", "out/orders.parquet"), Task("1DeF...", None, "out/budget")]
+>>> runner = ExportRunner(service_kwargs={"key_file_location": "key.json"},
+>>>                       journal="out/journal.jsonl", quota_per_minute=300)
+>>> runner.run(manifest)
+>>> {"tasks": 2, "skipped": 0, "done": 2, "failed": 0, "errors": {}, "elapsed": 3.2}
+'''
+import collections
+import csv
+import io
+import json
+import multiprocessing
+import os
+import time
+
+try:
+    from queue import Empty
+except ImportError:
+    # python 2
+    from Queue import Empty
+
+from google_spreadsheet import exceptions, throttle, writers
+from google_spreadsheet.a1 import A1Range
+from google_spreadsheet.constants import SpreadsheetFields
+
+# a sheet or a range of a spreadsheet, exported to `sink`:
+# a file for a sheet name or an A1 range, a directory of one file per sheet for a None range
+Task = collections.namedtuple("Task", ["file_id", "range_name", "sink"])
+
+DONE = "done"
+ERROR = "error"
+
+# settings of the current worker process, its client is built by the first shard
+_worker = {}
+
+try:
+    _string_types = basestring
+except NameError:
+    _string_types = str
+
+
+def _task(item):
+    if isinstance(item, Task):
+        return item
+    if isinstance(item, dict):
+        return Task(item["file_id"], item.get("range") or None, item["sink"])
+    file_id, range_name, sink = item
+    return Task(file_id, range_name or None, sink)
+
+
+def read_manifest(path):
+    """
+    Read a manifest file: CSV with "file_id", "range" and "sink" columns, an empty range exports every sheet
+
+    :param path: file path
+    :return: list of Task
+    """
+    if str is bytes:
+        # python 2: csv reads byte strings only
+        with open(path, "rb") as manifest_file:
+            rows = [dict((key, value.decode("utf8")) for key, value in row.items())
+                    for row in csv.DictReader(manifest_file)]
+    else:
+        with io.open(path, encoding="utf8", newline="") as manifest_file:
+            rows = list(csv.DictReader(manifest_file))
+    return [_task(row) for row in rows]
+
+
+def _makedirs(directory):
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+
+class Journal(object):
+    """
+    Append-only JSON lines of finished tasks, and of the sheets of tasks exporting every sheet.
+    The last line of a task or a sheet wins.
+
+    :param path: file path
+    """
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        # task key -> names of the exported sheets
+        self.sheets = {}
+        if os.path.exists(path):
+            with open(path) as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # line torn by a crash
+                        continue
+                    key = self.key(_task(entry))
+                    if entry.get("sheet") is not None:
+                        sheets = self.sheets.setdefault(key, set())
+                        if entry.get("status") == DONE:
+                            sheets.add(entry["sheet"])
+                        else:
+                            sheets.discard(entry["sheet"])
+                    elif entry.get("status") == DONE:
+                        self.done.add(key)
+                    else:
+                        self.done.discard(key)
+        else:
+            _makedirs(os.path.dirname(path))
+        self._file = open(path, "a")
+
+    @staticmethod
+    def key(task):
+        return json.dumps([task.file_id, task.range_name, task.sink])
+
+    def is_done(self, task):
+        return self.key(task) in self.done
+
+    def done_sheets(self, task):
+        """
+        :param task: Task exporting every sheet
+        :return: set of the names of its exported sheets
+        """
+        return self.sheets.get(self.key(task), set())
+
+    def record(self, task, status, info=None, sheet_name=None):
+        """
+        Append the outcome of a task, or of one sheet of a task exporting every sheet, synced to disk
+
+        :param task: Task
+        :param status: DONE or ERROR
+        :param info: dict of details, e.g. export stats or "error"
+        :param sheet_name: name of the exported sheet, None for the task itself
+        :return: None
+        """
+        entry = dict(info or {})
+        entry.update({"file_id": task.file_id, "range": task.range_name, "sink": task.sink,
+                      "status": status, "time": time.time()})
+        if sheet_name is not None:
+            entry["sheet"] = sheet_name
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if sheet_name is not None:
+            if status == DONE:
+                self.sheets.setdefault(self.key(task), set()).add(sheet_name)
+        elif status == DONE:
+            self.done.add(self.key(task))
+
+    def close(self):
+        self._file.close()
+
+
+def export_task(spreadsheet, task, sheet_progress=None, skip_sheets=(), **kwargs):
+    """
+    Export a task of an opened spreadsheet. Files are written under a temporary name
+    and renamed once complete (see writers), so that a crash never leaves a truncated sink.
+
+    :param spreadsheet: Spreadsheet object
+    :param task: Task
+    :param sheet_progress: callable, called with (sheet name, export stats) after each sheet of a task
+                           exporting every sheet
+    :param skip_sheets: names of sheets not to export again, for a task exporting every sheet
+    :param kwargs: arguments of Sheet.export, the format defaults to the one of the sink extension
+    :return: dict of export stats
+    """
+    if task.range_name is None:
+        _makedirs(task.sink)
+        format = kwargs.pop("format", writers.CSV)
+        include_hidden = kwargs.pop("include_hidden", False)
+        exported = 0
+        for sheet, path in spreadsheet.export_plan(task.sink, format, include_hidden):
+            if sheet.name in skip_sheets:
+                continue
+            started = time.time()
+            stats = sheet.export(path, format, **kwargs)
+            stats["seconds"] = time.time() - started
+            exported += 1
+            if sheet_progress is not None:
+                sheet_progress(sheet.name, stats)
+        return {"sheets": exported, "skipped_sheets": len(skip_sheets)}
+
+    kwargs.setdefault("format", writers.path_format(task.sink))
+    parsed = A1Range.parse(task.range_name)
+    if parsed.sheet_name is not None:
+        sheet = spreadsheet.find_sheet_by_name(parsed.sheet_name)
+    else:
+        sheet = spreadsheet.find_sheet_by_index(0)
+
+    _makedirs(os.path.dirname(task.sink))
+    return sheet.export(task.sink, start_row_index=parsed.start_row or 0, end_row_index=parsed.end_row,
+                        start_col_index=parsed.start_col or 0, end_col_index=parsed.end_col, **kwargs)
+
+
+def _init_worker(service_factory, service_kwargs, bucket, retry, results, pids):
+    # only keeps the settings: an initializer raising would make the pool respawn workers forever
+    _worker.update(service_factory=service_factory, service_kwargs=service_kwargs, bucket=bucket, retry=retry,
+                   results=results, pids=pids, client=None, shard=None)
+
+
+def _worker_client():
+    """
+    Client of the current worker process, built on first use
+
+    :return: Client object
+    """
+    if _worker["client"] is None:
+        from google_spreadsheet.models import Client
+
+        if _worker["service_factory"] is not None:
+            service = _worker["service_factory"]()
+        else:
+            from google_spreadsheet.utils import spreadsheet_service
+            service = spreadsheet_service(**_worker["service_kwargs"])
+        rate_limiter = throttle.RateLimiter(_worker["bucket"]) if _worker["bucket"] is not None else None
+        _worker["client"] = Client(service, retry=_worker["retry"], rate_limiter=rate_limiter)
+    return _worker["client"]
+
+
+def _report(task, status, info, sheet_name=None):
+    _worker["results"].put((_worker["shard"], (task, status, info, sheet_name)))
+
+
+def _run_shard(index, shard):
+    """
+    Export the tasks of one spreadsheet, in a worker process.
+    Outcomes of tasks and sheets are sent to the parent process as they finish, as (shard index, outcome),
+    followed by (shard index, None) once the shard is over.
+
+    :param index: index of the shard, the PID of the worker is recorded at this index of the shared pids array
+    :param shard: (file id, tasks, export arguments, dict of task key -> names of sheets already exported)
+    :return: None
+    """
+    _worker["pids"][index] = os.getpid()
+    _worker["shard"] = index
+    file_id, tasks, options, done_sheets = shard
+    try:
+        try:
+            client = _worker_client()
+        except Exception as error:
+            # e.g. a missing key file, reported as failed tasks instead of crashing the worker
+            for task in tasks:
+                _report(task, ERROR, {"error": "Client construction failed: {}".format(error)})
+            return
+        try:
+            spreadsheet = client.open(file_id, fields=SpreadsheetFields.SHEET_PROPERTIES)
+        except (exceptions.APIException, EnvironmentError) as error:
+            for task in tasks:
+                _report(task, ERROR, {"error": str(error)})
+            return
+
+        for task in tasks:
+            started = time.time()
+
+            def sheet_progress(sheet_name, stats, task=task):
+                _report(task, DONE, stats, sheet_name)
+
+            try:
+                info = export_task(spreadsheet, task, sheet_progress=sheet_progress,
+                                   skip_sheets=done_sheets.get(Journal.key(task), ()), **options)
+            except (exceptions.APIException, EnvironmentError, ValueError) as error:
+                _report(task, ERROR, {"error": str(error)})
+            else:
+                info["seconds"] = time.time() - started
+                _report(task, DONE, info)
+    finally:
+        _worker["results"].put((index, None))
+
+
+def _record(journal, summary, progress, task, status, info, sheet_name=None):
+    """
+    Journal the outcome of a task or of one of its sheets, and count the outcome of a task in the summary
+    """
+    if journal is not None:
+        journal.record(task, status, info, sheet_name)
+    if sheet_name is not None:
+        return
+    if status == DONE:
+        summary["done"] += 1
+    else:
+        summary["failed"] += 1
+        summary["errors"][task.sink] = info["error"]
+    if progress is not None:
+        progress(task, status, info)
+
+
+class ExportRunner(object):
+    """
+    Export the tasks of a manifest with a pool of worker processes, one shard per spreadsheet
+
+    :param service_kwargs: arguments of utils.spreadsheet_service, each worker builds its own service,
+                           e.g. {"key_file_location": "key.json"}
+    :param service_factory: picklable callable returning a service, used instead of `service_kwargs`
+    :param processes: worker processes count, default to the CPU count
+    :param quota_per_minute: requests per minute of all workers together, None for no limit
+    :param retry: throttle.RetryPolicy object of the workers, default to RetryPolicy()
+    :param journal: path of the journal, tasks it records as done are skipped; None for no resume
+    :param export_options: arguments of Sheet.export, e.g. {"chunk_rows": 2000}
+    """
+    def __init__(self, service_kwargs=None, service_factory=None, processes=None, quota_per_minute=None,
+                 retry=None, journal=None, export_options=None):
+        self.service_kwargs = service_kwargs or {}
+        self.service_factory = service_factory
+        self.processes = processes or multiprocessing.cpu_count()
+        self.quota_per_minute = quota_per_minute
+        self.retry = retry if retry is not None else throttle.RetryPolicy()
+        self.journal = journal
+        self.export_options = export_options or {}
+
+    def run(self, manifest, progress=None):
+        """
+        Run the pending tasks of a manifest
+
+        :param manifest: iterable of Task, (file id, range, sink) tuples or dicts, or a manifest file path
+        :param progress: callable, called with (task, status, info) as tasks finish
+        :return: dict of "tasks", "skipped", "done" and "failed" counts, "errors" by sink and "elapsed" seconds
+        """
+        started = time.time()
+        if isinstance(manifest, _string_types):
+            manifest = read_manifest(manifest)
+        tasks = [_task(item) for item in manifest]
+        journal = Journal(self.journal) if self.journal is not None else None
+
+        shards = collections.OrderedDict()
+        # file id -> task key -> names of sheets already exported, for tasks exporting every sheet
+        done_sheets = {}
+        for task in tasks:
+            if journal is None or not journal.is_done(task):
+                shards.setdefault(task.file_id, []).append(task)
+                if journal is not None and task.range_name is None:
+                    done_sheets.setdefault(task.file_id, {})[Journal.key(task)] = journal.done_sheets(task)
+        summary = {
+            "tasks": len(tasks),
+            "skipped": len(tasks) - sum(len(shard) for shard in shards.values()),
+            "done": 0,
+            "failed": 0,
+            "errors": {},
+        }
+
+        try:
+            if shards:
+                self._run(shards, done_sheets, journal, summary, progress)
+        finally:
+            if journal is not None:
+                journal.close()
+        summary["elapsed"] = time.time() - started
+        return summary
+
+    def _run(self, shards, done_sheets, journal, summary, progress):
+        bucket = None
+        if self.quota_per_minute is not None:
+            bucket = throttle.SharedTokenBucket.per_minute(self.quota_per_minute)
+        # outcomes of tasks and sheets, journaled by this process as workers send them
+        results = multiprocessing.Queue()
+        # PID of the worker running each shard, 0 until it starts
+        pids = multiprocessing.Array("i", len(shards), lock=False)
+        pool = multiprocessing.Pool(min(self.processes, len(shards)), _init_worker,
+                                    (self.service_factory, self.service_kwargs, bucket, self.retry, results, pids))
+        try:
+            work = [(file_id, tasks, self.export_options, done_sheets.get(file_id, {}))
+                    for file_id, tasks in shards.items()]
+            pending = [pool.apply_async(_run_shard, (index, shard)) for index, shard in enumerate(work)]
+            # tasks of each shard without an outcome yet
+            unfinished = [list(shard[1]) for shard in work]
+            running = set(range(len(work)))
+            lost = set()
+
+            def handle(message):
+                index, result = message
+                if result is None:
+                    running.discard(index)
+                    return
+                task, status, info, sheet_name = result
+                if sheet_name is None:
+                    unfinished[index].remove(task)
+                _record(journal, summary, progress, task, status, info, sheet_name)
+
+            while running:
+                try:
+                    message = results.get(timeout=0.5)
+                except Empty:
+                    pass
+                else:
+                    handle(message)
+                    continue
+                for index in running:
+                    if pending[index].ready() and not pending[index].successful():
+                        # a shard failed unexpectedly, raise its error
+                        pending[index].get()
+
+                # a worker killed by a signal or the OOM killer is replaced by the pool, its shard never ends
+                alive = set(process.pid for process in multiprocessing.active_children())
+                dead = [index for index in running if pids[index] and pids[index] not in alive]
+                if not dead:
+                    continue
+                # outcomes sent before the worker died
+                while True:
+                    try:
+                        handle(results.get_nowait())
+                    except Empty:
+                        break
+                for index in dead:
+                    if index not in running:
+                        continue
+                    running.discard(index)
+                    lost.add(index)
+                    for task in unfinished[index]:
+                        error = "Worker process {} died".format(pids[index])
+                        _record(journal, summary, progress, task, ERROR, {"error": error})
+
+            for index, result in enumerate(pending):
+                if index not in lost:
+                    result.get()
+            if lost:
+                # tasks of dead workers stay pending in the pool, closing would wait for them forever
+                pool.terminate()
+            else:
+                pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
@@ -0,0 +1,789 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+In-process fake of the Sheets v4 service, for tests and benchmarks without network.
+Implements spreadsheets.get, spreadsheets.batchUpdate and spreadsheets.values
+get/batchGet/update/batchUpdate, with configurable latency and error injection,
+and counts round trips and bytes.
+
+FakeTokenEndpoint is a local stand-in of the OAuth 2.0 token endpoint, for credentials tests.
+
+Example:
+>>> service = FakeSheetsService(latency=0.05)
+>>> file_id = service.add_spreadsheet("Report", [("Sheet1", 1000, 26)])
+>>> client = Client(service)
+>>> spreadsheet = client.open(file_id)
+>>> service.stats["requests"]
+'''
+import copy
+import csv
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.a1 import A1Range
+
+try:
+    _string_types = basestring
+except NameError:
+    _string_types = str
+
+_number_re = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+_mask_name_re = re.compile(r"\s*([\w*]+(?:\.[\w*]+)*)\s*")
+
+_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    403: "PERMISSION_DENIED",
+    404: "NOT_FOUND",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+
+
+def _paste_rows(data, delimiter):
+    """
+    Rows of pasteData `data`, quoted fields may contain delimiters and line breaks
+    """
+    if str is bytes:
+        # python 2: csv reads byte strings only
+        lines = data.encode("utf8").splitlines(True)
+        return [[cell.decode("utf8") for cell in row] for row in csv.reader(lines, delimiter=str(delimiter))]
+    return list(csv.reader(data.splitlines(True), delimiter=delimiter))
+
+
+def _parse_mask(fields, pos=0):
+    """
+    Parse a FieldMask, e.g. "spreadsheetId,sheets.properties(sheetId,title)"
+
+    :return: (tree, end position), tree maps names to subtrees, None for a whole field
+    """
+    tree = {}
+    while pos < len(fields):
+        match = _mask_name_re.match(fields, pos)
+        if not match:
+            raise ValueError("Invalid field mask: {}".format(fields))
+        names = match.group(1).split(".")
+        pos = match.end()
+
+        node = tree
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                node = None
+                break
+            node = node.setdefault(name, {})
+        subtree = None
+        if pos < len(fields) and fields[pos] == "(":
+            subtree, pos = _parse_mask(fields, pos + 1)
+        if node is not None:
+            if names[-1] == "*" or subtree is None or node.get(names[-1], {}) is None:
+                node[names[-1]] = None
+            else:
+                node.setdefault(names[-1], {}).update(subtree)
+
+        if pos < len(fields) and fields[pos] == ",":
+            pos += 1
+        elif pos < len(fields) and fields[pos] == ")":
+            return tree, pos + 1
+    return tree, pos
+
+
+def _apply_mask(value, tree):
+    if tree is None or "*" in tree:
+        return value
+    if isinstance(value, list):
+        return [_apply_mask(item, tree) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _apply_mask(value[key], subtree)) for key, subtree in tree.items() if key in value)
+    return value
+
+
+def _http_error(status, message, retry_after=None):
+    info = {"status": status}
+    if retry_after is not None:
+        info["retry-after"] = str(retry_after)
+    content = json.dumps({
+        "error": {"code": status, "message": message, "status": _STATUSES.get(status, "UNKNOWN")}
+    }).encode("utf8")
+    return HttpError(httplib2.Response(info), content)
+
+
+def _decode(response, content):
+    return json.loads(content)
+
+
+class FakeRequest(object):
+    """
+    Stand-in of googleapiclient.http.HttpRequest, runs the call on `execute`
+    """
+    def __init__(self, service, method, payload, handler):
+        self.service = service
+        self.method = method
+        self.uri = ""
+        self.body = json.dumps(payload)
+        self.handler = handler
+        # decodes the response body, as the JSON model of googleapiclient
+        self.postproc = _decode
+
+    def execute(self, http=None, num_retries=0):
+        return self.postproc(None, self.service._call(self.method, len(self.body), self.handler))
+
+
+class _SpreadsheetsResource(object):
+    def __init__(self, service):
+        self._service = service
+
+    def get(self, spreadsheetId, fields=None, ranges=None, includeGridData=False):
+        payload = {"spreadsheetId": spreadsheetId, "fields": fields, "ranges": ranges,
+                   "includeGridData": includeGridData}
+        return FakeRequest(self._service, "spreadsheets.get", payload,
+                           lambda: self._service._get(spreadsheetId, fields, ranges, includeGridData))
+
+    def batchUpdate(self, spreadsheetId, body):
+        return FakeRequest(self._service, "spreadsheets.batchUpdate", body,
+                           lambda: self._service._batch_update(spreadsheetId, body))
+
+    def values(self):
+        return _ValuesResource(self._service)
+
+
+class _ValuesResource(object):
+    def __init__(self, service):
+        self._service = service
+
+    def get(self, spreadsheetId, range, majorDimension="ROWS", valueRenderOption="FORMATTED_VALUE",
+            dateTimeRenderOption="SERIAL_NUMBER", fields=None):
+        payload = {"spreadsheetId": spreadsheetId, "range": range, "fields": fields}
+
+        def handler():
+            response = self._service._values_get(spreadsheetId, range, majorDimension, valueRenderOption)
+            return _apply_mask(response, _parse_mask(fields)[0]) if fields else response
+        return FakeRequest(self._service, "values.get", payload, handler)
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension="ROWS", valueRenderOption="FORMATTED_VALUE",
+                 dateTimeRenderOption="SERIAL_NUMBER", fields=None):
+        payload = {"spreadsheetId": spreadsheetId, "ranges": ranges, "fields": fields}
+
+        def handler():
+            response = {
+                "spreadsheetId": spreadsheetId,
+                "valueRanges": [self._service._values_get(spreadsheetId, range_name, majorDimension,
+                                                          valueRenderOption)
+                                for range_name in ranges]
+            }
+            return _apply_mask(response, _parse_mask(fields)[0]) if fields else response
+        return FakeRequest(self._service, "values.batchGet", payload, handler)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        def handler():
+            response = self._service._values_update(spreadsheetId, range, body, valueInputOption)
+            response["spreadsheetId"] = spreadsheetId
+            return response
+        return FakeRequest(self._service, "values.update", body, handler)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def handler():
+            responses = [self._service._values_update(spreadsheetId, data["range"], data,
+                                                      body["valueInputOption"])
+                         for data in body.get("data", [])]
+            return {
+                "spreadsheetId": spreadsheetId,
+                "totalUpdatedCells": sum(response["updatedCells"] for response in responses),
+                "responses": responses
+            }
+        return FakeRequest(self._service, "values.batchUpdate", body, handler)
+
+
+class FakeSheetsService(object):
+    """
+    Fake Sheets v4 service, a drop-in for utils.spreadsheet_service(...)
+
+    :param latency: seconds slept by every call, or a (min, max) tuple for a random latency
+    :param error_rate: probability of a call failing with `error_status`
+    :param error_status: HTTP status of random errors
+    :param quota_per_minute: calls allowed per rolling minute, over it calls fail with 429
+    :param seed: seed of the random latency/errors, for reproducible runs
+    """
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=429, quota_per_minute=None, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_per_minute = quota_per_minute
+        self.stats = {}
+        self.reset_stats()
+        self._files = {}
+        self._failures = deque()
+        self._calls = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+
+    def reset_stats(self):
+        """
+        Reset round trips and bytes counters
+        """
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "methods": {},
+        }
+
+    def fail_next(self, status=429, count=1, retry_after=None):
+        """
+        Make the next `count` calls fail
+
+        :param status: HTTP status
+        :param count: calls count
+        :param retry_after: `Retry-After` header of the errors, in seconds
+        """
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def add_spreadsheet(self, title="Untitled spreadsheet", sheets=(("Sheet1", 1000, 26),), file_id=None):
+        """
+        Create a spreadsheet
+
+        :param title: spreadsheet title
+        :param sheets: list of (sheet name, row count, column count)
+        :param file_id: spreadsheet id, generated if None
+        :return: spreadsheet id
+        """
+        with self._lock:
+            if file_id is None:
+                file_id = "fake-{}".format(len(self._files) + 1)
+            self._files[file_id] = {
+                "spreadsheetId": file_id,
+                "properties": {"title": title, "locale": "en_US", "timeZone": "Etc/GMT"},
+                "sheets": [],
+                "next_sheet_id": 0,
+            }
+            for name, row_count, col_count in sheets:
+                self._add_sheet(self._files[file_id], {
+                    "title": name,
+                    "gridProperties": {"rowCount": row_count, "columnCount": col_count}
+                })
+        return file_id
+
+    def spreadsheets(self):
+        return _SpreadsheetsResource(self)
+
+    # transport
+
+    def _call(self, method, request_bytes, handler):
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["request_bytes"] += request_bytes
+            self.stats["methods"][method] = self.stats["methods"].get(method, 0) + 1
+            try:
+                self._check_failures()
+                # a JSON round trip, so callers never share state with the fake
+                encoded = json.dumps(handler())
+            except HttpError:
+                self.stats["errors"] += 1
+                raise
+            self.stats["response_bytes"] += len(encoded)
+        return encoded
+
+    def _check_failures(self):
+        if self._failures:
+            status, retry_after = self._failures.popleft()
+            raise _http_error(status, "Injected error", retry_after)
+
+        if self.quota_per_minute is not None:
+            now = time.time()
+            while self._calls and self._calls[0] <= now - 60:
+                self._calls.popleft()
+            if len(self._calls) >= self.quota_per_minute:
+                raise _http_error(429, "Quota exceeded for quota metric 'Read requests'",
+                                  int(self._calls[0] + 61 - now))
+            self._calls.append(now)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise _http_error(self.error_status, "Injected error")
+
+    # storage
+
+    def _file(self, file_id):
+        if file_id not in self._files:
+            raise _http_error(404, "Requested entity was not found.")
+        return self._files[file_id]
+
+    def _sheet(self, spreadsheet, sheet_id=None, title=None):
+        for sheet in spreadsheet["sheets"]:
+            properties = sheet["properties"]
+            if properties["sheetId"] == sheet_id or (title is not None and properties["title"] == title):
+                return sheet
+        raise _http_error(400, "No grid with id: {}".format(sheet_id if title is None else title))
+
+    def _add_sheet(self, spreadsheet, properties):
+        titles = [sheet["properties"]["title"] for sheet in spreadsheet["sheets"]]
+        title = properties.get("title") or "Sheet{}".format(len(titles) + 1)
+        if title in titles:
+            raise _http_error(400, "A sheet with the name \"{}\" already exists.".format(title))
+
+        sheet_id = properties.get("sheetId")
+        if sheet_id is None:
+            sheet_id = spreadsheet["next_sheet_id"]
+            spreadsheet["next_sheet_id"] += 1
+        grid = properties.get("gridProperties", {})
+        index = properties.get("index", len(titles))
+        properties = copy.deepcopy(properties)
+        properties.update({
+            "sheetId": sheet_id,
+            "title": title,
+            "index": index,
+            "sheetType": "GRID",
+            "gridProperties": {
+                "rowCount": grid.get("rowCount", 1000),
+                "columnCount": grid.get("columnCount", 26),
+            }
+        })
+        sheet = {"properties": properties, "rows": [], "formats": []}
+        spreadsheet["sheets"].insert(index, sheet)
+        self._renumber(spreadsheet)
+        return sheet
+
+    @staticmethod
+    def _rows(sheet):
+        """
+        Cells of a sheet, to be modified
+        """
+        if sheet.pop("shared", False):
+            sheet["rows"] = [list(row) for row in sheet["rows"]]
+        return sheet["rows"]
+
+    @staticmethod
+    def _renumber(spreadsheet):
+        for index, sheet in enumerate(spreadsheet["sheets"]):
+            sheet["properties"]["index"] = index
+
+    def _resolve(self, spreadsheet, range_name):
+        """
+        :return: (sheet, A1Range bounded to the grid)
+        """
+        try:
+            parsed = A1Range.parse(range_name)
+        except exceptions.IncorrectCellLabel:
+            raise _http_error(400, "Unable to parse range: {}".format(range_name))
+        if parsed.sheet_name is None:
+            sheet = spreadsheet["sheets"][0]
+        else:
+            try:
+                sheet = self._sheet(spreadsheet, title=parsed.sheet_name)
+            except HttpError:
+                raise _http_error(400, "Unable to parse range: {}".format(range_name))
+        return sheet, self._bounds(sheet, parsed)
+
+    @staticmethod
+    def _bounds(sheet, parsed):
+        grid = sheet["properties"]["gridProperties"]
+        return A1Range(sheet["properties"]["title"], parsed.start_row or 0, parsed.start_col or 0,
+                       parsed.end_row if parsed.end_row is not None else grid["rowCount"],
+                       parsed.end_col if parsed.end_col is not None else grid["columnCount"])
+
+    # spreadsheets
+
+    def _get(self, file_id, fields, ranges, include_grid_data):
+        spreadsheet = self._file(file_id)
+        sheets = spreadsheet["sheets"]
+        grid_ranges = {}
+        if ranges:
+            sheets = []
+            for range_name in ranges:
+                sheet, bounds = self._resolve(spreadsheet, range_name)
+                if sheet not in sheets:
+                    sheets.append(sheet)
+                grid_ranges.setdefault(sheet["properties"]["sheetId"], []).append(bounds)
+
+        response = {
+            "spreadsheetId": file_id,
+            "properties": copy.deepcopy(spreadsheet["properties"]),
+            "sheets": [],
+            "spreadsheetUrl": "https://docs.google.com/spreadsheets/d/{}/edit".format(file_id),
+        }
+        for sheet in sheets:
+            details = {"properties": copy.deepcopy(sheet["properties"])}
+            if include_grid_data:
+                whole = [self._bounds(sheet, A1Range())]
+                details["data"] = [self._grid_data(sheet, bounds)
+                                   for bounds in grid_ranges.get(sheet["properties"]["sheetId"], whole)]
+            response["sheets"].append(details)
+
+        if fields:
+            response = _apply_mask(response, _parse_mask(fields)[0])
+        return response
+
+    def _grid_data(self, sheet, bounds):
+        rows = self._read(sheet, bounds, "UNFORMATTED_VALUE")
+        row_data = []
+        for row in rows:
+            cells = []
+            for value in row:
+                if value == "":
+                    cells.append({})
+                    continue
+                key = "boolValue" if isinstance(value, bool) else \
+                    "numberValue" if isinstance(value, (int, float)) else "stringValue"
+                cells.append({
+                    "userEnteredValue": {key: value},
+                    "effectiveValue": {key: value},
+                    "formattedValue": self._format(value),
+                })
+            row_data.append({"values": cells})
+        return {"startRow": bounds.start_row, "startColumn": bounds.start_col, "rowData": row_data}
+
+    def _batch_update(self, file_id, body):
+        spreadsheet = self._file(file_id)
+        # all or nothing, as the API: requests are applied to a copy, cells are copied on write
+        working = dict(spreadsheet, properties=copy.deepcopy(spreadsheet["properties"]))
+        working["sheets"] = [dict(sheet, properties=copy.deepcopy(sheet["properties"]),
+                                  formats=list(sheet["formats"]), shared=True)
+                             for sheet in spreadsheet["sheets"]]
+        replies = [self._apply(working, request) for request in body.get("requests", [])]
+        for sheet in working["sheets"]:
+            sheet.pop("shared", None)
+        self._files[file_id] = working
+        return {"spreadsheetId": file_id, "replies": replies}
+
+    def _apply(self, spreadsheet, request):
+        if len(request) != 1:
+            raise _http_error(400, "Invalid requests: exactly one kind of request expected")
+        kind, body = list(request.items())[0]
+
+        if kind in ("addSheet", "duplicateSheet"):
+            if kind == "addSheet":
+                properties = body.get("properties", {})
+            else:
+                source = self._sheet(spreadsheet, body["sourceSheetId"])
+                properties = copy.deepcopy(source["properties"])
+                properties.pop("sheetId")
+                properties["title"] = body.get("newSheetName") or "Copy of {}".format(properties["title"])
+                properties["index"] = body.get("insertSheetIndex", len(spreadsheet["sheets"]))
+                if body.get("newSheetId") is not None:
+                    properties["sheetId"] = body["newSheetId"]
+            sheet = self._add_sheet(spreadsheet, properties)
+            if kind == "duplicateSheet":
+                sheet["rows"] = [list(row) for row in source["rows"]]
+                sheet["formats"] = copy.deepcopy(source["formats"])
+            return {kind: {"properties": copy.deepcopy(sheet["properties"])}}
+
+        if kind == "deleteSheet":
+            sheet = self._sheet(spreadsheet, body["sheetId"])
+            if len(spreadsheet["sheets"]) == 1:
+                raise _http_error(400, "You can't remove all the sheets in a document.")
+            spreadsheet["sheets"].remove(sheet)
+            self._renumber(spreadsheet)
+        elif kind == "updateSheetProperties":
+            properties = body["properties"]
+            sheet = self._sheet(spreadsheet, properties.get("sheetId", 0))
+            old_index = spreadsheet["sheets"].index(sheet)
+            self._update_fields(sheet["properties"], properties, body["fields"])
+            if "index" in properties:
+                # indexes of a move are "before the move" indexes
+                new_index = properties["index"]
+                if new_index > old_index:
+                    new_index -= 1
+                spreadsheet["sheets"].remove(sheet)
+                spreadsheet["sheets"].insert(new_index, sheet)
+                self._renumber(spreadsheet)
+        elif kind == "updateSpreadsheetProperties":
+            self._update_fields(spreadsheet["properties"], body["properties"], body["fields"])
+        elif kind in ("appendDimension", "insertDimension", "deleteDimension"):
+            self._apply_dimension(spreadsheet, kind, body)
+        elif kind in ("repeatCell", "updateCells"):
+            if "start" in body:
+                start = body["start"]
+                sheet_id, row_index, col_index = start.get("sheetId", 0), start.get("rowIndex", 0), \
+                    start.get("columnIndex", 0)
+            else:
+                grid_range = body["range"]
+                sheet_id, row_index, col_index = grid_range.get("sheetId", 0), \
+                    grid_range.get("startRowIndex", 0), grid_range.get("startColumnIndex", 0)
+            sheet = self._sheet(spreadsheet, sheet_id)
+            for offset, row in enumerate(body.get("rows", [])):
+                self._write_cells(sheet, row_index + offset, col_index,
+                                  [self._cell_value(cell) for cell in row.get("values", [])], body["fields"])
+            # formats are kept as received, cells are not rendered
+            sheet["formats"].append(request)
+        elif kind == "pasteData":
+            sheet = self._sheet(spreadsheet, body["coordinate"].get("sheetId", 0))
+            coordinate = body["coordinate"]
+            delimiter = body.get("delimiter", ",")
+            for offset, row in enumerate(_paste_rows(body["data"], delimiter)):
+                self._write_cells(sheet, coordinate.get("rowIndex", 0) + offset, coordinate.get("columnIndex", 0),
+                                  [self._user_entered(value) for value in row], "*")
+        else:
+            raise _http_error(400, "Unsupported request by the fake service: {}".format(kind))
+        return {}
+
+    @staticmethod
+    def _update_fields(target, source, fields):
+        for path in filter(None, [f.strip() for f in fields.split(",")]):
+            if path == "*":
+                target.update(copy.deepcopy(source))
+                continue
+            keys = path.split(".")
+            src, dst = source, target
+            for key in keys[:-1]:
+                src = src.get(key, {})
+                dst = dst.setdefault(key, {})
+            if keys[-1] in src:
+                dst[keys[-1]] = copy.deepcopy(src[keys[-1]])
+            else:
+                dst.pop(keys[-1], None)
+
+    def _apply_dimension(self, spreadsheet, kind, body):
+        if kind == "appendDimension":
+            sheet = self._sheet(spreadsheet, body["sheetId"])
+            dimension, start, end = body["dimension"], None, None
+        else:
+            grid_range = body["range"]
+            sheet = self._sheet(spreadsheet, grid_range["sheetId"])
+            dimension, start, end = grid_range["dimension"], grid_range["startIndex"], grid_range["endIndex"]
+
+        grid = sheet["properties"]["gridProperties"]
+        key = "rowCount" if dimension == "ROWS" else "columnCount"
+        if kind == "appendDimension":
+            grid[key] += body["length"]
+            return
+        if kind == "insertDimension":
+            grid[key] += end - start
+        else:
+            if end > grid[key] or end - start >= grid[key]:
+                raise _http_error(400, "Invalid deleteDimension range")
+            grid[key] -= end - start
+
+        rows = self._rows(sheet)
+        if dimension == "ROWS":
+            if kind == "insertDimension":
+                rows[start:start] = [[] for _ in range(min(end, len(rows)) - min(start, len(rows)))]
+            else:
+                del rows[start:end]
+        else:
+            for row in rows:
+                if kind == "insertDimension":
+                    if start < len(row):
+                        row[start:start] = [""] * (end - start)
+                else:
+                    del row[start:end]
+
+    # values
+
+    @staticmethod
+    def _user_entered(value):
+        if not isinstance(value, _string_types) or not _number_re.match(value.strip()):
+            return value
+        number = float(value)
+        return int(number) if number.is_integer() and "." not in value and "e" not in value.lower() else number
+
+    @staticmethod
+    def _cell_value(cell):
+        value = cell.get("userEnteredValue", {})
+        for key in ("numberValue", "stringValue", "boolValue", "formulaValue"):
+            if key in value:
+                return value[key]
+        return ""
+
+    @staticmethod
+    def _format(value):
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return value if isinstance(value, _string_types) else str(value)
+
+    def _write_cells(self, sheet, row_index, col_index, values, fields="*"):
+        if fields != "*" and "userEnteredValue" not in fields:
+            return
+        grid = sheet["properties"]["gridProperties"]
+        if row_index >= grid["rowCount"] or col_index + len(values) > grid["columnCount"]:
+            raise _http_error(400, "Range exceeds grid limits. Max rows: {}, max columns: {}".format(
+                grid["rowCount"], grid["columnCount"]))
+
+        rows = self._rows(sheet)
+        while len(rows) <= row_index:
+            rows.append([])
+        row = rows[row_index]
+        if len(row) < col_index + len(values):
+            row.extend([""] * (col_index + len(values) - len(row)))
+        for offset, value in enumerate(values):
+            if value is not None:
+                row[col_index + offset] = value
+        while row and row[-1] == "":
+            row.pop()
+
+    def _read(self, sheet, bounds, value_render_option):
+        grid = sheet["properties"]["gridProperties"]
+        if bounds.end_row > grid["rowCount"] or bounds.end_col > grid["columnCount"]:
+            raise _http_error(400, "Range ({}) exceeds grid limits. Max rows: {}, max columns: {}".format(
+                bounds.to_a1(), grid["rowCount"], grid["columnCount"]))
+
+        rows = []
+        for row in sheet["rows"][bounds.start_row:bounds.end_row]:
+            row = row[bounds.start_col:bounds.end_col]
+            if value_render_option == "FORMATTED_VALUE":
+                row = [self._format(value) for value in row]
+            while row and row[-1] == "":
+                row.pop()
+            rows.append(row)
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def _values_get(self, file_id, range_name, major_dimension, value_render_option):
+        sheet, bounds = self._resolve(self._file(file_id), range_name)
+        rows = self._read(sheet, bounds, value_render_option)
+        response = {"range": bounds.to_a1(), "majorDimension": major_dimension}
+        if major_dimension == "COLUMNS":
+            width = max([len(row) for row in rows] or [0])
+            rows = [[row[col] if col < len(row) else "" for row in rows] for col in range(width)]
+            for column in rows:
+                while column and column[-1] == "":
+                    column.pop()
+        if rows:
+            response["values"] = rows
+        return response
+
+    def _values_update(self, file_id, range_name, body, value_input_option):
+        spreadsheet = self._file(file_id)
+        sheet, bounds = self._resolve(spreadsheet, range_name)
+        values = body.get("values", [])
+        if body.get("majorDimension", "ROWS") == "COLUMNS":
+            height = max([len(column) for column in values] or [0])
+            values = [[column[row] if row < len(column) else None for column in values] for row in range(height)]
+
+        rows_count, cols_count = bounds.shape
+        if len(values) > rows_count or any(len(row) > cols_count for row in values):
+            raise _http_error(400, "Requested writing within range [{}], but tried writing to more cells".format(
+                bounds.to_a1()))
+
+        # writes grow the grid, as the API
+        grid = sheet["properties"]["gridProperties"]
+        width = max([len(row) for row in values] or [0])
+        grid["rowCount"] = max(grid["rowCount"], bounds.start_row + len(values))
+        grid["columnCount"] = max(grid["columnCount"], bounds.start_col + width)
+
+        cells = 0
+        for offset, row in enumerate(values):
+            if value_input_option == "USER_ENTERED":
+                row = [self._user_entered(value) for value in row]
+            self._write_cells(sheet, bounds.start_row + offset, bounds.start_col, row)
+            cells += len(row)
+
+        updated = A1Range(sheet["properties"]["title"], bounds.start_row, bounds.start_col,
+                          bounds.start_row + max(len(values), 1), bounds.start_col + max(width, 1))
+        return {
+            "updatedRange": updated.to_a1(),
+            "updatedRows": len(values),
+            "updatedColumns": width,
+            "updatedCells": cells,
+        }
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeTokenEndpoint(object):
+    """
+    Local OAuth 2.0 token endpoint minting "token-<n>" access tokens, on a background thread
+
+    Example:
+    >>> with FakeTokenEndpoint(expires_in=3600) as endpoint:
+    >>>     credentials = ServiceAccountCredentials.from_json_keyfile_dict(
+    >>>         fake_service_account_info(), scopes, token_uri=endpoint.uri)
+
+    :param expires_in: lifetime of minted tokens, in seconds
+    :param latency: seconds slept per token request
+    """
+    def __init__(self, expires_in=3600, latency=0.0):
+        self.expires_in = expires_in
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def uri(self):
+        return "http://127.0.0.1:{}/token".format(self._server.server_address[1])
+
+    def start(self):
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if endpoint.latency:
+                    time.sleep(endpoint.latency)
+                with endpoint._lock:
+                    endpoint.requests += 1
+                    token = "token-{}".format(endpoint.requests)
+                content = json.dumps({"access_token": token, "token_type": "Bearer",
+                                      "expires_in": endpoint.expires_in}).encode("utf8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def fake_service_account_info(email="fake@example.iam.gserviceaccount.com"):
+    """
+    Service account key info with a freshly generated private key, requires the rsa package
+
+    :param email: service account email
+    :return: dict, as a json key file of a service account
+    """
+    import rsa
+
+    _, private_key = rsa.newkeys(1024)
+    return {
+        "type": "service_account",
+        "client_email": email,
+        "client_id": "1",
+        "private_key_id": "fake",
+        "private_key": private_key.save_pkcs1().decode("utf8"),
+    }
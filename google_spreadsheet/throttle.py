@@ -0,0 +1,196 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Retry policy and client-side rate limiting, to stay under Sheets API quotas
+Doc: https://developers.google.com/sheets/api/limits
+'''
+import email.utils
+import multiprocessing
+import random
+import threading
+import time
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with jitter, honoring `Retry-After`.
+    A 5xx response may come after the request was applied: those are only retried for
+    `idempotent_methods`, so that e.g. an appendDimension or an addSheet is not applied twice.
+
+    :param max_retries: max retries of a request
+    :param base_delay: delay of the first retry, in seconds
+    :param max_delay: max delay, in seconds, also caps the `Retry-After` asked by the server
+    :param jitter: randomize delays (full jitter) or not
+    :param statuses: HTTP statuses to retry
+    :param idempotent_methods: API methods whose requests can be repeated safely
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # rejected before being applied, retried whatever the method
+    REJECTED_STATUSES = (429,)
+    # reads, and writes of values to fixed ranges
+    IDEMPOTENT_METHODS = ("spreadsheets.get", "values.get", "values.batchGet", "values.update", "values.batchUpdate",
+                          "values.clear", "values.batchClear")
+
+    def __init__(self, max_retries=5, base_delay=1.0, max_delay=64.0, jitter=True, statuses=RETRY_STATUSES,
+                 idempotent_methods=IDEMPOTENT_METHODS):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def should_retry(self, status, attempt, method=None):
+        """
+        :param status: HTTP status of the failed request
+        :param attempt: 0-based retries count so far
+        :param method: API method of the request, e.g. "values.append", None if unknown (treated as idempotent)
+        :return: retry or not
+        """
+        if status not in self.statuses or attempt >= self.max_retries:
+            return False
+        return status in self.REJECTED_STATUSES or method is None or method in self.idempotent_methods
+
+    def delay(self, attempt, retry_after=None):
+        """
+        :param attempt: 0-based retries count so far
+        :param retry_after: seconds asked by the server, if any
+        :return: seconds to wait before retrying
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0), self.max_delay)
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+
+def retry_after(response):
+    """
+    Parse the `Retry-After` header of a response
+
+    :param response: httplib2.Response object (a dict of lower-cased headers)
+    :return: seconds, None if absent or invalid
+    """
+    value = response.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+        return email.utils.mktime_tz(parsed) - time.time()
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket, share one instance among clients to share a quota
+
+    :param rate: tokens added per second
+    :param capacity: max tokens, i.e. burst size, default to one second of `rate`
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests, capacity=None):
+        """
+        Bucket for a per-minute quota, e.g. TokenBucket.per_minute(60)
+        """
+        return cls(requests / 60.0, capacity)
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens, possibly going in debt
+
+        :param tokens: tokens count
+        :return: seconds to wait before the tokens are really available
+        """
+        with self._lock:
+            self._refill(time.time())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens, blocking until they are available
+
+        :param tokens: tokens count
+        :return: seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by processes, its state is kept in shared memory.
+    Hand it to worker processes when they are created (Pool initargs, Process args),
+    it can not be sent through queues or pool tasks.
+
+    :param rate: tokens added per second
+    :param capacity: max tokens, i.e. burst size, default to one second of `rate`
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        # tokens, last refill time
+        self._state = multiprocessing.RawArray("d", [self.capacity, time.time()])
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def _tokens(self):
+        return self._state[0]
+
+    @_tokens.setter
+    def _tokens(self, value):
+        self._state[0] = value
+
+    @property
+    def _updated(self):
+        return self._state[1]
+
+    @_updated.setter
+    def _updated(self, value):
+        self._state[1] = value
+
+
+class RateLimiter(object):
+    """
+    Client-side rate limiter over a per-project and a per-user quota
+
+    Example:
+    >>> project = TokenBucket.per_minute(300)  # shared by all clients of the project
+    >>> client = Client(service, rate_limiter=RateLimiter(project, TokenBucket.per_minute(60)))
+
+    :param per_project: TokenBucket object of the project quota
+    :param per_user: TokenBucket object of the user quota
+    """
+    def __init__(self, per_project=None, per_user=None):
+        self.buckets = [bucket for bucket in (per_project, per_user) if bucket is not None]
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from all buckets, blocking until they are available
+
+        :return: seconds waited
+        """
+        wait = max([bucket.reserve(tokens) for bucket in self.buckets] or [0.0])
+        if wait > 0:
+            time.sleep(wait)
+        return wait
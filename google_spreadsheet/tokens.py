@@ -0,0 +1,218 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Cross-process cache of OAuth 2.0 access tokens: processes of a host share the access token
+of a service account through a locked file instead of each minting its own,
+and refresh it shortly before it expires.
+Only the access token and its expiry are stored, never the private key.
+
+Example:
+>>> credentials = share_token(get_credentials(key_file_location="key.json"))
+>>> http = authorize(credentials)
+'''
+import copy
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import httplib2
+from oauth2client.client import EXPIRY_FORMAT, Storage
+
+try:
+    import fcntl
+except ImportError:
+    # not POSIX, tokens are only shared by threads
+    fcntl = None
+
+try:
+    from oauth2client.contrib.gce import AppAssertionCredentials
+except ImportError:
+    AppAssertionCredentials = None
+
+# seconds before expiry a token is refreshed
+REFRESH_MARGIN = 300
+
+
+def _utcnow():
+    return datetime.datetime.utcnow()
+
+
+def _makedirs(directory):
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory, 0o700)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+
+def token_path(credentials, directory):
+    """
+    Token file of credentials, one per account, scopes and token endpoint
+
+    :param credentials: oauth2client credentials
+    :param directory: directory of token files
+    :return: file path
+    """
+    key = json.dumps([
+        credentials.__class__.__name__,
+        getattr(credentials, "_service_account_email", None) or getattr(credentials, "client_id", None),
+        getattr(credentials, "_scopes", None) or sorted(getattr(credentials, "scopes", None) or []),
+        getattr(credentials, "token_uri", None),
+    ])
+    return os.path.join(directory, "token-{}.json".format(hashlib.sha1(key.encode("utf8")).hexdigest()))
+
+
+class TokenFileStorage(Storage):
+    """
+    oauth2client Storage of the access token of `credentials` in a file,
+    locked with fcntl so that one process refreshes the token while others wait and reuse it
+
+    :param path: token file path
+    :param credentials: oauth2client credentials the token belongs to
+    :param margin: seconds before expiry a stored token is not handed out anymore
+    """
+    def __init__(self, path, credentials, margin=REFRESH_MARGIN):
+        super(TokenFileStorage, self).__init__(lock=threading.Lock())
+        self.path = path
+        self.credentials = credentials
+        self.margin = margin
+        self._lock_file = None
+
+    def acquire_lock(self):
+        self._lock.acquire()
+        if fcntl is None:
+            return
+        try:
+            _makedirs(os.path.dirname(self.path))
+            self._lock_file = open(self.path + ".lock", "a")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        except Exception:
+            self._lock.release()
+            raise
+
+    def release_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+        self._lock.release()
+
+    def read(self):
+        """
+        :return: (access token, expiry datetime in UTC or None), None if there is no valid token
+        """
+        try:
+            with open(self.path) as token_file:
+                data = json.load(token_file)
+            access_token = data["access_token"]
+            expiry = data.get("token_expiry")
+            if expiry is not None:
+                expiry = datetime.datetime.strptime(expiry, EXPIRY_FORMAT)
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+        if expiry is not None and expiry - datetime.timedelta(seconds=self.margin) <= _utcnow():
+            return None
+        return access_token, expiry
+
+    def locked_get(self):
+        token = self.read()
+        if token is None:
+            return None
+        credentials = copy.copy(self.credentials)
+        credentials.access_token, credentials.token_expiry = token
+        credentials.invalid = False
+        return credentials
+
+    def locked_put(self, credentials):
+        expiry = credentials.token_expiry
+        data = {
+            "access_token": credentials.access_token,
+            "token_expiry": expiry.strftime(EXPIRY_FORMAT) if expiry is not None else None,
+        }
+        directory = os.path.dirname(self.path)
+        _makedirs(directory)
+        # readable by the owner only
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(data, tmp_file)
+            if fcntl is None and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def locked_delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def share_token(credentials, directory=None, margin=REFRESH_MARGIN):
+    """
+    Share the access token of credentials with other processes, through a token file.
+    Credentials refreshing through a token endpoint (service accounts) are supported,
+    Compute Engine credentials refresh from the local metadata server and are returned as is.
+
+    :param credentials: oauth2client credentials
+    :param directory: directory of token files, default to utils.DISCOVERY_CACHE_DIR
+    :param margin: seconds before expiry a token is refreshed
+    :return: the credentials, with a stored token loaded if there is a valid one
+    """
+    if AppAssertionCredentials is not None and isinstance(credentials, AppAssertionCredentials):
+        return credentials
+    if directory is None:
+        from google_spreadsheet.utils import DISCOVERY_CACHE_DIR
+        directory = DISCOVERY_CACHE_DIR
+    storage = TokenFileStorage(token_path(credentials, directory), credentials, margin)
+    credentials.set_store(storage)
+
+    storage.acquire_lock()
+    try:
+        token = storage.read()
+    finally:
+        storage.release_lock()
+    if token is not None:
+        credentials.access_token, credentials.token_expiry = token
+        credentials.invalid = False
+    return credentials
+
+
+def expires_soon(credentials, margin=REFRESH_MARGIN):
+    """
+    :return: the access token expires within `margin` seconds or not
+    """
+    expiry = credentials.token_expiry
+    return expiry is not None and expiry - datetime.timedelta(seconds=margin) <= _utcnow()
+
+
+def authorize(credentials, http=None, margin=REFRESH_MARGIN):
+    """
+    Authorize an HTTP transport, refreshing the token `margin` seconds before it expires
+    instead of on a 401 response
+
+    :param credentials: oauth2client credentials, usually shared by share_token()
+    :param http: httplib2.Http object, a new one if None
+    :param margin: seconds before expiry a token is refreshed
+    :return: authorized httplib2.Http object
+    """
+    if http is None:
+        http = httplib2.Http()
+    unauthorized_request = http.request
+    http = credentials.authorize(http)
+    authorized_request = http.request
+
+    def request(*args, **kwargs):
+        if credentials.access_token and expires_soon(credentials, margin):
+            # takes a token refreshed by another process if there is one
+            credentials._refresh(unauthorized_request)
+        return authorized_request(*args, **kwargs)
+
+    http.request = request
+    return http
@@ -5,31 +5,238 @@ Created on 2016-11-10
 @author: jingyang <jingyang@nexa-corp.com>
 '''
 
+import hashlib
+import json
 import os
+import tempfile
+import threading
+import time
 
+import httplib2
 from oauth2client.client import GoogleCredentials
 from oauth2client.service_account import ServiceAccountCredentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import DISCOVERY_URI, build_from_document
+
+from google_spreadsheet import tokens
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 
+# on-disk cache of discovery documents, shared by processes of the user
+DISCOVERY_CACHE_DIR = os.environ.get(
+    "GOOGLE_SPREADSHEET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "google_spreadsheet")
+)
+
+# scope of the Sheets API, requested by default
+SPREADSHEETS_SCOPE = "https://www.googleapis.com/auth/spreadsheets"
+# scope of the Drive version probe of changes.Watcher
+DRIVE_METADATA_SCOPE = "https://www.googleapis.com/auth/drive.metadata.readonly"
+
+_documents = {}
+_services = {}
+_shared_http = {}
+_lock = threading.Lock()
+
 
-def spreadsheet_service(on_gce=False, key_file_location=None, scopes=None):
+def get_credentials(on_gce=False, key_file_location=None, scopes=None):
     """
-    Get client service to request spreadsheet APIs
+    Get OAuth 2.0 credentials to request spreadsheet APIs
 
     :param on_gce: project runs on Google Compute Engine or not
     :param key_file_location: json-formatted API key file
     :param scopes: OAuth 2.0 scopes, doc: https://developers.google.com/sheets/guides/authorizing#OAuth2Authorizing
-    :return: client service object
+    :return: credentials object
     """
     if scopes is None:
         scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
+            SPREADSHEETS_SCOPE,
         ]
     if on_gce:
         credentials = GoogleCredentials.get_application_default()
+        if credentials.create_scoped_required():
+            credentials = credentials.create_scoped(scopes)
     else:
         credentials = ServiceAccountCredentials.from_json_keyfile_name(key_file_location, scopes)
-    return build("sheets", "v4", credentials=credentials)
+    return credentials
+
+
+def _scopes(scopes, drive_metadata):
+    if not drive_metadata:
+        return scopes
+    scopes = list(scopes) if scopes is not None else [SPREADSHEETS_SCOPE]
+    if DRIVE_METADATA_SCOPE not in scopes:
+        scopes.append(DRIVE_METADATA_SCOPE)
+    return scopes
+
+
+def _shared_credentials(on_gce, key_file_location, scopes, token_cache):
+    credentials = get_credentials(on_gce, key_file_location, scopes)
+    if token_cache:
+        credentials = tokens.share_token(credentials, None if token_cache is True else token_cache)
+    return credentials
+
+
+def _authorize(credentials, token_cache):
+    if token_cache:
+        return tokens.authorize(credentials)
+    return credentials.authorize(httplib2.Http())
+
+
+def http_factory(on_gce=False, key_file_location=None, scopes=None, token_cache=False, drive_metadata=False):
+    """
+    Get a factory of authorized HTTP transports, for Client(service, http_factory=...).
+    httplib2 transports are not thread-safe, the client builds one per thread with it.
+
+    :param on_gce: project runs on Google Compute Engine or not
+    :param key_file_location: json-formatted API key file
+    :param scopes: OAuth 2.0 scopes
+    :param token_cache: share access tokens with other processes (see tokens.share_token) or not,
+                        or the directory of token files
+    :param drive_metadata: add DRIVE_METADATA_SCOPE to the scopes or not, see spreadsheet_service
+    :return: callable returning a new authorized httplib2.Http object
+    """
+    credentials = _shared_credentials(on_gce, key_file_location, _scopes(scopes, drive_metadata), token_cache)
+
+    def factory():
+        return _authorize(credentials, token_cache)
+    return factory
+
+
+class ThreadLocalHttp(object):
+    """
+    HTTP transport keeping one keep-alive connection pool per thread,
+    so a single service object can be used from several threads
+
+    :param factory: callable returning a new httplib2.Http-like object, e.g. http_factory(...)
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self._local = threading.local()
+
+    @property
+    def http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self.factory()
+        return http
+
+    def request(self, *args, **kwargs):
+        return self.http.request(*args, **kwargs)
+
+
+def _write_atomic(path, content):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(content.encode("utf8"))
+        try:
+            os.replace(tmp_path, path)
+        except AttributeError:
+            # python 2
+            os.rename(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def discovery_document(api="sheets", version="v4", cache_dir=DISCOVERY_CACHE_DIR, max_age=24 * 3600):
+    """
+    Get a discovery document, from memory, from the on-disk cache if younger than `max_age`,
+    else from the network. A stale cached document is used when the network is not available.
+
+    :param api: API name
+    :param version: API version
+    :param cache_dir: directory of the on-disk cache, None to not use it
+    :param max_age: seconds a cached document is used without trying to refresh it
+    :return: discovery document, JSON string
+    """
+    url = DISCOVERY_URI.format(api=api, apiVersion=version)
+    if url in _documents:
+        return _documents[url]
+
+    path = None
+    cached = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, "{}.json".format(hashlib.sha1(url.encode("utf8")).hexdigest()))
+        if os.path.exists(path):
+            with open(path, "rb") as cache_file:
+                cached = cache_file.read().decode("utf8")
+            if time.time() - os.path.getmtime(path) < max_age:
+                _documents[url] = cached
+                return cached
+
+    try:
+        response, content = httplib2.Http(timeout=30).request(url)
+        if response.status != 200:
+            raise httplib2.HttpLib2Error("HTTP {} fetching {}".format(response.status, url))
+        document = content.decode("utf8")
+        json.loads(document)
+    except (httplib2.HttpLib2Error, IOError, ValueError):
+        if cached is None:
+            raise
+        # offline, a stale document is better than nothing
+        document = cached
+    else:
+        if path is not None:
+            _write_atomic(path, document)
+
+    _documents[url] = document
+    return document
+
+
+def spreadsheet_service(on_gce=False, key_file_location=None, scopes=None, transport=None, cached=False,
+                        cache_dir=DISCOVERY_CACHE_DIR, max_age=24 * 3600, token_cache=False, drive_metadata=False):
+    """
+    Get client service to request spreadsheet APIs.
+    The discovery document is cached in memory and on disk, a new service is built per call by default.
+
+    :param on_gce: project runs on Google Compute Engine or not
+    :param key_file_location: json-formatted API key file
+    :param scopes: OAuth 2.0 scopes, doc: https://developers.google.com/sheets/guides/authorizing#OAuth2Authorizing
+    :param transport: HTTP transport of the service:
+                      None - a new transport for the service,
+                      "shared" - one keep-alive transport per credentials for the whole process, not thread-safe,
+                      "thread" - one keep-alive transport per thread, the service can be shared by threads
+    :param cached: reuse a service built with the same arguments or not, a reused service shares its transport:
+                   only use it across threads with transport="thread"
+    :param cache_dir: directory of the discovery documents cache, None to not use it
+    :param max_age: seconds a cached discovery document is used without trying to refresh it
+    :param token_cache: share access tokens with other processes (see tokens.share_token) or not,
+                        or the directory of token files
+    :param drive_metadata: add DRIVE_METADATA_SCOPE to the scopes or not, needed by the Drive version probe
+                           which lets Spreadsheet.watch skip reading unchanged spreadsheets
+    :return: client service object
+    """
+    if transport not in (None, "shared", "thread"):
+        raise ValueError("Unknown transport: {}".format(transport))
+    scopes = _scopes(scopes, drive_metadata)
+
+    key = (on_gce, key_file_location, tuple(scopes or ()), transport, token_cache)
+    if cached and key in _services:
+        return _services[key]
+
+    document = discovery_document("sheets", "v4", cache_dir, max_age)
+    credentials = _shared_credentials(on_gce, key_file_location, scopes, token_cache)
+    if transport is None:
+        service = build_from_document(document, http=_authorize(credentials, token_cache))
+    elif transport == "thread":
+        service = build_from_document(document, http=ThreadLocalHttp(lambda: _authorize(credentials, token_cache)))
+    else:
+        with _lock:
+            http = _shared_http.get(key[:3])
+            if http is None:
+                http = _shared_http[key[:3]] = _authorize(credentials, token_cache)
+        service = build_from_document(document, http=http)
+
+    if cached:
+        with _lock:
+            service = _services.setdefault(key, service)
+    return service
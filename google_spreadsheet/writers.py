@@ -0,0 +1,364 @@
+# encoding=utf8
+'''
+Created on 2026-10-16
+
+Incremental writers of sheet values: CSV rows, Parquet row groups and Arrow IPC record batches,
+each chunk of rows is written as it is fetched. Files are written under a temporary name,
+renamed once complete, so that a failed export never leaves a truncated file.
+pyarrow is an optional dependency, only needed (and imported) by the Parquet and Arrow writers.
+
+Example:
+>>> with writer("report.parquet", PARQUET) as output:
+>>>     for rows in chunks:
+>>>         output.write(rows)
+'''
+import csv
+import io
+import os
+import re
+
+from google_spreadsheet import a1
+
+pyarrow = None
+
+try:
+    _number_types = (int, long, float)
+    _text_type = unicode
+except NameError:
+    _number_types = (int, float)
+    _text_type = str
+
+CSV = "csv"
+PARQUET = "parquet"
+ARROW = "arrow"
+
+# file extension of each format
+EXTENSIONS = {CSV: ".csv", PARQUET: ".parquet", ARROW: ".arrow"}
+# suffix of files being written
+PART_SUFFIX = ".part"
+
+_replace = getattr(os, "replace", os.rename)
+
+_unsafe_re = re.compile(r"[^\w .-]+", re.UNICODE)
+
+
+def _require_pyarrow():
+    global pyarrow
+    if pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is required, pip install pyarrow")
+
+
+def file_name(sheet_name, format=CSV):
+    """
+    File name of a sheet export, characters unsafe in paths are replaced by "_"
+
+    :param sheet_name: sheet name
+    :param format: export format
+    :return: file name
+    """
+    name = _unsafe_re.sub("_", sheet_name).strip(" .") or "sheet"
+    return name + EXTENSIONS[format]
+
+
+def path_format(path):
+    """
+    Export format of a file path, by extension
+
+    :param path: file path
+    :return: "csv", "parquet" or "arrow", "csv" for other extensions
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for format, format_extension in EXTENSIONS.items():
+        if extension == format_extension:
+            return format
+    return CSV
+
+
+class _FileWriter(object):
+    """
+    Base class of writers: rows go to `path` + PART_SUFFIX, renamed to `path` once closed without error
+
+    :param path: file path
+    """
+    def __init__(self, path):
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        # cells written as null or left out, as they do not fit the schema
+        self.dropped_cells = 0
+
+    def _close_files(self):
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Complete the file and rename it to `path`
+
+        :return: None
+        """
+        self._close_files()
+        _replace(self.part_path, self.path)
+
+    def abort(self):
+        """
+        Close and remove the incomplete file
+
+        :return: None
+        """
+        try:
+            self._close_files()
+        finally:
+            if os.path.exists(self.part_path):
+                os.remove(self.part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvWriter(_FileWriter):
+    """
+    Write rows to a CSV file
+
+    :param path: file path
+    :param delimiter: fields delimiter
+    :param encoding: file encoding
+    """
+    def __init__(self, path, delimiter=",", encoding="utf-8"):
+        super(CsvWriter, self).__init__(path)
+        self.encoding = encoding
+        if str is bytes:
+            # python 2: csv writes byte strings only
+            self._file = open(self.part_path, "wb")
+            self._writer = csv.writer(self._file, delimiter=str(delimiter), lineterminator="\n")
+        else:
+            self._file = io.open(self.part_path, "w", encoding=encoding, newline="")
+            self._writer = csv.writer(self._file, delimiter=delimiter, lineterminator="\n")
+
+    def write(self, rows):
+        """
+        :param rows: list of ragged rows
+        :return: None
+        """
+        if str is bytes:
+            rows = [[cell.encode(self.encoding) if isinstance(cell, _text_type) else cell for cell in row]
+                    for row in rows]
+        self._writer.writerows(rows)
+
+    def _close_files(self):
+        self._file.close()
+
+
+def _field_type(cells):
+    """
+    Arrow type of a column: bool or float64 (numbers of a spreadsheet are doubles) if all non-empty cells
+    are such, string otherwise
+    """
+    _require_pyarrow()
+    kinds = set(type(cell) for cell in cells if cell != "" and cell is not None)
+    if kinds == {bool}:
+        return pyarrow.bool_()
+    if kinds and kinds <= set(_number_types):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def infer_schema(rows, names=None):
+    """
+    Infer an Arrow schema from rows
+
+    :param rows: list of ragged rows
+    :param names: column names, default to column labels: A, B, ...
+    :return: pyarrow.Schema
+    """
+    _require_pyarrow()
+    width = max([len(row) for row in rows] + [len(names or [])] or [0])
+    fields, seen = [], set()
+    for col in range(width):
+        name = names[col] if names is not None and col < len(names) else ""
+        name = u"{}".format(name) if name != "" else a1.column_label(col)
+        # names are kept unique, Parquet files do not accept duplicates
+        unique, suffix = name, 1
+        while unique in seen:
+            suffix += 1
+            unique = u"{}_{}".format(name, suffix)
+        seen.add(unique)
+        cells = [row[col] for row in rows if col < len(row)]
+        fields.append(pyarrow.field(unique, _field_type(cells)))
+    return pyarrow.schema(fields)
+
+
+def _conversion_errors():
+    return OverflowError, pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError
+
+
+def _fits(value, field_type):
+    if pyarrow.types.is_boolean(field_type):
+        return isinstance(value, bool)
+    if pyarrow.types.is_floating(field_type):
+        return isinstance(value, _number_types) and not isinstance(value, bool)
+    try:
+        pyarrow.array([value], type=field_type)
+    except _conversion_errors():
+        return False
+    return True
+
+
+def _to_array(cells, field_type):
+    """
+    Arrow array of a column, cells which do not fit the type are nulls,
+    e.g. text in a column inferred as float64 from the first chunk
+
+    :param cells: column cells, "" or None for empty cells
+    :param field_type: Arrow type
+    :return: (pyarrow.Array, count of nulled cells)
+    """
+    values = [None if cell == "" or cell is None else cell for cell in cells]
+    if pyarrow.types.is_string(field_type):
+        return pyarrow.array([None if value is None else u"{}".format(value) for value in values],
+                             type=field_type), 0
+    if pyarrow.types.is_boolean(field_type) or pyarrow.types.is_floating(field_type):
+        if all(_fits(value, field_type) for value in values if value is not None):
+            return pyarrow.array(values, type=field_type), 0
+    else:
+        try:
+            return pyarrow.array(values, type=field_type), 0
+        except _conversion_errors():
+            pass
+    nulled = 0
+    for index, value in enumerate(values):
+        if value is not None and not _fits(value, field_type):
+            values[index] = None
+            nulled += 1
+    return pyarrow.array(values, type=field_type), nulled
+
+
+class _TableWriter(_FileWriter):
+    """
+    Base class of Arrow based writers: the schema is inferred from the first chunk unless given,
+    with the first row as column names if `header`.
+    Later cells which do not fit the schema are written as nulls, cells past its last column are left out;
+    both are counted in `dropped_cells`.
+
+    :param path: file path
+    :param header: first row holds column names or not
+    :param schema: pyarrow.Schema, inferred if None
+    """
+    def __init__(self, path, header=True, schema=None):
+        _require_pyarrow()
+        super(_TableWriter, self).__init__(path)
+        self.header = header
+        self.schema = schema
+        self._writer = None
+
+    def _open(self, schema):
+        raise NotImplementedError
+
+    def _write_batch(self, batch):
+        raise NotImplementedError
+
+    def write(self, rows):
+        """
+        :param rows: list of ragged rows
+        :return: None
+        """
+        if self._writer is None:
+            names = None
+            if self.header and rows:
+                names, rows = rows[0], rows[1:]
+            if self.schema is None:
+                self.schema = infer_schema(rows, names)
+            self._writer = self._open(self.schema)
+        if not rows:
+            return
+
+        width = len(self.schema)
+        columns = [[] for _ in range(width)]
+        for row in rows:
+            if len(row) > width:
+                self.dropped_cells += sum(1 for cell in row[width:] if cell != "" and cell is not None)
+            for col in range(width):
+                columns[col].append(row[col] if col < len(row) else None)
+        arrays = []
+        for cells, field in zip(columns, self.schema):
+            array, nulled = _to_array(cells, field.type)
+            arrays.append(array)
+            self.dropped_cells += nulled
+        self._write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self._writer is None:
+            # no rows, the file still gets a schema
+            self.write([])
+        super(_TableWriter, self).close()
+
+    def abort(self):
+        if self._writer is not None:
+            super(_TableWriter, self).abort()
+        elif os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def _close_files(self):
+        self._writer.close()
+
+
+class ParquetWriter(_TableWriter):
+    """
+    Write rows to a Parquet file, one row group per chunk
+    """
+    def __init__(self, path, header=True, schema=None, compression="snappy"):
+        super(ParquetWriter, self).__init__(path, header, schema)
+        self.compression = compression
+
+    def _open(self, schema):
+        return pyarrow.parquet.ParquetWriter(self.part_path, schema, compression=self.compression)
+
+    def _write_batch(self, batch):
+        self._writer.write_table(pyarrow.Table.from_batches([batch]))
+
+
+class ArrowWriter(_TableWriter):
+    """
+    Write rows to an Arrow IPC file, one record batch per chunk
+    """
+    def _open(self, schema):
+        self._sink = pyarrow.OSFile(self.part_path, "wb")
+        return pyarrow.ipc.new_file(self._sink, schema)
+
+    def _write_batch(self, batch):
+        self._writer.write_batch(batch)
+
+    def _close_files(self):
+        try:
+            super(ArrowWriter, self)._close_files()
+        finally:
+            self._sink.close()
+
+
+def writer(path, format=CSV, header=True, schema=None, delimiter=","):
+    """
+    Writer of an export format
+
+    :param path: file path
+    :param format: "csv", "parquet" or "arrow"
+    :param header: first row holds column names or not, Parquet and Arrow only
+    :param schema: pyarrow.Schema, Parquet and Arrow only, inferred from the first chunk if None
+    :param delimiter: fields delimiter, CSV only
+    :return: writer object, with write(rows) and close()
+    """
+    if format == CSV:
+        return CsvWriter(path, delimiter)
+    if format == PARQUET:
+        return ParquetWriter(path, header, schema)
+    if format == ARROW:
+        return ArrowWriter(path, header, schema)
+    raise ValueError("Unsupported export format: {}".format(format))
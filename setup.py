@@ -10,8 +10,12 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 setup(
     name='google-spreadsheet',
     version='0.1',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*']),
     include_package_data=True,
+    extras_require={
+        'frames': ['numpy', 'pandas'],
+        'export': ['pyarrow'],
+    },
     license='BSD License',  # example license
     description='Google Spreadsheets API Python Client',
     long_description=README,
@@ -25,6 +29,7 @@ setup(
         'Operating System :: OS Independent',
         'Programming Language :: Python',
         'Programming Language :: Python :: 2.7',
+        'Programming Language :: Python :: 3',
         'Topic :: Utilities'
     ],
     zip_safe=False
@@ -0,0 +1,91 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+A1 notation codec: labels, parsing edge cases, sheet name quoting
+'''
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.a1 import (
+    A1Range, MAX_COLUMNS, cell_coords, cell_label, column_index, column_label, quote_sheet_name, range_name
+)
+
+
+class LabelsTest(unittest.TestCase):
+    def test_columns(self):
+        for col, label in ((0, "A"), (25, "Z"), (26, "AA"), (701, "ZZ"), (702, "AAA"), (MAX_COLUMNS - 1, "ZZZ")):
+            self.assertEqual(column_label(col), label)
+            self.assertEqual(column_index(label), col)
+        self.assertEqual(column_index("ab"), 27)
+        self.assertRaises(exceptions.IncorrectCellLabel, column_label, MAX_COLUMNS)
+        self.assertRaises(exceptions.IncorrectCellLabel, column_label, -1)
+        self.assertRaises(exceptions.IncorrectCellLabel, column_index, "A1")
+
+    def test_cells(self):
+        self.assertEqual(cell_label(0, 0), "A1")
+        self.assertEqual(cell_label(9, 27), "AB10")
+        self.assertEqual(cell_coords("ab10"), (9, 27))
+        self.assertRaises(exceptions.IncorrectCellLabel, cell_label, -1, 0)
+        self.assertRaises(exceptions.IncorrectCellLabel, cell_coords, "A0")
+        self.assertRaises(exceptions.IncorrectCellLabel, cell_coords, "11")
+
+
+class ParseTest(unittest.TestCase):
+    def assert_parsed(self, notation, sheet_name, start_row, start_col, end_row, end_col):
+        self.assertEqual(A1Range.parse(notation), A1Range(sheet_name, start_row, start_col, end_row, end_col))
+
+    def test_cells_and_ranges(self):
+        self.assert_parsed("B2", None, 1, 1, 2, 2)
+        self.assert_parsed("a1:b2", None, 0, 0, 2, 2)
+        self.assert_parsed("Sheet1!A1:B2", "Sheet1", 0, 0, 2, 2)
+
+    def test_unbounded(self):
+        self.assert_parsed("A:C", None, None, 0, None, 3)
+        self.assert_parsed("1:3", None, 0, None, 3, None)
+        self.assert_parsed("A5:B", None, 4, 0, None, 2)
+        self.assert_parsed("Data!B2:B", "Data", 1, 1, None, 2)
+
+    def test_sheet_names(self):
+        self.assert_parsed("Sheet1", "Sheet1", None, None, None, None)
+        self.assert_parsed("My Sheet", "My Sheet", None, None, None, None)
+        self.assert_parsed("Sheet1!", "Sheet1", None, None, None, None)
+        self.assert_parsed("'Bob''s'!A:C", "Bob's", None, 0, None, 3)
+        self.assert_parsed("'A!B'!C3", "A!B", 2, 2, 3, 3)
+        # the last "!" separates the cells
+        self.assert_parsed("Sheet!A1!B2", "Sheet!A1", 1, 1, 2, 2)
+        # not a cell: row 0 does not exist
+        self.assert_parsed("A0", "A0", None, None, None, None)
+
+    def test_r1c1(self):
+        self.assert_parsed("Sheet1!R1C1:R2C2", "Sheet1", 0, 0, 2, 2)
+        self.assert_parsed("r3c2", None, 2, 1, 3, 2)
+        self.assert_parsed("'R1C1'!A1", "R1C1", 0, 0, 1, 1)
+        # a column "RC" of A1 notation, not R1C1
+        self.assert_parsed("RC1", None, 0, column_index("RC"), 1, column_index("RC") + 1)
+
+    def test_errors(self):
+        for notation in ("'Unclosed!A1", "'Sheet'A1", "Sheet1!A0", "Sheet1!A1:?"):
+            self.assertRaises(exceptions.IncorrectCellLabel, A1Range.parse, notation)
+
+    def test_round_trip(self):
+        for notation in ("A1", "A1:B2", "A:C", "1:3", "A5:B", "Sheet1!C3:D", "'Bob''s'!A1", "'My Sheet'"):
+            self.assertEqual(A1Range.parse(notation).to_a1(), notation)
+        self.assertEqual(A1Range.parse("Sheet1!A1:B2").to_r1c1(), "Sheet1!R1C1:R2C2")
+
+
+class QuotingTest(unittest.TestCase):
+    def test_plain_names(self):
+        for name in ("Orders", "Sheet1", "Q1_2026", "ABCD1"):
+            self.assertEqual(range_name(name, "A1"), "{}!A1".format(name))
+
+    def test_cell_like_names(self):
+        for name in ("A1", "ab12", "C", "ZZZ", "12", "R1C1", "r2c3", "RC", "R1C", "RC10", "R2"):
+            self.assertEqual(range_name(name, "A1", "B2"), "'{}'!A1:B2".format(name))
+            self.assertEqual(A1Range(name, 0, 0, 1, 1).to_a1(), "'{}'!A1".format(name))
+            self.assertEqual(A1Range.parse(range_name(name, "A1")).sheet_name, name)
+
+    def test_special_characters(self):
+        self.assertEqual(quote_sheet_name("Bob's Sheet"), "'Bob''s Sheet'")
+        self.assertEqual(range_name("My Sheet", "A1"), "'My Sheet'!A1")
+        self.assertEqual(range_name(u"Émission", "A1"), u"'Émission'!A1")
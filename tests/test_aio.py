@@ -0,0 +1,123 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+AsyncClient against FakeSheetsService: concurrency limits and the async wrappers
+'''
+import threading
+import time
+import unittest
+from collections import defaultdict
+
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+try:
+    import asyncio
+    from google_spreadsheet.aio import AsyncClient
+except (ImportError, SyntaxError):
+    # python 2
+    asyncio = None
+
+
+class _RecordingClient(Client):
+    """
+    Client recording the peak count of values.get calls in flight, overall and per spreadsheet
+    """
+    def __init__(self, service, latency=0.02):
+        # a transport per thread, so that calls may run concurrently
+        super(_RecordingClient, self).__init__(service, http_factory=lambda: None)
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.file_in_flight = defaultdict(int)
+        self.file_peaks = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def values_get(self, file_id, range_name, *args, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.file_in_flight[file_id] += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.file_peaks[file_id] = max(self.file_peaks[file_id], self.file_in_flight[file_id])
+        try:
+            time.sleep(self.latency)
+            return super(_RecordingClient, self).values_get(file_id, range_name, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.file_in_flight[file_id] -= 1
+
+
+def _run(make_awaitable):
+    """
+    Run on a new event loop, `make_awaitable` is called once that loop is the current one
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(make_awaitable())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@unittest.skipIf(asyncio is None, "asyncio requires Python 3")
+class AsyncClientTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_ids = [self.service.add_spreadsheet("Doc {}".format(i)) for i in range(3)]
+
+    def read_all(self, client, reads_per_file=6):
+        return lambda: asyncio.gather(*[client.values_get(file_id, "Sheet1!A1:B2")
+                                for file_id in self.file_ids for _ in range(reads_per_file)])
+
+    def test_limits_hold(self):
+        recording = _RecordingClient(self.service)
+        client = AsyncClient(client=recording, max_concurrency=4, max_concurrency_per_file=2)
+        try:
+            responses = _run(self.read_all(client))
+        finally:
+            client.close()
+        self.assertEqual(len(responses), 18)
+        self.assertEqual(recording.peak, 4)
+        self.assertEqual(set(recording.file_peaks.values()), set([2]))
+
+    def test_single_transport_runs_one_call_at_a_time(self):
+        recording = _RecordingClient(self.service, latency=0.005)
+        recording.http_factory = None
+        client = AsyncClient(client=recording, max_concurrency=8)
+        try:
+            _run(self.read_all(client, reads_per_file=3))
+        finally:
+            client.close()
+        self.assertEqual(recording.peak, 1)
+
+    def test_several_event_loops(self):
+        recording = _RecordingClient(self.service, latency=0.001)
+        client = AsyncClient(client=recording, max_concurrency=2, max_concurrency_per_file=1)
+        try:
+            for _ in range(2):
+                self.assertEqual(len(_run(self.read_all(client, reads_per_file=2))), 6)
+        finally:
+            client.close()
+        self.assertEqual(recording.peak, 2)
+
+    def test_spreadsheet_and_sheet(self):
+        client = AsyncClient(self.service, http_factory=lambda: None)
+        loop = asyncio.new_event_loop()
+        try:
+            spreadsheet = loop.run_until_complete(client.open(self.file_ids[0]))
+            sheet = loop.run_until_complete(spreadsheet.find_sheet_by_name("Sheet1"))
+            loop.run_until_complete(sheet.update_values("A1", "B2", [["a", "b"], ["c", "d"]]))
+            loop.run_until_complete(sheet.resize(20, 3))
+            added = loop.run_until_complete(spreadsheet.add_sheet("Other", 5, 2))
+            response = loop.run_until_complete(sheet.get_values("A1", "B2"))
+            sheets = loop.run_until_complete(spreadsheet.all_sheets())
+        finally:
+            loop.close()
+            client.close()
+        self.assertEqual(response["values"], [["a", "b"], ["c", "d"]])
+        self.assertEqual((sheet.row_count, sheet.col_count), (20, 3))
+        self.assertEqual((added.name, added.row_count), ("Other", 5))
+        self.assertEqual([details["properties"]["title"] for details in sheets], ["Sheet1", "Other"])
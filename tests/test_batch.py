@@ -0,0 +1,79 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Spreadsheet.batch(): mutators queued in a session are sent in one batchUpdate
+'''
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class BatchSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("First", 10, 3), ("Second", 10, 3)))
+        self.spreadsheet = Client(self.service).open(file_id)
+        self.first = self.spreadsheet.find_sheet_by_name("First")
+        self.service.reset_stats()
+
+    def batch_updates(self):
+        return self.service.stats["methods"].get("spreadsheets.batchUpdate", 0)
+
+    def test_one_batch_update(self):
+        with self.spreadsheet.batch() as session:
+            added = self.spreadsheet.add_sheet("Third", 5, 2)
+            self.first.resize(20, 4)
+            self.first.change_name("Renamed")
+            self.assertFalse(added.done)
+            self.assertRaises(exceptions.BatchError, added.result)
+            self.assertEqual(len(session.requests), 3)
+        self.assertEqual(self.batch_updates(), 1)
+
+        sheet = added.result()
+        self.assertEqual((sheet.name, sheet.row_count, sheet.col_count), ("Third", 5, 2))
+        self.assertEqual((self.first.name, self.first.row_count, self.first.col_count), ("Renamed", 20, 4))
+        names = [details["properties"]["title"] for details in self.spreadsheet.all_sheets()]
+        self.assertEqual(names, ["Renamed", "Second", "Third"])
+        self.assertEqual(self.service.stats["methods"].get("spreadsheets.get", 0), 0)
+
+    def test_raw_requests_and_empty_session(self):
+        with self.spreadsheet.batch():
+            pass
+        self.assertEqual(self.batch_updates(), 0)
+
+        with self.spreadsheet.batch():
+            result = self.spreadsheet.batch_update([self.first.append_request("ROWS", 5)])
+        self.assertEqual(result.result(), {"replies": [{}]})
+        self.assertEqual(self.first.row_count, 15)
+
+    def test_error_discards_queued_requests(self):
+        try:
+            with self.spreadsheet.batch():
+                self.first.resize(50, 5)
+                raise KeyError("boom")
+        except KeyError:
+            pass
+        self.assertEqual(self.batch_updates(), 0)
+        self.assertEqual(self.first.row_count, 10)
+        self.assertIsNone(self.spreadsheet._batch)
+
+    def test_nested_sessions_flush_once(self):
+        with self.spreadsheet.batch() as outer:
+            with self.spreadsheet.batch() as inner:
+                self.assertIs(inner, outer)
+                self.first.resize(12, 3)
+            self.assertEqual(self.batch_updates(), 0)
+            self.spreadsheet.find_sheet_by_name("Second").resize(14, 3)
+        self.assertEqual(self.batch_updates(), 1)
+        self.assertEqual(self.first.row_count, 12)
+
+    def test_deleted_sheet(self):
+        second = self.spreadsheet.find_sheet_by_name("Second")
+        with self.spreadsheet.batch():
+            second.resize(30, 3)
+            self.spreadsheet.delete_sheet(second.sheet_id)
+        self.assertEqual(self.batch_updates(), 1)
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_name, "Second")
@@ -0,0 +1,64 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Client value cache: hits, and invalidation by writes to overlapping ranges
+'''
+import unittest
+
+from google_spreadsheet.cache import ValueCache
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class ValueCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 20, 5), ("Sheet2", 20, 5)))
+        self.cache = ValueCache(ttl=60)
+        self.client = Client(self.service, cache=self.cache)
+        self.spreadsheet = self.client.open(self.file_id)
+        self.sheet = self.spreadsheet.find_sheet_by_name("Sheet1")
+        self.sheet.update_values("A1", "B2", [["a", "b"], ["c", "d"]])
+        self.service.reset_stats()
+
+    def reads(self):
+        return self.service.stats["methods"].get("values.get", 0) + \
+            self.service.stats["methods"].get("values.batchGet", 0)
+
+    def test_hit(self):
+        first = self.sheet.get_values("A1", "B2")
+        second = self.sheet.get_values("A1", "B2")
+        self.assertEqual(first, second)
+        self.assertEqual(self.reads(), 1)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    def test_hits_are_copies(self):
+        self.sheet.get_values("A1", "B2")["values"][0][0] = "mutated"
+        self.assertEqual(self.sheet.get_values("A1", "B2")["values"][0][0], "a")
+
+    def test_overlapping_write_invalidates(self):
+        self.sheet.get_values("A1", "B2")
+        self.sheet.update_values("B2", "B2", [["new"]])
+        self.assertEqual(self.sheet.get_values("A1", "B2")["values"], [["a", "b"], ["c", "new"]])
+        self.assertEqual(self.reads(), 2)
+
+    def test_other_writes_keep_entries(self):
+        self.sheet.get_values("A1", "B2")
+        self.sheet.update_values("D10", "D10", [["elsewhere"]])
+        self.spreadsheet.find_sheet_by_name("Sheet2").update_values("A1", "A1", [["other sheet"]])
+        self.sheet.get_values("A1", "B2")
+        self.assertEqual(self.reads(), 1)
+
+    def test_structural_update_invalidates_file(self):
+        self.sheet.get_values("A1", "B2")
+        self.sheet.insert(row=1)
+        self.assertEqual(self.sheet.get_values("A1", "B2")["values"], [[], ["a", "b"]])
+        self.assertEqual(self.reads(), 2)
+
+    def test_batch_get_reads_missing_ranges_only(self):
+        self.sheet.get_values("A1", "B1")
+        response = self.client.values_batch_get(self.file_id, ["Sheet1!A1:B1", "Sheet1!A2:B2"])
+        self.assertEqual([value_range["values"] for value_range in response["valueRanges"]],
+                         [[["a", "b"]], [["c", "d"]]])
+        self.assertEqual(self.service.stats["methods"], {"values.get": 1, "values.batchGet": 1})
@@ -0,0 +1,102 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+changes.Watcher: cell and sheet changes, version probes, renamed and removed sheets
+'''
+import unittest
+import warnings
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_spreadsheet import changes, utils
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Orders", 20, 5), ("Stock", 20, 5)))
+        self.spreadsheet = Client(self.service).open(file_id)
+        self.orders = self.spreadsheet.find_sheet_by_name("Orders")
+        self.orders.update_values("A1", "B3", [["id", "state"], [1, "pending"], [2, "pending"]])
+
+    def watcher(self, ranges=("Orders!A1:B", "Stock!A1:B"), **kwargs):
+        kwargs.setdefault("version_probe", None)
+        return changes.Watcher(self.spreadsheet, list(ranges), interval=1, block_rows=2, **kwargs)
+
+    def test_cell_changes(self):
+        watcher = self.watcher()
+        self.assertEqual(watcher.poll(), [])
+        self.orders.update_values("B3", values=[["shipped"]])
+        events = watcher.poll()
+        self.assertEqual([(event.label, event.old, event.new) for event in events],
+                         [("Orders!B3", "pending", "shipped")])
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(watcher.stats["changes"], 1)
+
+    def test_backoff(self):
+        watcher = self.watcher(max_interval=4)
+        delays = []
+        for _ in range(4):
+            watcher.poll()
+            delays.append(watcher.delay)
+        self.assertEqual(delays, [1, 2, 4, 4])
+        self.orders.update_values("A4", values=[[3]])
+        watcher.poll()
+        self.assertEqual(watcher.delay, 1)
+
+    def test_unchanged_version_skips_reads(self):
+        version = [1]
+        watcher = self.watcher(version_probe=lambda: version[0])
+        watcher.poll()
+        self.service.reset_stats()
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(self.service.stats["requests"], 0)
+        self.assertEqual(watcher.stats["probes_unchanged"], 1)
+
+        self.orders.update_values("A2", values=[[10]])
+        version[0] = 2
+        self.assertEqual([event.new for event in watcher.poll()], ["10"])
+
+    def test_renamed_and_removed_sheets(self):
+        watcher = self.watcher()
+        watcher.poll()
+        self.orders.change_name("Orders 2026")
+        self.spreadsheet.delete_sheet(self.spreadsheet.find_sheet_by_name("Stock").sheet_id)
+        self.orders.update_values("B2", values=[["shipped"]])
+
+        events = watcher.poll()
+        sheet_events = [event for event in events if isinstance(event, changes.SheetChange)]
+        self.assertEqual([(event.old["title"], event.new and event.new["title"]) for event in sheet_events],
+                         [("Orders", "Orders 2026"), ("Stock", None)])
+        cell_events = [event for event in events if isinstance(event, changes.CellChange)]
+        self.assertEqual([event.label for event in cell_events], ["'Orders 2026'!B2"])
+        self.assertEqual(watcher.ranges, ["'Orders 2026'!A1:B"])
+        self.assertEqual(watcher.removed_ranges, ["Stock!A1:B"])
+
+    def test_failed_auto_probe_is_dropped_with_a_warning(self):
+        watcher = self.watcher(version_probe=changes.AUTO)
+
+        def probe():
+            raise HttpError(httplib2.Response({"status": 403}), b"insufficient scopes")
+        watcher.version_probe = probe
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            watcher.poll()
+        self.assertIsNone(watcher.version_probe)
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
+        self.assertIn("drive_metadata=True", str(caught[0].message))
+
+    def test_failed_explicit_probe_raises(self):
+        def probe():
+            raise HttpError(httplib2.Response({"status": 403}), b"insufficient scopes")
+        watcher = self.watcher(version_probe=probe)
+        self.assertRaises(HttpError, watcher.poll)
+
+    def test_drive_metadata_scope(self):
+        self.assertEqual(utils._scopes(None, True), [utils.SPREADSHEETS_SCOPE, utils.DRIVE_METADATA_SCOPE])
+        self.assertEqual(utils._scopes([utils.DRIVE_METADATA_SCOPE], True), [utils.DRIVE_METADATA_SCOPE])
+        self.assertIsNone(utils._scopes(None, False))
@@ -0,0 +1,77 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Range coalescing of Sheet.batch_get_values: merge plan and slicing back of the responses
+'''
+import unittest
+
+from google_spreadsheet.coalesce import ReadPlan, covered_cells
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class ReadPlanTest(unittest.TestCase):
+    def test_merge(self):
+        plan = ReadPlan(["Sheet1!A1:A100", "Sheet1!B1:B100", "Sheet1!A1:C1"], max_waste=0.25)
+        self.assertEqual(plan.fetch_ranges, ["Sheet1!A1:C1", "Sheet1!A1:B100"])
+        self.assertEqual(plan.cells_requested, 203)
+        self.assertEqual(plan.cells_fetched, 203)
+
+        # far apart ranges and other sheets are not merged
+        plan = ReadPlan(["Sheet1!A1:B2", "Sheet1!A1:B2", "Sheet1!Z100:Z101", "Other!A1"], max_waste=0.25)
+        self.assertEqual(plan.fetch_ranges, ["Sheet1!A1:B2", "Sheet1!Z100:Z101", "Other!A1"])
+        self.assertEqual(plan.cells_requested, 11)
+        self.assertEqual(plan.cells_fetched, 7)
+
+    def test_max_waste(self):
+        ranges = ["Sheet1!A1:B2", "Sheet1!A4:B4"]
+        self.assertEqual(ReadPlan(ranges, max_waste=0).fetch_ranges, ranges)
+        self.assertEqual(ReadPlan(ranges, max_waste=0.25).fetch_ranges, ["Sheet1!A1:B4"])
+
+    def test_open_ranges(self):
+        ranges = ["Sheet1!A1:B2", "Sheet1!A:B", "bad range!!"]
+        self.assertEqual(ReadPlan(ranges).fetch_ranges, ["Sheet1!A1:B2", "Sheet1!A:B", "bad range!!"])
+        # sheets of unknown size stay as given
+        plan = ReadPlan(ranges, grid_size={"Sheet1": (10, 5)}.get)
+        self.assertEqual(plan.fetch_ranges, ["Sheet1!A1:B10", "bad range!!"])
+
+    def test_covered_cells(self):
+        self.assertEqual(covered_cells([(0, 0, 2, 2), (1, 1, 3, 3)]), 7)
+        self.assertEqual(covered_cells([(0, 0, 2, 2), (0, 0, 2, 2)]), 4)
+        self.assertEqual(covered_cells([]), 0)
+
+    def test_split(self):
+        plan = ReadPlan(["Sheet1!A1:A3", "Sheet1!B2:C3", "Other!A1", "Sheet1!C1"], max_waste=0.5)
+        self.assertEqual(plan.fetch_ranges, ["Sheet1!A1:C3", "Other!A1"])
+        response = plan.split({"spreadsheetId": "doc", "valueRanges": [
+            {"range": "Sheet1!A1:C3", "majorDimension": "ROWS", "values": [[1, 2], [3, 4, ""], [5]]},
+            {"range": "Other!A1", "majorDimension": "ROWS"},
+        ]})
+        self.assertEqual(response["spreadsheetId"], "doc")
+        self.assertEqual(response["valueRanges"], [
+            {"range": "Sheet1!A1:A3", "majorDimension": "ROWS", "values": [[1], [3], [5]]},
+            {"range": "Sheet1!B2:C3", "majorDimension": "ROWS", "values": [[4]]},
+            {"range": "Other!A1", "majorDimension": "ROWS"},
+            {"range": "Sheet1!C1", "majorDimension": "ROWS"},
+        ])
+
+
+class BatchGetValuesTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 20, 6), ("Other", 5, 5)))
+        self.spreadsheet = Client(self.service).open(file_id)
+        self.sheet = self.spreadsheet.find_sheet_by_name("Sheet1")
+        self.sheet.update_values("A1", "D4", [[row * 4 + col for col in range(4)] for row in range(4)], "RAW")
+        self.sheet.update_values("A10", "A10", [["far"]], "RAW")
+
+    def test_same_values(self):
+        ranges = ["Sheet1!A1:B2", "Sheet1!B2:D4", "Sheet1!A3", "Sheet1!A10", "Sheet1!E1:F2", "Other!A1:B2",
+                  "Sheet1!A:A"]
+        for major_dimension in ("ROWS", "COLUMNS"):
+            expected = self.sheet.batch_get_values(ranges, major_dimension, "UNFORMATTED_VALUE")
+            self.service.reset_stats()
+            response = self.sheet.batch_get_values(ranges, major_dimension, "UNFORMATTED_VALUE", max_waste=0.25)
+            self.assertEqual(response["valueRanges"], expected["valueRanges"])
+            self.assertEqual(self.service.stats["methods"], {"values.batchGet": 1})
@@ -0,0 +1,181 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Discovery document cache and shared transports of utils.spreadsheet_service, without network
+'''
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import httplib2
+
+from google_spreadsheet import utils
+
+DOCUMENT = json.dumps({"name": "sheets", "version": "v4"})
+
+
+class _FakeHttplib2(object):
+    """
+    Stand-in of the httplib2 module of utils, serving DOCUMENT or failing
+    """
+    HttpLib2Error = httplib2.HttpLib2Error
+
+    def __init__(self, status=200, content=DOCUMENT, error=None):
+        self.status = status
+        self.content = content
+        self.error = error
+        self.fetches = 0
+
+    def Http(self, timeout=None):
+        fake = self
+
+        class Http(object):
+            def request(self, url):
+                fake.fetches += 1
+                if fake.error is not None:
+                    raise fake.error
+                return httplib2.Response({"status": fake.status}), fake.content.encode("utf8")
+        return Http()
+
+
+class DiscoveryDocumentTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.httplib2 = utils.httplib2
+        self.documents = dict(utils._documents)
+        utils._documents.clear()
+
+    def tearDown(self):
+        utils.httplib2 = self.httplib2
+        utils._documents.clear()
+        utils._documents.update(self.documents)
+        shutil.rmtree(self.cache_dir)
+
+    def _fake(self, **kwargs):
+        utils.httplib2 = _FakeHttplib2(**kwargs)
+        return utils.httplib2
+
+    def _cache_file(self):
+        names = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        self.assertEqual(len(names), 1)
+        return os.path.join(self.cache_dir, names[0])
+
+    def test_memory_and_disk(self):
+        fake = self._fake()
+        self.assertEqual(utils.discovery_document(cache_dir=self.cache_dir), DOCUMENT)
+        self.assertEqual(utils.discovery_document(cache_dir=self.cache_dir), DOCUMENT)
+        self.assertEqual(fake.fetches, 1)
+        with open(self._cache_file()) as cache_file:
+            self.assertEqual(cache_file.read(), DOCUMENT)
+
+        # a new process reads the disk cache
+        utils._documents.clear()
+        self.assertEqual(utils.discovery_document(cache_dir=self.cache_dir), DOCUMENT)
+        self.assertEqual(fake.fetches, 1)
+        self.assertEqual([name for name in os.listdir(self.cache_dir) if name.startswith(".tmp-")], [])
+
+    def test_stale(self):
+        self._fake()
+        utils.discovery_document(cache_dir=self.cache_dir)
+        path = self._cache_file()
+        old = time.time() - 2 * 24 * 3600
+        os.utime(path, (old, old))
+        utils._documents.clear()
+
+        refreshed = json.dumps({"name": "sheets", "version": "v4", "revision": "2"})
+        fake = self._fake(content=refreshed)
+        self.assertEqual(utils.discovery_document(cache_dir=self.cache_dir), refreshed)
+        self.assertEqual(fake.fetches, 1)
+        with open(path) as cache_file:
+            self.assertEqual(cache_file.read(), refreshed)
+
+    def test_offline(self):
+        self._fake()
+        utils.discovery_document(cache_dir=self.cache_dir)
+        path = self._cache_file()
+        old = time.time() - 2 * 24 * 3600
+        os.utime(path, (old, old))
+
+        for kwargs in ({"error": httplib2.HttpLib2Error("offline")}, {"status": 503}, {"content": "<html>"}):
+            utils._documents.clear()
+            self._fake(**kwargs)
+            self.assertEqual(utils.discovery_document(cache_dir=self.cache_dir), DOCUMENT)
+
+        # nothing cached to fall back to
+        utils._documents.clear()
+        self._fake(status=503)
+        self.assertRaises(httplib2.HttpLib2Error, utils.discovery_document, cache_dir=None)
+
+
+class _Service(object):
+    def __init__(self, document, http):
+        self.document = document
+        self.http = http
+
+
+class SpreadsheetServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (utils.discovery_document, utils._shared_credentials, utils.build_from_document,
+                      dict(utils._services), dict(utils._shared_http))
+        self.authorized = []
+        utils.discovery_document = lambda *args: DOCUMENT
+        utils._shared_credentials = lambda on_gce, key_file_location, scopes, token_cache: "credentials"
+        utils.build_from_document = _Service
+        utils._services.clear()
+        utils._shared_http.clear()
+        self.authorize = utils._authorize
+
+        def authorize(credentials, token_cache):
+            http = object()
+            self.authorized.append(http)
+            return http
+        utils._authorize = authorize
+
+    def tearDown(self):
+        (utils.discovery_document, utils._shared_credentials, utils.build_from_document,
+         services, shared_http) = self.saved
+        utils._authorize = self.authorize
+        utils._services.clear()
+        utils._services.update(services)
+        utils._shared_http.clear()
+        utils._shared_http.update(shared_http)
+
+    def test_transport(self):
+        first = utils.spreadsheet_service()
+        second = utils.spreadsheet_service()
+        self.assertEqual(first.document, DOCUMENT)
+        self.assertIsNot(first.http, second.http)
+
+        first = utils.spreadsheet_service(transport="shared")
+        second = utils.spreadsheet_service(transport="shared")
+        self.assertIsNot(first, second)
+        self.assertIs(first.http, second.http)
+        self.assertIsNot(utils.spreadsheet_service(key_file_location="other.json", transport="shared").http,
+                         first.http)
+        self.assertRaises(ValueError, utils.spreadsheet_service, transport="pool")
+
+    def test_cached(self):
+        service = utils.spreadsheet_service(cached=True)
+        self.assertIs(utils.spreadsheet_service(cached=True), service)
+        self.assertIsNot(utils.spreadsheet_service(cached=True, transport="thread"), service)
+        self.assertIsNot(utils.spreadsheet_service(), service)
+
+    def test_thread_local(self):
+        service = utils.spreadsheet_service(transport="thread")
+        self.assertIsInstance(service.http, utils.ThreadLocalHttp)
+        self.assertEqual(self.authorized, [])
+
+        https = []
+        https.append(service.http.http)
+        https.append(service.http.http)
+        thread = threading.Thread(target=lambda: https.append(service.http.http))
+        thread.start()
+        thread.join()
+        self.assertIs(https[0], https[1])
+        self.assertIsNot(https[0], https[2])
+        self.assertEqual(self.authorized, [https[0], https[2]])
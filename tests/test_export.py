@@ -0,0 +1,126 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Streaming export of sheets to CSV, Parquet and Arrow files
+'''
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from google_spreadsheet import writers
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class WritersTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_names(self):
+        self.assertEqual(writers.file_name(u"Q1/Q2: sales", writers.PARQUET), u"Q1_Q2_ sales.parquet")
+        self.assertEqual(writers.file_name(u"..", writers.CSV), u"sheet.csv")
+        self.assertEqual(writers.path_format("a/b.ARROW"), writers.ARROW)
+        self.assertEqual(writers.path_format("b.txt"), writers.CSV)
+        self.assertRaises(ValueError, writers.writer, os.path.join(self.directory, "a.xlsx"), "xlsx")
+
+    def test_csv(self):
+        path = os.path.join(self.directory, "out.csv")
+        with writers.writer(path) as output:
+            output.write([[u"a", u"b,c"], [1, 2.5]])
+            self.assertTrue(os.path.exists(path + writers.PART_SUFFIX))
+            self.assertFalse(os.path.exists(path))
+            output.write([[], [u"café", True]])
+        self.assertEqual(os.listdir(self.directory), ["out.csv"])
+        with io.open(path, encoding="utf8") as csv_file:
+            self.assertEqual(csv_file.read(), u'a,"b,c"\n1,2.5\n\ncafé,True\n')
+
+    def test_abort(self):
+        path = os.path.join(self.directory, "out.csv")
+        try:
+            with writers.writer(path) as output:
+                output.write([[1]])
+                raise KeyError("failed fetch")
+        except KeyError:
+            pass
+        self.assertEqual(os.listdir(self.directory), [])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_schema(self):
+        schema = writers.infer_schema([[1, u"x", True], [2.5, 3, False, u""]], [u"n", u"n"])
+        self.assertEqual(schema.names, [u"n", u"n_2", u"C", u"D"])
+        self.assertEqual([str(field.type) for field in schema], ["double", "string", "bool", "string"])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_dropped_cells(self):
+        path = os.path.join(self.directory, "out.arrow")
+        with writers.writer(path, writers.ARROW) as output:
+            output.write([[u"price", u"ok"], [1.5, True]])
+            # text in a float64 column and cells beyond the schema
+            output.write([[u"n/a", False, u"extra"], [2]])
+        self.assertEqual(output.dropped_cells, 2)
+        table = pyarrow.ipc.open_file(path).read_all()
+        self.assertEqual(table.to_pydict(), {u"price": [1.5, None, 2.0], u"ok": [True, False, None]})
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Orders", 30, 3), ("Q1/Q2", 5, 2), ("Q1:Q2", 5, 2)))
+        self.spreadsheet = Client(self.service).open(file_id)
+        self.sheet = self.spreadsheet.find_sheet_by_name("Orders")
+        self.sheet.update_values("A1", "C1", [["id", "item", "price"]], "RAW")
+        self.sheet.update_values("A2", "C3", [[1, "pen", 1.5], [2, "ink", 3]], "RAW")
+        # empty rows 4 to 11 and trailing empty rows after row 12
+        self.sheet.update_values("A12", "C12", [[11, "pad", 2]], "RAW")
+        self.service.reset_stats()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_csv(self):
+        path = os.path.join(self.directory, "orders.csv")
+        stats = self.sheet.export(path, chunk_rows=5)
+        self.assertEqual(stats, {"rows": 12, "requests": 6, "dropped_cells": 0})
+        self.assertEqual(self.service.stats["methods"], {"values.batchGet": 6})
+        with io.open(path, encoding="utf8") as csv_file:
+            lines = csv_file.read().split(u"\n")
+        self.assertEqual(lines[:3], [u"id,item,price", u"1,pen,1.5", u"2,ink,3"])
+        self.assertEqual(lines[3:11], [u""] * 8)
+        self.assertEqual(lines[11:], [u"11,pad,2", u""])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        path = os.path.join(self.directory, "orders.parquet")
+        stats = self.sheet.export(path, writers.PARQUET, chunk_rows=5)
+        self.assertEqual(stats["rows"], 12)
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.assertGreater(parquet_file.num_row_groups, 1)
+        table = parquet_file.read().to_pydict()
+        self.assertEqual(table[u"id"][:2], [1.0, 2.0])
+        self.assertEqual(table[u"item"][-1], u"pad")
+        self.assertEqual(len(table[u"price"]), 11)
+
+    def test_export_all(self):
+        paths = self.spreadsheet.export_all(self.directory)
+        self.assertEqual(paths, {
+            u"Orders": os.path.join(self.directory, u"Orders.csv"),
+            u"Q1/Q2": os.path.join(self.directory, u"Q1_Q2.csv"),
+            u"Q1:Q2": os.path.join(self.directory, u"Q1_Q2_2.csv"),
+        })
+        self.assertEqual(sorted(os.listdir(self.directory)), [u"Orders.csv", u"Q1_Q2.csv", u"Q1_Q2_2.csv"])
+        with io.open(paths[u"Q1:Q2"], encoding="utf8") as csv_file:
+            self.assertEqual(csv_file.read(), u"")
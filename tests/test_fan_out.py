@@ -0,0 +1,67 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Client.open_many and values_get_many: thread-pool fan-out, results in order, errors in place
+'''
+import threading
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.models import Client, Spreadsheet
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class _PeakService(FakeSheetsService):
+    """
+    Fake service recording the peak count of calls in flight
+    """
+    def __init__(self, *args, **kwargs):
+        super(_PeakService, self).__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.peak = 0
+        self._peak_lock = threading.Lock()
+
+    def _call(self, method, request_bytes, handler):
+        with self._peak_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super(_PeakService, self)._call(method, request_bytes, handler)
+        finally:
+            with self._peak_lock:
+                self.in_flight -= 1
+
+
+class FanOutTest(unittest.TestCase):
+    def setUp(self):
+        self.service = _PeakService(latency=0.02)
+        self.file_ids = [self.service.add_spreadsheet("Doc {}".format(i)) for i in range(6)]
+        for file_id in self.file_ids:
+            self.service.spreadsheets().values().update(spreadsheetId=file_id, range="Sheet1!A1",
+                                                        valueInputOption="RAW",
+                                                        body={"values": [[file_id]]}).execute()
+        self.service.peak = 0
+
+    def test_open_many(self):
+        client = Client(self.service, http_factory=lambda: None)
+        spreadsheets = client.open_many(self.file_ids + ["missing"], workers=4)
+        self.assertEqual([spreadsheet.file_id for spreadsheet in spreadsheets[:-1]], self.file_ids)
+        self.assertTrue(all(isinstance(spreadsheet, Spreadsheet) for spreadsheet in spreadsheets[:-1]))
+        self.assertIsInstance(spreadsheets[-1], exceptions.NotFound)
+        self.assertTrue(1 < self.service.peak <= 4)
+
+    def test_values_get_many(self):
+        client = Client(self.service, http_factory=lambda: None)
+        items = [(file_id, "Sheet1!A1") for file_id in self.file_ids] + [(self.file_ids[0], "Missing!A1")]
+        responses = client.values_get_many(items, workers=8, valueRenderOption="UNFORMATTED_VALUE")
+        self.assertEqual([response["values"] for response in responses[:-1]],
+                         [[[file_id]] for file_id in self.file_ids])
+        self.assertIsInstance(responses[-1], exceptions.BadRequest)
+        self.assertTrue(1 < self.service.peak <= 7)
+
+    def test_serial_without_http_factory(self):
+        responses = Client(self.service).values_get_many([(file_id, "Sheet1!A1") for file_id in self.file_ids])
+        self.assertEqual(len(responses), 6)
+        self.assertEqual(self.service.peak, 1)
+        self.assertEqual(Client(self.service).open_many([]), [])
@@ -0,0 +1,125 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Formatting planner: rectangle tiling and repeatCell/updateCells requests
+'''
+import random
+import unittest
+
+from google_spreadsheet.formatting import fields_mask, plan_formats, rectangles
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+RED = {"textFormat": {"foregroundColor": {"red": 1}}}
+BLUE = {"textFormat": {"foregroundColor": {"blue": 1}}}
+BOLD = {"textFormat": {"bold": True}}
+PERCENT = {"numberFormat": {"type": "PERCENT", "pattern": "0.0%"}}
+
+
+def _apply(requests):
+    """
+    Cells written by requests: (row, col) -> (userEnteredFormat, fields mask)
+    """
+    cells = {}
+    for request in requests:
+        kind, = request
+        body = request[kind]
+        grid = body["range"]
+        for row in range(grid["startRowIndex"], grid["endRowIndex"]):
+            for col in range(grid["startColumnIndex"], grid["endColumnIndex"]):
+                if kind == "repeatCell":
+                    cell = body["cell"]
+                else:
+                    cell = body["rows"][row - grid["startRowIndex"]]["values"][col - grid["startColumnIndex"]]
+                assert (row, col) not in cells, "cell written twice"
+                cells[row, col] = (cell["userEnteredFormat"], body["fields"])
+    return cells
+
+
+class FieldsMaskTest(unittest.TestCase):
+    def test_mask(self):
+        self.assertEqual(fields_mask(RED), "userEnteredFormat.textFormat.foregroundColor")
+        self.assertEqual(fields_mask(dict(PERCENT, textFormat={"bold": True, "italic": False})),
+                         "userEnteredFormat.numberFormat,userEnteredFormat.textFormat.bold,"
+                         "userEnteredFormat.textFormat.italic")
+        self.assertEqual(fields_mask({}), "")
+
+
+class RectanglesTest(unittest.TestCase):
+    def test_tiles(self):
+        cells = {(0, 0): "a", (0, 1): "a", (1, 0): "a", (1, 1): "a", (2, 0): "b", (0, 3): "a"}
+        self.assertEqual(rectangles(cells), [(0, 0, 2, 2, "a"), (0, 3, 1, 4, "a"), (2, 0, 3, 1, "b")])
+
+    def test_gap_rows(self):
+        # identical runs separated by a row are not merged
+        self.assertEqual(rectangles({(0, 0): "a", (2, 0): "a"}), [(0, 0, 1, 1, "a"), (2, 0, 3, 1, "a")])
+        self.assertEqual(rectangles({}), [])
+
+    def test_cover(self):
+        generator = random.Random(7)
+        cells = dict(((row, col), generator.choice("ab"))
+                     for row in range(12) for col in range(9) if generator.random() < 0.8)
+        covered = {}
+        for row_start, col_start, row_end, col_end, value in rectangles(cells):
+            for row in range(row_start, row_end):
+                for col in range(col_start, col_end):
+                    self.assertNotIn((row, col), covered)
+                    covered[row, col] = value
+        self.assertEqual(covered, cells)
+
+
+class PlanFormatsTest(unittest.TestCase):
+    def test_uniform_block(self):
+        formats = dict(((row, col), RED) for row in range(100) for col in range(2, 4))
+        requests = plan_formats(7, formats)
+        self.assertEqual(requests, [{"repeatCell": {
+            "range": {"sheetId": 7, "startRowIndex": 0, "endRowIndex": 100, "startColumnIndex": 2,
+                      "endColumnIndex": 4},
+            "cell": {"userEnteredFormat": RED},
+            "fields": "userEnteredFormat.textFormat.foregroundColor",
+        }}])
+
+    def test_mixed_block(self):
+        # a checkerboard of formats with the same mask is one updateCells
+        formats = dict(((row, col), RED if (row + col) % 2 else BLUE) for row in range(10) for col in range(10))
+        requests = plan_formats(0, formats)
+        self.assertEqual([list(request) for request in requests], [["updateCells"]])
+        self.assertEqual(requests[0]["updateCells"]["fields"], "userEnteredFormat.textFormat.foregroundColor")
+        cells = _apply(requests)
+        self.assertEqual(dict((cell, cells[cell][0]) for cell in cells), formats)
+
+    def test_masks(self):
+        # cells of different masks are never written by the same request
+        formats = {"A1": PERCENT, "B1": PERCENT, "A2": RED, (1, 1): RED, "C3": BOLD}
+        cells = _apply(plan_formats(0, formats))
+        self.assertEqual(cells, {
+            (0, 0): (PERCENT, "userEnteredFormat.numberFormat"),
+            (0, 1): (PERCENT, "userEnteredFormat.numberFormat"),
+            (1, 0): (RED, "userEnteredFormat.textFormat.foregroundColor"),
+            (1, 1): (RED, "userEnteredFormat.textFormat.foregroundColor"),
+            (2, 2): (BOLD, "userEnteredFormat.textFormat.bold"),
+        })
+        self.assertEqual(len(plan_formats(0, formats)), 3)
+        self.assertEqual(plan_formats(0, {}), [])
+
+    def test_random(self):
+        generator = random.Random(11)
+        choices = [RED, dict(RED), BLUE, PERCENT]
+        formats = dict(((row, col), generator.choice(choices))
+                       for row in range(30) for col in range(8) if generator.random() < 0.9)
+        requests = plan_formats(0, formats)
+        cells = _apply(requests)
+        self.assertEqual(dict((cell, cells[cell][0]) for cell in cells), formats)
+        self.assertTrue(all(mask == fields_mask(formats[cell]) for cell, (_, mask) in cells.items()))
+        self.assertLess(len(requests), len(formats))
+
+
+class FormatCellsTest(unittest.TestCase):
+    def test_one_batch_update(self):
+        service = FakeSheetsService()
+        file_id = service.add_spreadsheet("Doc", (("Sheet1", 50, 5),))
+        sheet = Client(service).open(file_id).find_sheet_by_name("Sheet1")
+        service.reset_stats()
+        sheet.format_cells(dict(((row, 0), RED) for row in range(50)))
+        self.assertEqual(service.stats["methods"], {"spreadsheets.batchUpdate": 1})
@@ -0,0 +1,89 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Values responses to arrays and DataFrames, and DataFrames back to values rows
+'''
+import json
+import unittest
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    pandas = None
+
+from google_spreadsheet import frames
+
+
+@unittest.skipIf(pandas is None, "requires numpy and pandas")
+class DecodeTest(unittest.TestCase):
+    def test_pad_values(self):
+        array = frames.pad_values([["a", "b"], [], ["c"]])
+        self.assertEqual(array.tolist(), [["a", "b"], ["", ""], ["c", ""]])
+        self.assertEqual(frames.pad_values([["a", "b", "c"]], width=2).tolist(), [["a", "b"]])
+        self.assertEqual(frames.pad_values([]).shape, (0, 0))
+
+    def test_infer_column(self):
+        def infer(cells):
+            return frames.infer_column(numpy.array(cells, dtype=object))
+
+        self.assertEqual(infer([1, 2]).dtype, numpy.int64)
+        self.assertEqual(infer([1, 2.5]).dtype, numpy.float64)
+        column = infer([1, ""])
+        self.assertEqual(column.dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(column[1]))
+        self.assertEqual(infer([True, False]).dtype, bool)
+        # empty cells in a bool column or text: kept as is
+        self.assertEqual(infer([True, ""]).dtype, object)
+        self.assertEqual(infer([1, "a"]).dtype, object)
+
+    def test_serial_to_datetime(self):
+        dates = frames.serial_to_datetime([0, 45000.5, numpy.nan])
+        self.assertEqual(str(dates[0]), "1899-12-30T00:00:00.000")
+        self.assertEqual(str(dates[1]), "2023-03-15T12:00:00.000")
+        self.assertTrue(numpy.isnat(dates[2]))
+
+    def test_values_to_frame(self):
+        values = [["id", "price", "day"], [1, 2.5, 45000], [2, "", 45001], [3, 4]]
+        frame = frames.values_to_frame(values, date_columns=["day"])
+        self.assertEqual(list(frame.columns), ["id", "price", "day"])
+        self.assertEqual(frame["id"].dtype, numpy.int64)
+        self.assertEqual(frame["price"].isna().tolist(), [False, True, False])
+        self.assertEqual(frame["day"].dtype.kind, "M")
+        self.assertTrue(pandas.isna(frame["day"][2]))
+
+    def test_values_to_frame_without_header(self):
+        frame = frames.values_to_frame([["a", 1], ["b"]], header=False)
+        self.assertEqual(list(frame.columns), [0, 1])
+        self.assertEqual(frame[0].tolist(), ["a", "b"])
+
+
+@unittest.skipIf(pandas is None, "requires numpy and pandas")
+class EncodeTest(unittest.TestCase):
+    def test_native_types(self):
+        frame = pandas.DataFrame({"n": [1, 2], "x": [0.5, numpy.nan], "s": ["a", None], "b": [True, False]})
+        rows = list(frames.frame_to_values(frame))
+        self.assertEqual(rows, [["n", "x", "s", "b"], [1, 0.5, "a", True], [2, "", "", False]])
+        self.assertEqual([type(cell) for cell in rows[1]], [int, float, str, bool])
+        json.dumps(rows)
+
+    def test_nullable_columns(self):
+        frame = pandas.DataFrame({
+            "i": pandas.array([1, None, 3], dtype="Int64"),
+            "u": pandas.array([7, 8, 9], dtype="UInt8"),
+            "b": pandas.array([True, None, False], dtype="boolean"),
+        })
+        rows = list(frames.frame_to_values(frame, header=False))
+        self.assertEqual(rows, [[1, 7, True], ["", 8, ""], [3, 9, False]])
+        self.assertEqual([type(cell) for cell in rows[0]], [int, int, bool])
+
+    def test_dates_and_index(self):
+        frame = pandas.DataFrame({"day": pandas.to_datetime(["2026-10-17 08:30", None])},
+                                 index=pandas.Index(["x", "y"], name="key"))
+        rows = list(frames.frame_to_values(frame, index=True, date_format="%Y-%m-%d %H:%M"))
+        self.assertEqual(rows, [["key", "day"], ["x", "2026-10-17 08:30"], ["y", ""]])
+
+    def test_round_trip(self):
+        values = [["id", "price"], [1, 2.5], [2, 3.0]]
+        self.assertEqual(list(frames.frame_to_values(frames.values_to_frame(values))), values)
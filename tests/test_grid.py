@@ -0,0 +1,80 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+ValueGrid: typed columns, ragged rows, views sharing the storage
+'''
+import unittest
+from array import array
+
+from google_spreadsheet.grid import ValueGrid
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+VALUES = [
+    ["id", "name", "price"],
+    [1, "apple", 1.5],
+    [2, "pear"],
+    [3, "apple", 2],
+    [],
+]
+
+
+class ValueGridTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = ValueGrid(VALUES[1:], "Sheet1!A2:C5", "ROWS")
+
+    def test_cells(self):
+        self.assertEqual(self.grid.shape, (4, 3))
+        self.assertEqual(len(self.grid), 4)
+        self.assertEqual(self.grid[0, 1], "apple")
+        self.assertEqual(self.grid[-2, 2], 2)
+        # missing cells of short rows
+        self.assertEqual(self.grid[1, 2], "")
+        self.assertEqual(self.grid[3, 0], "")
+        self.assertRaises(IndexError, self.grid.__getitem__, (4, 0))
+        self.assertRaises(IndexError, self.grid.__getitem__, (0, 3))
+
+    def test_storage(self):
+        columns = self.grid._storage.columns
+        self.assertIsInstance(columns[0], array)
+        self.assertEqual(columns[0].typecode in ("q", "l"), True)
+        self.assertEqual(columns[2].typecode, "d")
+        # repeated strings are stored once
+        self.assertIs(columns[1][0], columns[1][2])
+        self.assertEqual(ValueGrid([[True], [False]])._storage.columns[0], [True, False])
+
+    def test_rows(self):
+        self.assertEqual(self.grid.to_list(), [[1, "apple", 1.5], [2, "pear"], [3, "apple", 2.0], []])
+        self.assertEqual(self.grid.to_list(pad=True)[1], [2, "pear", ""])
+        self.assertEqual(list(self.grid)[0], [1, "apple", 1.5])
+
+    def test_views(self):
+        view = self.grid[1:3, 1:]
+        self.assertEqual(view.shape, (2, 2))
+        self.assertIs(view._storage, self.grid._storage)
+        self.assertEqual(view.to_list(), [["pear"], ["apple", 2.0]])
+        self.assertEqual(view[1, 1], 2.0)
+        self.assertEqual(self.grid[2].to_list(), [[3, "apple", 2.0]])
+        self.assertEqual(self.grid[:, 0].to_list(), [[1], [2], [3], []])
+        self.assertEqual(self.grid[5:].shape, (0, 3))
+        self.assertRaises(ValueError, self.grid.__getitem__, slice(0, 4, 2))
+
+    def test_column(self):
+        self.assertEqual(list(self.grid[:3].column(0)), [1, 2, 3])
+        self.assertEqual(list(self.grid.column(2)), [1.5, "", 2.0, ""])
+        self.assertEqual(list(self.grid[:1].column(-1)), [1.5])
+
+    def test_empty(self):
+        grid = ValueGrid()
+        self.assertEqual(grid.shape, (0, 0))
+        self.assertEqual(grid.to_list(), [])
+
+    def test_from_sheet(self):
+        service = FakeSheetsService()
+        file_id = service.add_spreadsheet("Doc", (("Sheet1", 10, 3),))
+        sheet = Client(service).open(file_id).find_sheet_by_name("Sheet1")
+        sheet.update_values("A1", "C4", [row + [""] * (3 - len(row)) for row in VALUES[:4]], "RAW")
+        grid = ValueGrid.from_response(sheet.get_values("A1", "C5", value_render_option="UNFORMATTED_VALUE"))
+        self.assertEqual(grid.range, "Sheet1!A1:C5")
+        self.assertEqual(grid[1:].to_list(), [[1, "apple", 1.5], [2, "pear"], [3, "apple", 2]])
@@ -0,0 +1,71 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Instrumentation: per-method metrics of a client, raw response sizes, quota units
+'''
+import json
+import unittest
+
+from google_spreadsheet import instrumentation
+from google_spreadsheet.models import Client
+from google_spreadsheet.throttle import RetryPolicy
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class MeasureResponseTest(unittest.TestCase):
+    def test_raw_body_length(self):
+        try:
+            from googleapiclient.http import HttpMockSequence, HttpRequest
+        except ImportError:
+            self.skipTest("googleapiclient.http not available")
+        content = b'{"range": "Sheet1!A1", "values": [["a"]]}'
+        http = HttpMockSequence([({"status": "200"}, content)])
+        request = HttpRequest(http, lambda response, body: json.loads(body.decode("utf8")),
+                              "https://sheets.googleapis.com/v4/spreadsheets/x/values/Sheet1!A1")
+        record = instrumentation.CallRecord("values.get")
+        instrumentation.measure_response(request, record)
+        self.assertEqual(request.execute()["values"], [["a"]])
+        self.assertEqual(record.response_bytes, len(content))
+
+
+class MetricsAggregatorTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 10, 3),))
+        self.client = Client(self.service, retry=RetryPolicy(base_delay=0, jitter=False))
+
+    def test_methods_and_bytes(self):
+        with instrumentation.measure(self.client) as metrics:
+            self.client.values_update(self.file_id, "Sheet1!A1:B1", [["a", "b"]])
+            self.client.values_get(self.file_id, "Sheet1!A1:B1")
+            self.client.values_batch_get(self.file_id, ["Sheet1!A1", "Sheet1!B1"])
+        self.assertEqual(self.client.instruments, [])
+
+        summary = metrics.summary()
+        self.assertEqual(sorted(summary["methods"]), ["values.batchGet", "values.get", "values.update"])
+        self.assertEqual(summary["methods"]["values.batchGet"]["ranges"], 2)
+        self.assertEqual(summary["totals"]["calls"], 3)
+        self.assertEqual(summary["totals"]["response_bytes"], self.service.stats["response_bytes"])
+        self.assertEqual(summary["totals"]["request_bytes"], self.service.stats["request_bytes"])
+        self.assertEqual(summary["quota_units"], {"read": 2, "write": 1})
+        self.assertIn("values.batchGet", metrics.report())
+
+    def test_retries_and_errors(self):
+        self.service.fail_next(429, count=2, retry_after=0)
+        with instrumentation.measure(self.client) as metrics:
+            self.client.values_get(self.file_id, "Sheet1!A1")
+            self.service.fail_next(404)
+            self.assertRaises(Exception, self.client.values_get, self.file_id, "Sheet1!A1")
+        metrics = metrics.summary()["methods"]["values.get"]
+        self.assertEqual((metrics["calls"], metrics["retries"], metrics["errors"]), (2, 2, 1))
+
+    def test_percentile(self):
+        metrics = instrumentation.MethodMetrics()
+        self.assertIsNone(metrics.percentile(50))
+        for latency in (0.005, 0.005, 0.005, 0.2):
+            record = instrumentation.CallRecord("values.get")
+            record.latency = latency
+            metrics.add(record)
+        self.assertEqual(metrics.percentile(50), 0.01)
+        self.assertEqual(metrics.percentile(95), 0.25)
@@ -0,0 +1,45 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Sheet.iter_rows: rows streamed in windows, several windows per values.batchGet
+'''
+import unittest
+
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class IterRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Data", 30, 4),))
+        self.sheet = Client(self.service).open(file_id).find_sheet_by_name("Data")
+        # rows 0-24, rows 5 and 6 empty, trailing empty rows 25-29
+        self.rows = [[str(i), i * 2] if i not in (5, 6) else [] for i in range(25)]
+        self.sheet.update_values("A1", "B25", [row or ["", ""] for row in self.rows],
+                                 value_input_option="RAW")
+        self.service.reset_stats()
+
+    def batch_gets(self):
+        return self.service.stats["methods"].get("values.batchGet", 0)
+
+    def test_all_rows(self):
+        rows = list(self.sheet.iter_rows(chunk_rows=4, windows_per_request=2,
+                                         value_render_option="UNFORMATTED_VALUE"))
+        self.assertEqual(rows, self.rows)
+        # 8 windows of 4 rows, 2 per request
+        self.assertEqual(self.batch_gets(), 4)
+
+    def test_empty_rows_between_windows(self):
+        # empty rows 5 and 6 open the second window, they are only yielded once followed by a row
+        rows = list(self.sheet.iter_rows(chunk_rows=5, windows_per_request=1))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[5:8], [[], [], ["7", "14"]])
+        self.assertEqual(self.batch_gets(), 6)
+
+    def test_bounds(self):
+        rows = list(self.sheet.iter_rows(chunk_rows=3, start_row_index=3, end_row_index=9, start_col_index=1))
+        self.assertEqual(rows, [["6"], ["8"], [], [], ["14"], ["16"]])
+        self.assertEqual(list(self.sheet.iter_rows(start_row_index=10, end_row_index=10)), [])
+        self.assertEqual(list(self.sheet.iter_rows(start_row_index=26)), [])
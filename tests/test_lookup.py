@@ -0,0 +1,60 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Sheet lookup indexes of Spreadsheet: kept up to date by local writes, without re-fetching
+'''
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class LookupTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("First", 10, 3), ("Second", 10, 3), ("Third", 10, 3)))
+        self.spreadsheet = Client(self.service).open(file_id)
+        self.service.reset_stats()
+
+    def names(self, sheets):
+        return [sheet.name for sheet in sheets]
+
+    def test_by_id_name_and_index(self):
+        self.assertEqual(self.spreadsheet.find_sheet_by_id(1).name, "Second")
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("Third").sheet_id, 2)
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(-1).name, "Third")
+        self.assertEqual(self.names(self.spreadsheet.find_sheets(names=["Third", "First"])), ["Third", "First"])
+        self.assertEqual(self.names(self.spreadsheet.find_sheets(ids=[1])), ["Second"])
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_id, 9)
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheets, names=["First", "Missing"])
+        self.assertRaises(ValueError, self.spreadsheet.find_sheet_by, "title", "First")
+        self.assertEqual(self.service.stats["requests"], 0)
+
+    def test_renamed_sheet(self):
+        self.spreadsheet.find_sheet_by_name("First").change_name("Renamed")
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("Renamed").sheet_id, 0)
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_name, "First")
+
+        # a title freed by a rename can be taken by another sheet
+        self.spreadsheet.find_sheet_by_name("Second").change_name("First")
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("First").sheet_id, 1)
+        self.assertEqual(self.service.stats["methods"].get("spreadsheets.get", 0), 0)
+
+    def test_hidden_sheet(self):
+        second = self.spreadsheet.find_sheet_by_name("Second")
+        self.spreadsheet.batch_update([second.update_properties_request({"sheetId": 1, "hidden": True}, "hidden")])
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_name, "Second")
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("Second", include_hidden=True).sheet_id, 1)
+        # visible positions skip the hidden sheet
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(1).name, "Third")
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(1, include_hidden=True).name, "Second")
+
+    def test_added_and_deleted_sheets(self):
+        self.spreadsheet.add_sheet("Fourth", 5, 5)
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(3).name, "Fourth")
+        self.spreadsheet.delete_sheet(0)
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_id, 0)
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(0).name, "Second")
+        self.assertEqual(self.service.stats["methods"].get("spreadsheets.get", 0), 0)
@@ -0,0 +1,76 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Local reconciliation of spreadsheet details with batchUpdate replies
+'''
+import unittest
+
+from google_spreadsheet import exceptions, metadata
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+def _properties(details):
+    return [sheet["properties"] for sheet in details["sheets"]]
+
+
+class ApplyRepliesTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_id = self.service.add_spreadsheet("Doc", (("First", 10, 3), ("Second", 10, 3)))
+        self.client = Client(self.service)
+        self.spreadsheet = self.client.open(self.file_id)
+        self.service.reset_stats()
+
+    def assert_in_sync(self):
+        # no re-fetch was needed, and local details match the server
+        self.assertNotIn("spreadsheets.get", self.service.stats["methods"])
+        self.assertFalse(self.spreadsheet.stale)
+        self.assertEqual(_properties(self.spreadsheet.details), _properties(self.client.open(self.file_id).details))
+        self.service.reset_stats()
+
+    def test_add_sheet(self):
+        sheet = self.spreadsheet.add_sheet("Third", 5, 2)
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("Third").sheet_id, sheet.sheet_id)
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(2).name, "Third")
+        self.assert_in_sync()
+
+    def test_rename_and_resize(self):
+        sheet = self.spreadsheet.find_sheet_by_name("First")
+        sheet.change_name("Renamed")
+        sheet.resize(20, 4)
+        self.assertEqual(sheet.name, "Renamed")
+        self.assertEqual((sheet.row_count, sheet.col_count), (20, 4))
+        self.assertEqual(self.spreadsheet.find_sheet_by_name("Renamed").sheet_id, sheet.sheet_id)
+        self.assertRaises(exceptions.NotFound, self.spreadsheet.find_sheet_by_name, "First")
+        self.assert_in_sync()
+
+    def test_delete_sheet_renumbers(self):
+        self.spreadsheet.delete_sheet(self.spreadsheet.find_sheet_by_name("First").sheet_id)
+        self.assertEqual(self.spreadsheet.find_sheet_by_index(0).name, "Second")
+        self.assert_in_sync()
+
+    def test_batch_session(self):
+        with self.spreadsheet.batch():
+            self.spreadsheet.add_sheet("Third")
+            self.spreadsheet.change_title("Renamed doc")
+        self.assertEqual(self.service.stats["methods"], {"spreadsheets.batchUpdate": 1})
+        self.assertEqual(self.spreadsheet.title, "Renamed doc")
+        self.assert_in_sync()
+
+    def test_move_sheet(self):
+        self.spreadsheet.add_sheet("Third")
+        for name, index in (("First", 2), ("First", 3), ("Third", 0), ("Second", 1)):
+            sheet = self.spreadsheet.find_sheet_by_name(name)
+            request = sheet.update_properties_request({"sheetId": sheet.sheet_id, "index": index}, "index")
+            self.spreadsheet.batch_update([request])
+            self.assert_in_sync()
+        self.assertEqual([sheet["properties"]["title"] for sheet in self.spreadsheet.all_sheets()],
+                         ["Third", "Second", "First"])
+
+    def test_unknown_request_is_not_applied(self):
+        details = self.spreadsheet.details
+        self.assertFalse(metadata.apply_replies(details, [{"unknownRequest": {}}], [{}]))
+        self.spreadsheet.apply_replies([{"unknownRequest": {}}], [{}])
+        self.assertTrue(self.spreadsheet.stale)
@@ -0,0 +1,77 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Client.open with field masks and sheet subsets: missing details are fetched on demand, once
+'''
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.constants import SpreadsheetFields
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class SelectiveOpenTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_id = self.service.add_spreadsheet("Doc", (("First", 10, 3), ("Second", 10, 3), ("Third", 10, 3)))
+        self.service.spreadsheets().values().update(spreadsheetId=self.file_id, range="Second!A1:B1",
+                                                    valueInputOption="RAW", body={"values": [[1, 2]]}).execute()
+        self.client = Client(self.service)
+        self.service.reset_stats()
+
+    def gets(self):
+        return self.service.stats["methods"].get("spreadsheets.get", 0)
+
+    def test_field_mask(self):
+        spreadsheet = self.client.open(self.file_id, fields="sheets.properties(sheetId,title,index)")
+        self.assertTrue(spreadsheet.partial)
+        self.assertNotIn("properties", spreadsheet.details)
+        self.assertEqual(spreadsheet.find_sheet_by_name("Second").sheet_id, 1)
+        self.assertEqual(self.gets(), 1)
+
+        # properties.title is fetched on first access, and merged
+        self.assertEqual(spreadsheet.title, "Doc")
+        self.assertEqual(spreadsheet.title, "Doc")
+        self.assertEqual(self.gets(), 2)
+        self.assertEqual(len(spreadsheet.all_sheets()), 3)
+
+    def test_get_detail_fetches_once(self):
+        spreadsheet = self.client.open(self.file_id, fields=SpreadsheetFields.SHEET_PROPERTIES)
+        self.assertEqual(spreadsheet.get_detail("spreadsheetUrl"),
+                         "https://docs.google.com/spreadsheets/d/{}/edit".format(self.file_id))
+        self.assertIsNone(spreadsheet.get_detail("namedRanges"))
+        self.assertIsNone(spreadsheet.get_detail("namedRanges"))
+        self.assertEqual(self.gets(), 3)
+
+    def test_sheet_subset(self):
+        spreadsheet = self.client.open(self.file_id, ranges=["Second"])
+        self.assertEqual([sheet["properties"]["title"] for sheet in spreadsheet.details["sheets"]], ["Second"])
+        self.assertEqual(spreadsheet.find_sheet_by_name("Second").row_count, 10)
+        self.assertEqual(self.gets(), 1)
+
+        # outside of the subset: fetched, then found locally
+        self.assertEqual(spreadsheet.find_sheet_by_name("Third").sheet_id, 2)
+        self.assertEqual(spreadsheet.find_sheet_by_name("Third").sheet_id, 2)
+        self.assertEqual(self.gets(), 2)
+        self.assertRaises(exceptions.NotFound, spreadsheet.find_sheet_by_name, "Missing")
+
+    def test_positions_of_a_subset(self):
+        spreadsheet = self.client.open(self.file_id, ranges=["Third"])
+        # index 0 of the spreadsheet, not of the loaded subset
+        self.assertEqual(spreadsheet.find_sheet_by_index(0).name, "First")
+        self.assertEqual([sheet["properties"]["title"] for sheet in spreadsheet.all_sheets()],
+                         ["First", "Second", "Third"])
+
+    def test_grid_data(self):
+        spreadsheet = self.client.open(self.file_id, ranges=["Second!A1:B1"], include_grid_data=True)
+        data = spreadsheet.details["sheets"][0]["data"][0]
+        cells = [cell["effectiveValue"]["numberValue"] for cell in data["rowData"][0]["values"]]
+        self.assertEqual(cells, [1, 2])
+
+    def test_refresh_keeps_mask_and_ranges(self):
+        spreadsheet = self.client.open(self.file_id, fields=SpreadsheetFields.SHEET_PROPERTIES, ranges=["First"])
+        spreadsheet.refresh()
+        self.assertEqual([sheet["properties"]["title"] for sheet in spreadsheet.details["sheets"]], ["First"])
+        self.assertEqual(set(spreadsheet.details), set(["spreadsheetId", "properties", "sheets"]))
@@ -0,0 +1,117 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Chunked CSV/TSV reading for pasteData and Sheet.import_csv
+'''
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+
+from google_spreadsheet.models import Client
+from google_spreadsheet.paste import iter_chunks, record_end, shape
+from google_spreadsheet.testing import FakeSheetsService
+
+CSV = (
+    u'id,name,note\r\n'
+    u'1,"Smith, John","line one\r\nline two"\r\n'
+    u'2,"say ""hi""",\r\n'
+    u'3,café,"a\nb\nc"\r\n'
+    u'4,x,y\r\n'
+)
+ROWS = [
+    [u"id", u"name", u"note"],
+    [u"1", u"Smith, John", u"line one\nline two"],
+    [u"2", u'say "hi"'],
+    [u"3", u"café", u"a\nb\nc"],
+    [u"4", u"x", u"y"],
+]
+
+
+class RecordEndTest(unittest.TestCase):
+    def test_unquoted(self):
+        self.assertEqual(record_end(b"a,b\nc,d\ne"), 7)
+        self.assertEqual(record_end(b"a,b"), -1)
+        self.assertEqual(record_end(b""), -1)
+
+    def test_quoted(self):
+        # the last line break is within a quoted field
+        self.assertEqual(record_end(b'a,b\nc,"d\ne'), 3)
+        self.assertEqual(record_end(b'"a\nb\nc'), -1)
+        self.assertEqual(record_end(b'"a\nb"\nc'), 5)
+        # doubled quotes keep the parity
+        self.assertEqual(record_end(b'a,"say ""hi"""\nb'), 14)
+        self.assertEqual(record_end(b'a,"""\nb'), -1)
+
+
+class ShapeTest(unittest.TestCase):
+    def test_shape(self):
+        self.assertEqual(shape(b""), (0, 0))
+        self.assertEqual(shape(b"a,b\nc,d,e\nf"), (3, 3))
+        self.assertEqual(shape(b'a,"b,c\nd"\ne', b","), (2, 2))
+        self.assertEqual(shape(b"a\tb,c", b"\t"), (1, 2))
+
+
+class IterChunksTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, content, name="data.csv", bom=False):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as csv_file:
+            if bom:
+                csv_file.write(codecs.BOM_UTF8)
+            csv_file.write(content.encode("utf8"))
+        return path
+
+    def test_record_boundaries(self):
+        path = self._write(CSV, bom=True)
+        expected = CSV.replace(u"\r\n", u"\n")[:-1]
+        for chunk_bytes in (1, 7, 16, 40, 1 << 20):
+            chunks = list(iter_chunks(path, chunk_bytes=chunk_bytes))
+            self.assertEqual(u"\n".join(data for data, _, _ in chunks), expected)
+            self.assertEqual(sum(rows for _, rows, _ in chunks), len(ROWS))
+            self.assertEqual(max(cols for _, _, cols in chunks), 3)
+            if chunk_bytes < 16:
+                self.assertGreater(len(chunks), 2)
+
+    def test_tsv(self):
+        path = self._write(u"a\tb\tc\n1\t2\n", "data.tsv")
+        self.assertEqual(list(iter_chunks(path, "\t")), [(u"a\tb\tc\n1\t2", 2, 3)])
+
+    def test_empty(self):
+        self.assertEqual(list(iter_chunks(self._write(u""))), [])
+        self.assertEqual(list(iter_chunks(self._write(u"\n"))), [])
+
+
+class ImportCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "data.csv")
+        with open(self.path, "wb") as csv_file:
+            csv_file.write(CSV.encode("utf8"))
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 3, 2),))
+        self.sheet = Client(self.service).open(file_id).find_sheet_by_name("Sheet1")
+        self.service.reset_stats()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_import(self):
+        self.assertEqual(self.sheet.import_csv(self.path, "B2", chunk_bytes=32), "Sheet1!B2:D6")
+        self.assertEqual((self.sheet.row_count, self.sheet.col_count), (6, 4))
+        self.assertEqual(self.service.stats["methods"], {"spreadsheets.batchUpdate": 3})
+        values = self.sheet.get_values("B2", "D6").get("values")
+        self.assertEqual(values, ROWS)
+
+    def test_empty(self):
+        with open(self.path, "wb"):
+            pass
+        self.assertIsNone(self.sheet.import_csv(self.path))
+        self.assertEqual(self.service.stats["requests"], 0)
@@ -0,0 +1,139 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+ExportRunner journal: finished tasks and sheets are recorded, and skipped on resume
+'''
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from google_spreadsheet.runner import DONE, ERROR, ExportRunner, Journal, Task
+from google_spreadsheet.testing import FakeSheetsService
+
+
+def _service(missing=(), service_class=FakeSheetsService):
+    service = service_class()
+    for file_id in ("doc-1", "doc-2"):
+        if file_id in missing:
+            continue
+        service.add_spreadsheet(file_id, (("Data", 20, 3), ("Other", 5, 2)), file_id=file_id)
+        service.spreadsheets().values().update(spreadsheetId=file_id, range="Data!A1:B3", valueInputOption="RAW",
+                                               body={"values": [["k", "v"], [1, "a"], [2, "b"]]}).execute()
+    return service
+
+
+def _service_without_doc_2():
+    return _service(missing=("doc-2",))
+
+
+def _broken_service():
+    raise IOError("No key file")
+
+
+class _CrashingService(FakeSheetsService):
+    def _get(self, file_id, *args):
+        if file_id == "doc-crash":
+            # a worker killed by the OOM killer, without any cleanup
+            os._exit(1)
+        return super(_CrashingService, self)._get(file_id, *args)
+
+
+def _crashing_service():
+    service = _service(service_class=_CrashingService)
+    service.add_spreadsheet("doc-crash", file_id="doc-crash")
+    return service
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "journal.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_last_line_wins(self):
+        task = Task("doc-1", "Data", "out.csv")
+        journal = Journal(self.path)
+        journal.record(task, DONE)
+        journal.record(task, ERROR, {"error": "boom"})
+        journal.close()
+        journal = Journal(self.path)
+        self.assertFalse(journal.is_done(task))
+        journal.close()
+
+    def test_sheets_and_torn_lines(self):
+        task = Task("doc-1", None, "out")
+        journal = Journal(self.path)
+        journal.record(task, DONE, {"rows": 3}, sheet_name="Data")
+        journal.close()
+        with io.open(self.path, "a") as journal_file:
+            journal_file.write(u'{"file_id": "doc-1", "ra')
+
+        journal = Journal(self.path)
+        self.assertFalse(journal.is_done(task))
+        self.assertEqual(journal.done_sheets(task), set(["Data"]))
+        journal.close()
+
+
+class ExportRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.journal = os.path.join(self.directory, "journal.jsonl")
+        self.tasks = [
+            Task("doc-1", "Data!A1:B3", os.path.join(self.directory, "doc-1.csv")),
+            Task("doc-2", "Data", os.path.join(self.directory, "doc-2.csv")),
+            Task("doc-1", None, os.path.join(self.directory, "doc-1")),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def entries(self):
+        with open(self.journal) as journal_file:
+            return [json.loads(line) for line in journal_file]
+
+    def test_resume(self):
+        runner = ExportRunner(service_factory=_service_without_doc_2, processes=2, journal=self.journal)
+        summary = runner.run(self.tasks)
+        self.assertEqual((summary["done"], summary["failed"]), (2, 1))
+        self.assertEqual(list(summary["errors"]), [self.tasks[1].sink])
+        self.assertEqual(sorted(os.listdir(self.tasks[2].sink)), ["Data.csv", "Other.csv"])
+        sheets = [entry["sheet"] for entry in self.entries() if "sheet" in entry]
+        self.assertEqual(sorted(sheets), ["Data", "Other"])
+
+        runner.service_factory = _service
+        summary = runner.run(self.tasks)
+        self.assertEqual((summary["skipped"], summary["done"], summary["failed"]), (2, 1, 0))
+        with open(self.tasks[1].sink) as sink:
+            self.assertEqual(sink.read(), "k,v\n1,a\n2,b\n")
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".part")])
+
+    def test_resume_skips_exported_sheets(self):
+        task = self.tasks[2]
+        journal = Journal(self.journal)
+        journal.record(task, DONE, {}, sheet_name="Data")
+        journal.close()
+
+        summary = ExportRunner(service_factory=_service, processes=1, journal=self.journal).run([task])
+        self.assertEqual(summary["done"], 1)
+        self.assertEqual(os.listdir(task.sink), ["Other.csv"])
+        self.assertEqual(self.entries()[-1]["skipped_sheets"], 1)
+
+    def test_client_construction_error_fails_tasks(self):
+        summary = ExportRunner(service_factory=_broken_service, processes=2, journal=self.journal).run(self.tasks)
+        self.assertEqual((summary["done"], summary["failed"]), (0, 3))
+        self.assertTrue(all("No key file" in error for error in summary["errors"].values()))
+        self.assertEqual([entry["status"] for entry in self.entries()], [ERROR] * 3)
+
+    def test_dead_worker_fails_its_shard(self):
+        # the pool replaces the dead worker, which exports the next shards
+        tasks = [Task("doc-crash", None, os.path.join(self.directory, "doc-crash"))] + self.tasks[:2]
+        summary = ExportRunner(service_factory=_crashing_service, processes=1, journal=self.journal).run(tasks)
+        self.assertEqual((summary["done"], summary["failed"]), (2, 1))
+        self.assertIn("died", summary["errors"][tasks[0].sink])
+        self.assertEqual(sorted(entry["status"] for entry in self.entries()), [DONE, DONE, ERROR])
@@ -0,0 +1,77 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Sheet.sync: only changed cells are written, grouped into rectangles
+'''
+import unittest
+
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class ChangedRangesTest(unittest.TestCase):
+    def setUp(self):
+        service = FakeSheetsService()
+        file_id = service.add_spreadsheet("Doc", (("Sheet1", 20, 5),))
+        self.sheet = Client(service).open(file_id).find_sheet_by_name("Sheet1")
+
+    def test_no_change(self):
+        values = [["a", "b"], ["c", "d"]]
+        self.assertEqual(self.sheet._changed_ranges(values, values), [])
+
+    def test_runs_extend_down(self):
+        old = [["a", "b", "c"], ["d", "e", "f"], ["g", "h", "i"]]
+        new = [["a", "X", "X"], ["d", "X", "X"], ["g", "h", "X"]]
+        self.assertEqual(self.sheet._changed_ranges(old, new), [(0, 1, 2, 3), (2, 2, 3, 3)])
+
+    def test_separate_rectangles(self):
+        old = [["a", "b", "c"], ["d", "e", "f"]]
+        new = [["X", "b", "X"], ["d", "e", "f"]]
+        self.assertEqual(self.sheet._changed_ranges(old, new), [(0, 0, 1, 1), (0, 2, 1, 3)])
+
+    def test_none_and_missing_cells_are_empty(self):
+        self.assertEqual(self.sheet._changed_ranges([["a", ""]], [["a", None]]), [])
+        self.assertEqual(self.sheet._changed_ranges([["a"]], [["a", "b"]]), [(0, 1, 1, 2)])
+
+    def test_clear_removed(self):
+        old = [["a", "b"], ["c", "d"]]
+        new = [["a"]]
+        self.assertEqual(self.sheet._changed_ranges(old, new), [])
+        self.assertEqual(self.sheet._changed_ranges(old, new, clear_removed=True), [(0, 1, 1, 2), (1, 0, 2, 2)])
+
+
+class SyncTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 20, 5),))
+        self.sheet = Client(self.service).open(file_id).find_sheet_by_name("Sheet1")
+
+    def values(self):
+        return self.sheet.get_values("A1", "E20").get("values", [])
+
+    def test_first_sync_fetches_and_writes(self):
+        self.sheet.sync([["a", "b"], ["c", "d"]], "B2")
+        self.assertEqual(self.values(), [[], ["", "a", "b"], ["", "c", "d"]])
+
+    def test_later_syncs_write_changed_cells_only(self):
+        self.sheet.sync([["a", "b", "c"], ["d", "e", "f"]])
+        self.service.reset_stats()
+        response = self.sheet.sync([["a", "X", "c"], ["d", "e", "Y"]])
+        # the last written values are known, nothing is fetched
+        self.assertEqual(self.service.stats["methods"], {"values.batchUpdate": 1})
+        self.assertEqual([update["updatedRange"] for update in response["responses"]],
+                         ["Sheet1!B1", "Sheet1!C2"])
+        self.assertEqual(self.values(), [["a", "X", "c"], ["d", "e", "Y"]])
+
+    def test_no_change_sends_nothing(self):
+        self.sheet.sync([["a", "b"]])
+        self.service.reset_stats()
+        self.assertIsNone(self.sheet.sync([["a", "b"]]))
+        self.assertEqual(self.service.stats["requests"], 0)
+
+    def test_refetch_sees_other_writers(self):
+        self.sheet.sync([["a", "b"]])
+        self.sheet.update_values("A1", "A1", [["changed elsewhere"]])
+        self.sheet.sync([["a", "b"]], refetch=True)
+        self.assertEqual(self.values(), [["a", "b"]])
@@ -0,0 +1,87 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+RetryPolicy and retry_after: which failures are retried, and how long to wait
+'''
+import email.utils
+import time
+import unittest
+
+from google_spreadsheet import exceptions
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+from google_spreadsheet.throttle import RetryPolicy, retry_after
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_statuses_and_attempts(self):
+        policy = RetryPolicy(max_retries=2)
+        self.assertTrue(policy.should_retry(429, 0))
+        self.assertTrue(policy.should_retry(503, 1))
+        self.assertFalse(policy.should_retry(503, 2))
+        self.assertFalse(policy.should_retry(400, 0))
+        self.assertFalse(policy.should_retry(404, 0))
+
+    def test_5xx_only_retried_for_idempotent_methods(self):
+        policy = RetryPolicy()
+        for method in ("values.get", "values.batchGet", "spreadsheets.get", "values.update", "values.batchUpdate"):
+            self.assertTrue(policy.should_retry(500, 0, method), method)
+        for method in ("spreadsheets.batchUpdate", "values.append"):
+            self.assertFalse(policy.should_retry(500, 0, method), method)
+            self.assertFalse(policy.should_retry(503, 0, method), method)
+            self.assertTrue(policy.should_retry(429, 0, method), method)
+
+    def test_delay(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+        self.assertEqual([policy.delay(attempt) for attempt in range(5)], [1.0, 2.0, 4.0, 5.0, 5.0])
+        self.assertEqual(policy.delay(0, retry_after=3.0), 3.0)
+        self.assertEqual(policy.delay(0, retry_after=60.0), 5.0)
+        self.assertEqual(policy.delay(0, retry_after=-1.0), 0)
+
+        jittered = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        self.assertTrue(all(0 <= jittered.delay(3) <= 5.0 for _ in range(100)))
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(retry_after({"retry-after": "7"}), 7.0)
+        self.assertEqual(retry_after({"retry-after": "1.5"}), 1.5)
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertTrue(25 <= retry_after({"retry-after": value}) <= 31)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(retry_after(None))
+        self.assertIsNone(retry_after({}))
+        self.assertIsNone(retry_after({"retry-after": ""}))
+        self.assertIsNone(retry_after({"retry-after": "soon"}))
+
+
+class ClientRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        self.file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 10, 3),))
+        self.client = Client(self.service, retry=RetryPolicy(base_delay=0, jitter=False))
+
+    def append_rows_request(self):
+        return {"appendDimension": {"sheetId": 0, "dimension": "ROWS", "length": 5}}
+
+    def test_idempotent_write_retried_on_5xx(self):
+        self.service.fail_next(503, count=2)
+        self.client.values_update(self.file_id, "Sheet1!A1", [["a"]])
+        self.assertEqual(self.client.stats["retried"], 2)
+        self.assertEqual(self.client.values_get(self.file_id, "Sheet1!A1")["values"], [["a"]])
+
+    def test_batch_update_not_retried_on_5xx(self):
+        self.service.fail_next(500)
+        self.assertRaises(exceptions.APIException, self.client.update, self.file_id, [self.append_rows_request()])
+        self.assertEqual(self.client.stats["retried"], 0)
+        self.client.update(self.file_id, [self.append_rows_request()])
+        self.assertEqual(self.client.open(self.file_id).find_sheet_by_name("Sheet1").row_count, 15)
+
+    def test_batch_update_retried_on_429(self):
+        self.service.fail_next(429, retry_after=0)
+        self.client.update(self.file_id, [self.append_rows_request()])
+        self.assertEqual((self.client.stats["retried"], self.client.stats["rate_limited"]), (1, 1))
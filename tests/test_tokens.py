@@ -0,0 +1,82 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Token sharing: credentials of several processes share one token file and refresh it before expiry
+'''
+import shutil
+import tempfile
+import unittest
+
+import httplib2
+
+from google_spreadsheet import tokens
+from google_spreadsheet.testing import FakeTokenEndpoint, fake_service_account_info
+
+try:
+    import rsa
+    from oauth2client.service_account import ServiceAccountCredentials
+except ImportError:
+    rsa = None
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+
+@unittest.skipIf(rsa is None, "requires the rsa package")
+class ShareTokenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.info = fake_service_account_info()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.endpoint = FakeTokenEndpoint(expires_in=3600).start()
+
+    def tearDown(self):
+        self.endpoint.stop()
+        shutil.rmtree(self.directory)
+
+    def credentials(self, margin=tokens.REFRESH_MARGIN):
+        # a process of its own: new credentials, new storage on the same token file
+        credentials = ServiceAccountCredentials.from_json_keyfile_dict(self.info, SCOPES,
+                                                                       token_uri=self.endpoint.uri)
+        return tokens.share_token(credentials, self.directory, margin)
+
+    def request(self, credentials):
+        # the fake endpoint takes authorized requests too, and counts them
+        http = tokens.authorize(credentials, httplib2.Http())
+        response, _ = http.request(self.endpoint.uri, "POST", body="")
+        self.assertEqual(response.status, 200)
+
+    def test_one_token_for_all_processes(self):
+        first = self.credentials()
+        self.assertEqual(first.get_access_token().access_token, "token-1")
+        second = self.credentials()
+        self.assertEqual(second.access_token, "token-1")
+        self.request(second)
+        self.assertEqual(self.endpoint.requests, 2)  # the token request and the authorized one
+
+    def test_refresh_before_expiry(self):
+        # handed out until 1 minute before expiry, refreshed 5 minutes before expiry
+        self.endpoint.expires_in = 200
+        first = self.credentials(margin=60)
+        first.get_access_token()
+        second = self.credentials(margin=60)
+        self.assertEqual(second.access_token, "token-1")
+
+        self.endpoint.expires_in = 3600
+        self.request(first)
+        self.assertEqual(first.access_token, "token-2")
+        # token-1 is still valid but expires soon, the other process takes the refreshed token
+        self.request(second)
+        self.assertEqual(second.access_token, "token-2")
+        self.assertEqual(self.endpoint.requests, 4)
+
+    def test_compute_engine_credentials_left_as_is(self):
+        try:
+            from oauth2client.contrib.gce import AppAssertionCredentials
+        except ImportError:
+            self.skipTest("oauth2client.contrib.gce not available")
+        credentials = AppAssertionCredentials()
+        self.assertIs(tokens.share_token(credentials, self.directory), credentials)
+        self.assertIsNone(credentials.store)
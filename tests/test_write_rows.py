@@ -0,0 +1,43 @@
+# encoding=utf8
+'''
+Created on 2026-10-17
+
+Sheet.write_rows: streamed rows cut into chunks, the grid grows as needed
+'''
+import unittest
+
+from google_spreadsheet.models import Client
+from google_spreadsheet.testing import FakeSheetsService
+
+
+class WriteRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeSheetsService()
+        file_id = self.service.add_spreadsheet("Doc", (("Sheet1", 10, 2),))
+        self.sheet = Client(self.service).open(file_id).find_sheet_by_name("Sheet1")
+        self.service.reset_stats()
+
+    def test_chunks_by_cells(self):
+        rows = ([i, "row {}".format(i), i * 2] for i in range(25))
+        progress = []
+        stats = self.sheet.write_rows(rows, max_cells=30, progress=lambda rows, cells: progress.append(rows))
+        self.assertEqual(stats, {"rows": 25, "cells": 75, "requests": 3})
+        self.assertEqual(progress, [10, 20, 25])
+        self.assertEqual(self.service.stats["methods"]["values.batchUpdate"], 3)
+
+    def test_chunks_by_bytes(self):
+        rows = [["x" * 100] for _ in range(10)]
+        stats = self.sheet.write_rows(rows, max_bytes=350)
+        self.assertEqual(stats["requests"], 4)
+
+    def test_grid_grows(self):
+        self.sheet.write_rows([[1, 2, 3]] * 15, range_start="B3", max_cells=9)
+        self.assertEqual((self.sheet.row_count, self.sheet.col_count), (17, 4))
+        values = self.sheet.get_values("A1", "D17").get("values", [])
+        self.assertEqual(len(values), 17)
+        self.assertEqual(values[16], ["", "1", "2", "3"])
+
+    def test_ragged_rows_and_empty_input(self):
+        stats = self.sheet.write_rows([[1], [], [1, 2]])
+        self.assertEqual(stats, {"rows": 3, "cells": 4, "requests": 1})
+        self.assertEqual(self.sheet.write_rows(iter([])), {"rows": 0, "cells": 0, "requests": 0})